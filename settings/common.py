@@ -40,9 +40,14 @@ CACHES = {
 }
 
 PASSWORD_HASHERS = [
-    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "taiga.users.hashers.PBKDF2PasswordHasher",
 ]
 
+# Work factor of the password hasher. Use the "benchmark_password_hasher"
+# command to tune it for the hardware; the passwords are hashed again
+# with the new value on the next login of each user.
+PASSWORD_HASHER_ITERATIONS = 12000
+
 # Default configuration for reverse proxy
 USE_X_FORWARDED_HOST = True
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTOCOL", "https")
@@ -368,6 +373,9 @@ AUTHENTICATION_BACKENDS = (
 )
 
 MAX_AGE_AUTH_TOKEN = None
+# Seconds that a verified authentication token is remembered (0 disables it)
+AUTH_TOKEN_CACHE_TIMEOUT = 30
+AUTH_TOKEN_CACHE_MAX_ENTRIES = 5000
 MAX_AGE_CANCEL_ACCOUNT = 30 * 24 * 60 * 60 # 30 days in seconds
 
 REST_FRAMEWORK = {
@@ -402,6 +410,14 @@ PUBLIC_REGISTER_ENABLED = False
 
 SEARCHES_MAX_RESULTS = 150
 
+ISSUES_FILTERS_DATA_CACHE_TIMEOUT = 60 * 60  # 1 hour
+USER_PROFILE_DATA_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+# Send an ETag, from the last modification of the exported data, with the
+# csv exports and reply 304 when it matches. Renames of statuses, points or
+# users don't change it.
+CSV_USE_ETAGS = False
+
 SOUTH_MIGRATION_MODULES = {
     'easy_thumbnails': 'easy_thumbnails.south_migrations',
 }
@@ -416,6 +432,17 @@ THUMBNAIL_ALIASES = {
     },
 }
 
+# Max size of every chunk of the chunked attachment uploads
+ATTACHMENTS_UPLOAD_CHUNK_MAX_SIZE = 10 * 1024 * 1024  # 10 MB
+
+# Seconds after its last chunk an unfinished chunked upload is purged
+# (see the purge_attachment_uploads command)
+ATTACHMENTS_UPLOAD_EXPIRATION = 60 * 60 * 24  # 24 hours
+
+# Seconds the resolved photo/gravatar urls of the users are cached
+USER_PHOTO_URLS_CACHE_TIMEOUT = 60 * 60 * 24  # 24 hours
+USER_PENDING_PHOTO_URLS_CACHE_TIMEOUT = 60  # 1 minute
+
 # GRAVATAR_DEFAULT_AVATAR = "img/user-noimage.png"
 GRAVATAR_DEFAULT_AVATAR = ""
 GRAVATAR_AVATAR_SIZE = DEFAULT_AVATAR_SIZE
@@ -448,7 +475,15 @@ PROJECT_MODULES_CONFIGURATORS = {
 BITBUCKET_VALID_ORIGIN_IPS = ["131.103.20.165", "131.103.20.166"]
 GITLAB_VALID_ORIGIN_IPS = []
 
+# Queue the events received from GitHub, GitLab and BitBucket and reply with
+# a 202 instead of processing them during the request (needs CELERY_ENABLED)
+HOOKS_ASYNC_PROCESSING = False
+
+# Times a project is saved with a new slug when another one takes it first
+PROJECT_SLUG_ALLOCATION_ATTEMPTS = 5
+
 EXPORTS_TTL = 60 * 60 * 24  # 24 hours
+IMPORTS_BULK_MODE = True  # Insert the dump items in batches on the asynchronous imports
 CELERY_ENABLED = False
 WEBHOOKS_ENABLED = False
 
@@ -82,7 +82,7 @@ class Token(BaseAuthentication):
         token = token_rx_match.group(1)
         max_age_auth_token = getattr(settings, "MAX_AGE_AUTH_TOKEN", None)
         user = get_user_for_token(token, "authentication",
-                                  max_age=max_age_auth_token)
+                                  max_age=max_age_auth_token, cached=True)
 
         return (user, token)
 
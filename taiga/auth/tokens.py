@@ -14,13 +14,119 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import copy
+import threading
+import time
+
+from collections import OrderedDict
+
 from taiga.base import exceptions as exc
 
 from django.apps import apps
+from django.conf import settings
 from django.core import signing
+from django.utils import baseconv
 from django.utils.translation import ugettext as _
 
 
+class TokensCache:
+    """
+    Bounded in-process cache of already verified tokens.
+
+    Each entry stores a snapshot of the token user for a short time
+    (`AUTH_TOKEN_CACHE_TIMEOUT` seconds, and never after the token
+    expiration), so the signature verification and the user query are
+    skipped for the repeated requests of a client. When the cache is
+    full, the least recently used entries are discarded.
+
+    The entries of a user are discarded when the user is saved or
+    deleted (see `invalidate_user_tokens`); the other processes see
+    the change when their entries expire.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+
+    @property
+    def timeout(self):
+        return getattr(settings, "AUTH_TOKEN_CACHE_TIMEOUT", 0)
+
+    @property
+    def max_entries(self):
+        return getattr(settings, "AUTH_TOKEN_CACHE_MAX_ENTRIES", 1000)
+
+    def get(self, token, scope):
+        key = (token, scope)
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                return None
+
+            expires_at, user = entry
+            if expires_at <= time.time():
+                self._discard(key)
+                return None
+
+            self._entries.move_to_end(key)
+
+        return copy.deepcopy(user)
+
+    def set(self, token, scope, user, max_age=None):
+        if self.timeout <= 0:
+            return
+
+        expires_at = time.time() + self.timeout
+        if max_age is not None:
+            expires_at = min(expires_at, _get_token_timestamp(token) + max_age)
+
+        key = (token, scope)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (expires_at, copy.deepcopy(user))
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        user_keys = self._keys_by_user.get(entry[1].pk, set())
+        user_keys.discard(key)
+        if not user_keys:
+            self._keys_by_user.pop(entry[1].pk, None)
+
+
+tokens_cache = TokensCache()
+
+
+def _get_token_timestamp(token):
+    # Tokens are "<payload>:<timestamp>:<signature>" (see `signing.dumps`)
+    return baseconv.base62.decode(token.rsplit(":", 2)[-2])
+
+
+def invalidate_user_tokens(user_id):
+    """
+    Discard the cached tokens of a user. It should be called
+    whenever the user changes (password, active flag, data...).
+    """
+    tokens_cache.invalidate_user(user_id)
+
+
 def get_token_for_user(user, scope):
     """
     Generate a new signed token containing
@@ -30,17 +136,25 @@ def get_token_for_user(user, scope):
     return signing.dumps(data)
 
 
-def get_user_for_token(token, scope, max_age=None):
+def get_user_for_token(token, scope, max_age=None, cached=False):
     """
     Given a selfcontained token and a scope try to parse and
     unsign it.
 
     If max_age is specified it checks token expiration.
 
+    If cached is True, the verified tokens are remembered
+    for a short time in `tokens_cache`.
+
     If token passes a validation, returns
     a user instance corresponding with user_id stored
     in the incoming token.
     """
+    if cached:
+        user = tokens_cache.get(token, scope)
+        if user is not None:
+            return user
+
     try:
         data = signing.loads(token, max_age=max_age)
     except signing.BadSignature:
@@ -52,5 +166,8 @@ def get_user_for_token(token, scope, max_age=None):
         user = model_cls.objects.get(pk=data["user_%s_id" % (scope)])
     except (model_cls.DoesNotExist, KeyError):
         raise exc.NotAuthenticated(_("Invalid token"))
-    else:
-        return user
+
+    if cached:
+        tokens_cache.set(token, scope, user, max_age=max_age)
+
+    return user
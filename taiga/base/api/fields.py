@@ -1057,3 +1057,24 @@ class SerializerMethodField(Field):
     def field_to_native(self, obj, field_name):
         value = getattr(self.parent, self.method_name)(obj)
         return self.to_native(value)
+
+
+class AnnotatedField(SerializerMethodField):
+    """
+    A SerializerMethodField whose value can be pushed into the queryset.
+
+    `annotate(queryset, context)` is applied by the views to the listed queryset
+    (see `BaseSerializer.annotate_queryset`) and can attach the value to each
+    object, as `attr`, or prefetch the data the method needs. If the object
+    hasn't the annotated attribute the method is called as usual.
+    """
+
+    def __init__(self, method_name, annotate, attr=None):
+        self.annotate = annotate
+        self.attr = attr
+        super(AnnotatedField, self).__init__(method_name)
+
+    def field_to_native(self, obj, field_name):
+        if self.attr is not None and hasattr(obj, self.attr):
+            return self.to_native(getattr(obj, self.attr))
+        return super(AnnotatedField, self).field_to_native(obj, field_name)
@@ -81,8 +81,22 @@ class GenericAPIView(pagination.PaginationMixin,
         """
         serializer_class = self.get_serializer_class()
         context = self.get_serializer_context()
+        kwargs = {}
+        if self.use_compiled_serializer(many=many, data=data, files=files):
+            kwargs["compiled"] = True
         return serializer_class(instance, data=data, files=files,
-                                many=many, partial=partial, context=context)
+                                many=many, partial=partial, context=context,
+                                **kwargs)
+
+    def use_compiled_serializer(self, many=False, data=None, files=None):
+        """
+        Return True if the read-only compiled serializer can be used: only for
+        list actions of views with `compiled_list_serializer` enabled.
+        """
+        if not many or data is not None or files is not None:
+            return False
+        return (getattr(self, "compiled_list_serializer", False) and
+                getattr(self, "action", None) == "list")
 
 
     def filter_queryset(self, queryset):
@@ -98,6 +112,16 @@ class GenericAPIView(pagination.PaginationMixin,
             queryset = backend().filter_queryset(self.request, queryset, self)
         return queryset
 
+    def annotate_queryset(self, queryset):
+        """
+        Given a queryset, apply the annotations declared by the serializer
+        class of the current action.
+        """
+        serializer_class = self.get_serializer_class()
+        if not hasattr(serializer_class, "annotate_queryset"):
+            return queryset
+        return serializer_class.annotate_queryset(queryset, self.get_serializer_context())
+
     def get_filter_backends(self):
         """
         Returns the list of filter backends that this view requires.
@@ -212,6 +236,13 @@ class GenericAPIView(pagination.PaginationMixin,
         """
         pass
 
+    def post_conditions_on_save(self, obj):
+        """
+        Placeholder method called by mixins after checking the
+        conditions before save, just before saving the object.
+        """
+        pass
+
     def pre_conditions_on_delete(self, obj):
         """
         Placeholder method called by mixins before delete for check
@@ -69,6 +69,7 @@ class CreateModelMixin(object):
 
             self.pre_save(serializer.object)
             self.pre_conditions_on_save(serializer.object)
+            self.post_conditions_on_save(serializer.object)
             self.object = serializer.save(force_insert=True)
             self.post_save(self.object, created=True)
             headers = self.get_success_headers(serializer.data)
@@ -89,8 +90,13 @@ class ListModelMixin(object):
     """
     empty_error = "Empty list and '%(class_name)s.allow_empty' is False."
 
+    # Serialize the list with a read-only serializer whose fields are
+    # compiled once per serializer class (see `BaseSerializer`).
+    compiled_list_serializer = False
+
     def list(self, request, *args, **kwargs):
         self.object_list = self.filter_queryset(self.get_queryset())
+        self.object_list = self.annotate_queryset(self.object_list)
 
         # Default is to allow empty querysets.  This can be altered by setting
         # `.allow_empty = False`, to raise 404 errors on empty querysets.
@@ -151,6 +157,7 @@ class UpdateModelMixin(object):
         try:
             self.pre_save(serializer.object)
             self.pre_conditions_on_save(serializer.object)
+            self.post_conditions_on_save(serializer.object)
         except ValidationError as err:
             # full_clean on model instance may be called in pre_save,
             # so we have to handle eventual errors.
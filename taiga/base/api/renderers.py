@@ -102,8 +102,12 @@ class JSONRenderer(BaseRenderer):
             except (ValueError, TypeError):
                 indent = None
 
-        ret = json.dumps(data, cls=self.encoder_class,
-            indent=indent, ensure_ascii=self.ensure_ascii)
+        if self.encoder_class is encoders.JSONEncoder:
+            dumps = encoders.get_json_dumps(api_settings.JSON_BACKEND)
+            ret = dumps(data, indent=indent, ensure_ascii=self.ensure_ascii)
+        else:
+            ret = json.dumps(data, cls=self.encoder_class,
+                indent=indent, ensure_ascii=self.ensure_ascii)
 
         # On python 2.x json.dumps() returns bytestrings if ensure_ascii=True,
         # but if ensure_ascii=False, the return type is underspecified,
@@ -30,6 +30,7 @@ python primitives.
 2. The process of marshalling between python primitives and request and
 response content is handled by parsers and renderers.
 """
+from collections import OrderedDict
 from decimal import Decimal
 from django.core.paginator import Page
 from django.db import models
@@ -151,6 +152,17 @@ def _is_protected_type(obj):
     )
 
 
+def _copy_compiled_field(field):
+    """
+    Cheap copy of a compiled field prototype, nested serializers included.
+    """
+    field = copy.copy(field)
+    if isinstance(field, BaseSerializer):
+        field.fields = SortedDict([(key, _copy_compiled_field(nested_field))
+                                   for key, nested_field in field.fields.items()])
+    return field
+
+
 def _get_declared_fields(bases, attrs):
     """
     Create a list of serializer field instances from the passed in "attrs",
@@ -202,7 +214,7 @@ class BaseSerializer(WritableField):
 
     def __init__(self, instance=None, data=None, files=None,
                  context=None, partial=False, many=None,
-                 allow_add_remove=False, **kwargs):
+                 allow_add_remove=False, compiled=False, **kwargs):
         super(BaseSerializer, self).__init__(**kwargs)
         self.opts = self._options_class(self.Meta)
         self.parent = None
@@ -216,7 +228,15 @@ class BaseSerializer(WritableField):
         self.init_data = data
         self.init_files = files
         self.object = instance
-        self.fields = self.get_fields()
+        self.compiled = compiled
+
+        if compiled:
+            self.fields = self.get_compiled_fields()
+            self._compiled_plan = tuple((self.get_field_key(field_name), field_name, field.field_to_native)
+                                        for field_name, field in self.fields.items())
+        else:
+            self.fields = self.get_fields()
+            self._compiled_plan = None
 
         self._data = None
         self._files = None
@@ -228,6 +248,9 @@ class BaseSerializer(WritableField):
         if allow_add_remove and not many:
             raise ValueError("allow_add_remove should only be used for bulk updates, but you have not set many=True")
 
+        if compiled and (data is not None or files is not None):
+            raise ValueError("compiled serializers are read-only, data and files are not allowed")
+
     #####
     # Methods to determine which fields to use when (de)serializing objects.
 
@@ -276,6 +299,40 @@ class BaseSerializer(WritableField):
 
         return ret
 
+    @classmethod
+    def get_compiled_field_prototypes(cls):
+        """
+        Returns the fields of the serializer class, computed only once per class.
+        """
+        prototypes = cls.__dict__.get("_compiled_field_prototypes", None)
+        if prototypes is None:
+            prototypes = cls().fields
+            cls._compiled_field_prototypes = prototypes
+        return prototypes
+
+    @classmethod
+    def annotate_queryset(cls, queryset, context=None):
+        """
+        Apply the annotations declared by the `AnnotatedField` fields of the
+        serializer class to the queryset.
+        """
+        context = context or {}
+        for field in cls.get_compiled_field_prototypes().values():
+            if isinstance(field, AnnotatedField):
+                queryset = field.annotate(queryset, context)
+        return queryset
+
+    def get_compiled_fields(self):
+        """
+        Same fields as `get_fields()` but shallow copied from the per class
+        prototypes instead of rebuilt from the declared and model fields.
+        """
+        ret = SortedDict()
+        for key, field in self.get_compiled_field_prototypes().items():
+            ret[key] = _copy_compiled_field(field)
+            ret[key].initialize(parent=self, field_name=key)
+        return ret
+
     #####
     # Methods to convert or revert from objects <--> primitive representations.
 
@@ -359,6 +416,9 @@ class BaseSerializer(WritableField):
         """
         Serialize objects -> primitives.
         """
+        if self._compiled_plan is not None and obj is not None:
+            return self.compiled_to_native(obj)
+
         ret = self._dict_class()
         ret.fields = self._dict_class()
         ret.empty = obj is None
@@ -374,6 +434,16 @@ class BaseSerializer(WritableField):
 
         return ret
 
+    def compiled_to_native(self, obj):
+        """
+        Serialize objects -> primitives following the compiled plan, without
+        field metadata. The keys order is the same one of `to_native()`.
+        """
+        ret = OrderedDict()
+        for key, field_name, field_to_native in self._compiled_plan:
+            ret[key] = field_to_native(obj, field_name)
+        return ret
+
     def from_native(self, data, files=None):
         """
         Deserialize primitives -> objects.
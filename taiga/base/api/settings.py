@@ -69,6 +69,10 @@ DEFAULTS = {
     "DEFAULT_CONTENT_NEGOTIATION_CLASS":
         "taiga.base.api.negotiation.DefaultContentNegotiation",
 
+    # JSON encoding backend used by the JSON renderers: "json" (stdlib),
+    # "ujson", "orjson" or "auto" (the fastest installed one)
+    "JSON_BACKEND": "json",
+
     # Genric view behavior
     "DEFAULT_MODEL_SERIALIZER_CLASS":
         "taiga.base.api.serializers.ModelSerializer",
@@ -20,6 +20,7 @@
 """
 Helper classes for parsers.
 """
+from django.core.exceptions import ImproperlyConfigured
 from django.db.models.query import QuerySet
 from django.utils.datastructures import SortedDict
 from django.utils.functional import Promise
@@ -33,6 +34,77 @@ import decimal
 import types
 import json
 
+from collections import OrderedDict
+
+
+# Fast JSON backends are optional
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_NOT_ENCODED = object()
+
+
+def _encode_default(o):
+    """
+    Convert `o` to a type natively supported by json. Return `_NOT_ENCODED`
+    if the type is not supported.
+    """
+    # For Date Time string spec, see ECMA 262
+    # http://ecma-international.org/ecma-262/5.1/#sec-15.9.1.15
+    if isinstance(o, Promise):
+        return force_text(o)
+    elif isinstance(o, datetime.datetime):
+        r = o.isoformat()
+        if o.microsecond:
+            r = r[:23] + r[26:]
+        if r.endswith("+00:00"):
+            r = r[:-6] + "Z"
+        return r
+    elif isinstance(o, datetime.date):
+        return o.isoformat()
+    elif isinstance(o, datetime.time):
+        if timezone and timezone.is_aware(o):
+            raise ValueError("JSON can't represent timezone-aware times.")
+        r = o.isoformat()
+        if o.microsecond:
+            r = r[:12]
+        return r
+    elif isinstance(o, datetime.timedelta):
+        return str(o.total_seconds())
+    elif isinstance(o, decimal.Decimal):
+        return str(o)
+    elif isinstance(o, QuerySet):
+        return list(o)
+    elif hasattr(o, "tolist"):
+        return o.tolist()
+    elif hasattr(o, "__getitem__"):
+        try:
+            return dict(o)
+        except:
+            pass
+    elif hasattr(o, "__iter__"):
+        return [i for i in o]
+    return _NOT_ENCODED
+
+
+def encode_default(o):
+    """
+    `default` hook, for json encoders, that knows how to encode date/time/timedelta,
+    decimal types, lazy strings, querysets and generators.
+    """
+    ret = _encode_default(o)
+    if ret is _NOT_ENCODED:
+        raise TypeError("{!r} is not JSON serializable".format(o))
+    return ret
+
 
 class JSONEncoder(json.JSONEncoder):
     """
@@ -40,42 +112,78 @@ class JSONEncoder(json.JSONEncoder):
     decimal types, and generators.
     """
     def default(self, o):
-        # For Date Time string spec, see ECMA 262
-        # http://ecma-international.org/ecma-262/5.1/#sec-15.9.1.15
-        if isinstance(o, Promise):
-            return force_text(o)
-        elif isinstance(o, datetime.datetime):
-            r = o.isoformat()
-            if o.microsecond:
-                r = r[:23] + r[26:]
-            if r.endswith("+00:00"):
-                r = r[:-6] + "Z"
-            return r
-        elif isinstance(o, datetime.date):
-            return o.isoformat()
-        elif isinstance(o, datetime.time):
-            if timezone and timezone.is_aware(o):
-                raise ValueError("JSON can't represent timezone-aware times.")
-            r = o.isoformat()
-            if o.microsecond:
-                r = r[:12]
-            return r
-        elif isinstance(o, datetime.timedelta):
-            return str(o.total_seconds())
-        elif isinstance(o, decimal.Decimal):
-            return str(o)
-        elif isinstance(o, QuerySet):
-            return list(o)
-        elif hasattr(o, "tolist"):
-            return o.tolist()
-        elif hasattr(o, "__getitem__"):
-            try:
-                return dict(o)
-            except:
-                pass
-        elif hasattr(o, "__iter__"):
-            return [i for i in o]
-        return super(JSONEncoder, self).default(o)
+        ret = _encode_default(o)
+        if ret is _NOT_ENCODED:
+            return super(JSONEncoder, self).default(o)
+        return ret
+
+
+def to_primitive(o):
+    """
+    Convert `o`, recursively, to dicts, lists and scalars using the same
+    conversions of `JSONEncoder`.
+    """
+    if o is None or isinstance(o, (str, int, float)):
+        return o
+    elif isinstance(o, dict):
+        # Non string keys are converted as the json module does, and the
+        # order of the ordered dicts (as the serialized data) is kept
+        items = ((k if isinstance(k, str) else json.dumps(k), to_primitive(v)) for k, v in o.items())
+        if isinstance(o, (OrderedDict, SortedDict)):
+            return OrderedDict(items)
+        return dict(items)
+    elif isinstance(o, (list, tuple)):
+        return [to_primitive(i) for i in o]
+    return to_primitive(encode_default(o))
+
+
+######################################################
+## JSON backends
+######################################################
+
+def _json_dumps(data, indent=None, ensure_ascii=True):
+    return json.dumps(data, cls=JSONEncoder, indent=indent, ensure_ascii=ensure_ascii)
+
+
+def _ujson_dumps(data, indent=None, ensure_ascii=True):
+    return ujson.dumps(to_primitive(data), indent=indent or 0, ensure_ascii=ensure_ascii,
+                       escape_forward_slashes=False)
+
+
+def _orjson_dumps(data, indent=None, ensure_ascii=True):
+    # NOTE: orjson always outputs utf-8, `ensure_ascii` is ignored
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=encode_default, option=option).decode("utf-8")
+
+
+JSON_BACKENDS = {
+    "json": (json, _json_dumps),
+    "ujson": (ujson, _ujson_dumps),
+    "orjson": (orjson, _orjson_dumps),
+}
+
+
+def get_json_dumps(backend):
+    """
+    Return the `dumps(data, indent=None, ensure_ascii=True)` function of the
+    JSON backend. "auto" means the fastest installed one.
+    """
+    if backend == "auto":
+        for name in ("orjson", "ujson"):
+            module, dumps = JSON_BACKENDS[name]
+            if module is not None:
+                return dumps
+        return _json_dumps
+
+    if backend not in JSON_BACKENDS:
+        raise ImproperlyConfigured("Unknown JSON backend '{}'".format(backend))
+
+    module, dumps = JSON_BACKENDS[backend]
+    if module is None:
+        raise ImproperlyConfigured("JSON backend '{}' is not installed".format(backend))
+    return dumps
 
 
 SafeDumper = None
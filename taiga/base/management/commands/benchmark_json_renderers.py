@@ -0,0 +1,75 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import timeit
+
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from taiga.base.api.renderers import JSONRenderer
+from taiga.base.api.utils import encoders
+from taiga.projects.models import Project
+from taiga.projects.issues.models import Issue
+from taiga.projects.issues.serializers import IssueSerializer
+from taiga.projects.userstories.models import UserStory
+from taiga.projects.userstories.serializers import UserStorySerializer
+from taiga.export_import.service import project_to_dict
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--project', '-p', default=None, dest='project',
+            help='Slug of the project used to build the payloads (the biggest one by default).'),
+        make_option('--number', '-n', default=20, type='int', dest='number',
+            help='Number of renders of every payload.'),
+    )
+
+    help = 'Compare the JSON renderer backends rendering realistic payloads'
+
+    def _get_project(self, slug):
+        if slug:
+            return Project.objects.get(slug=slug)
+        return max(Project.objects.all(), key=lambda p: p.user_stories.count() + p.issues.count())
+
+    def _get_payloads(self, project):
+        userstories = UserStory.objects.filter(project=project)
+        issues = Issue.objects.filter(project=project)
+        return [
+            ("user stories list", UserStorySerializer(userstories, many=True).data),
+            ("issues list", IssueSerializer(issues, many=True).data),
+            ("project export", project_to_dict(project)),
+        ]
+
+    def handle(self, *args, **options):
+        project = self._get_project(options.get('project'))
+        number = options.get('number')
+
+        backends = [name for name, (module, dumps) in sorted(encoders.JSON_BACKENDS.items())
+                    if module is not None]
+        print("Project: {} - {} renders per payload".format(project.slug, number))
+
+        for payload_name, data in self._get_payloads(project):
+            renderer = JSONRenderer()
+            baseline = timeit.timeit(lambda: renderer.render(data), number=number)
+            size = len(renderer.render(data))
+            print("\n{} ({} bytes)".format(payload_name, size))
+            print("  {:<20} {:>10.4f}s".format("current renderer", baseline))
+
+            for backend in backends:
+                dumps = encoders.get_json_dumps(backend)
+                elapsed = timeit.timeit(lambda: dumps(data, ensure_ascii=True), number=number)
+                print("  {:<20} {:>10.4f}s  x{:.2f}".format(backend, elapsed, baseline / elapsed))
@@ -0,0 +1,78 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# Copyright (C) 2014 Anler Hernández <hello@anler.me>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import csv
+import hashlib
+import io
+
+from django.http import HttpResponseNotModified
+from django.http import StreamingHttpResponse
+
+# Number of rows fetched, with their related data, in each query
+CSV_CHUNK_SIZE = 500
+
+
+class _Echo:
+    """
+    File-like object that returns the written value instead of storing it.
+    """
+    def write(self, value):
+        return value
+
+
+def stream_csv(fieldnames, rows):
+    """
+    Generator of the lines of a csv document with the header and the `rows`
+    dicts, so it can be sent without building the whole document in memory.
+    """
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames)
+    yield writer.writerow(dict(zip(fieldnames, fieldnames)))
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_csv(fieldnames, rows):
+    """
+    Write a csv document with the header and the `rows` dicts in a StringIO.
+    """
+    csv_data = io.StringIO()
+    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+    return csv_data
+
+
+def get_etag(*parts):
+    return '"{}"'.format(hashlib.sha1(repr(parts).encode("utf-8")).hexdigest())
+
+
+def streaming_csv_response(request, filename, lines, etag=None):
+    """
+    Build a streaming response for the csv `lines`. If `etag` matches the
+    If-None-Match header of the request a 304 response is returned and the
+    lines are never generated.
+    """
+    if etag is not None and etag in request.META.get("HTTP_IF_NONE_MATCH", ""):
+        response = HttpResponseNotModified()
+    else:
+        response = StreamingHttpResponse(lines, content_type="application/csv; charset=utf-8")
+        response["Content-Disposition"] = 'attachment; filename="{}"'.format(filename)
+
+    if etag is not None:
+        response["ETag"] = etag
+    return response
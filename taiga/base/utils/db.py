@@ -14,8 +14,13 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import closing
+
 from django.contrib.contenttypes.models import ContentType
+from django.db import connection
 from django.db import transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.fields import FieldDoesNotExist
 
 from . import functions
 
@@ -50,6 +55,53 @@ def reload_attribute(model_instance, attr_name):
     return qs.values_list(attr_name, flat=True)[0]
 
 
+def get_last_modification(queryset, *sum_fields) -> list:
+    """Get the number of objects and the last modified date of a queryset.
+
+    :param queryset: Queryset of a model with a `modified_date` field.
+    :param sum_fields: Additional fields (like versions) to sum.
+
+    :return: Sorted list of (name, value) of the aggregates.
+    """
+    aggregates = {"count": Count("id"), "modified_date": Max("modified_date")}
+    for field in sum_fields:
+        aggregates[field] = Sum(field)
+    return sorted(queryset.aggregate(**aggregates).items())
+
+
+def allocate_ids(model, count:int) -> list:
+    """Reserve a block of values of the primary key sequence of a model.
+
+    :param model: Model with an auto incremental primary key.
+    :param count: Number of ids to reserve.
+    """
+    if count <= 0:
+        return []
+
+    sql = "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s);"
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [model._meta.db_table, model._meta.pk.column, count])
+        return sorted(row[0] for row in cursor.fetchall())
+
+
+def bulk_create_with_ids(model, instances, batch_size=None):
+    """Insert a list of new model instances with a few queries.
+
+    Unlike `bulk_create`, the primary keys are allocated before the
+    insertion, so the instances can be referenced by other objects
+    afterwards. No signals are sent.
+
+    :param model: Model of the instances.
+    :param instances: List of unsaved model instances.
+    """
+    instances = list(instances)
+    for instance, id in zip(instances, allocate_ids(model, len(instances))):
+        instance.pk = id
+
+    model.objects.bulk_create(instances, batch_size=batch_size)
+    return instances
+
+
 @transaction.atomic
 def save_in_bulk(instances, callback=None, precall=None, **save_options):
     """Save a list of model instances.
@@ -107,3 +159,52 @@ def update_in_bulk_with_ids(ids, list_of_new_values, model):
     """
     for id, new_values in zip(ids, list_of_new_values):
         model.objects.filter(id=id).update(**new_values)
+
+
+def _get_concrete_field(opts, name):
+    for field in opts.concrete_fields:
+        if name in (field.name, field.attname):
+            return field
+    raise FieldDoesNotExist("{0} has no field named {1!r}".format(opts.object_name, name))
+
+
+def update_field_in_bulk(model, field_name:str, values, *, key:str="id", **scope) -> int:
+    """Update a field of a list of rows with a single `UPDATE ... FROM (VALUES ...)`.
+
+    :param model: Model of the rows.
+    :param field_name: Name of the field to update.
+    :param values: List of tuples (<key value>, <new field value>).
+    :param key: Name of the field used to match each row.
+    :param scope: Additional `<field>=<value>` conditions that the updated
+                  rows must meet (like `project_id=project.id`). Rows out of
+                  the scope are not updated.
+
+    :return: Number of updated rows.
+    """
+    values = list(values)
+    if not values:
+        return 0
+
+    qn = connection.ops.quote_name
+    opts = model._meta
+    table = qn(opts.db_table)
+    field = _get_concrete_field(opts, field_name)
+    key_field = _get_concrete_field(opts, key)
+
+    conditions = ["{0}.{1} = v.key".format(table, qn(key_field.column))]
+    params = [param for row in values for param in row]
+    for name, value in sorted(scope.items()):
+        conditions.append("{0}.{1} = %s".format(table, qn(_get_concrete_field(opts, name).column)))
+        params.append(value)
+
+    sql = """
+    UPDATE {table} SET {column} = CAST(v.value AS {type})
+      FROM (VALUES {values}) AS v(key, value)
+     WHERE {conditions};
+    """.format(table=table, column=qn(field.column), type=field.db_type(connection),
+               values=", ".join(["(%s, %s)"] * len(values)),
+               conditions=" AND ".join(conditions))
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
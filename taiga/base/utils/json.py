@@ -16,12 +16,16 @@
 
 from django.utils.encoding import force_text
 
+from taiga.base.api.settings import api_settings
 from taiga.base.api.utils import encoders
 
 import json
 
 
 def dumps(data, ensure_ascii=True, encoder_class=encoders.JSONEncoder):
+    if encoder_class is encoders.JSONEncoder:
+        dumps = encoders.get_json_dumps(api_settings.JSON_BACKEND)
+        return dumps(data, indent=None, ensure_ascii=ensure_ascii)
     return json.dumps(data, cls=encoder_class, indent=None, ensure_ascii=ensure_ascii)
 
 
@@ -14,12 +14,15 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from django.db import connection
 from django.template.defaultfilters import slugify as django_slugify
 
-import time
+from contextlib import closing
 
 from unidecode import unidecode
 
+from .sequence import arithmetic_progression
+
 
 def slugify(value):
     """
@@ -28,50 +31,62 @@ def slugify(value):
     return django_slugify(unidecode(value or ""))
 
 
-def slugify_uniquely(value, model, slugfield="slug"):
+def _get_free_slug(base, queryset, slugfield):
     """
-    Returns a slug on a name which is unique within a model's table
+    Find the first free "<base>" or "<base>-<n>" slug with a single
+    query (the prefix match can use the index of the slug field)
     """
+    taken = set(queryset.filter(**{"{}__startswith".format(slugfield): base,
+                                   "{}__regex".format(slugfield): r"^{}(-[0-9]+)?$".format(base)})
+                        .values_list(slugfield, flat=True))
+
+    if base not in taken:
+        return base
 
-    suffix = 0
-    potential = base = django_slugify(unidecode(value))
-    if len(potential) == 0:
-        potential = 'null'
-    while True:
-        if suffix:
-            potential = "-".join([base, str(suffix)])
-        if not model.objects.filter(**{slugfield: potential}).exists():
+    for suffix in arithmetic_progression():
+        potential = "-".join([base, str(suffix)])
+        if potential not in taken:
             return potential
-        suffix += 1
+
+
+def slugify_uniquely(value, model, slugfield="slug"):
+    """
+    Returns a slug on a name which is unique within a model's table
+    """
+    return slugify_uniquely_for_queryset(value, model.objects.all(), slugfield=slugfield)
 
 
 def slugify_uniquely_for_queryset(value, queryset, slugfield="slug"):
     """
     Returns a slug on a name which doesn't exist in a queryset
     """
-
-    suffix = 0
-    potential = base = django_slugify(unidecode(value))
-    if len(potential) == 0:
-        potential = 'null'
-    while True:
-        if suffix:
-            potential = "-".join([base, str(suffix)])
-        if not queryset.filter(**{slugfield: potential}).exists():
-            return potential
-        suffix += 1
+    base = django_slugify(unidecode(value))
+    if len(base) == 0:
+        base = 'null'
+    return _get_free_slug(base, queryset, slugfield)
 
 
 def ref_uniquely(p, seq_field,  model, field='ref'):
-    project = p.__class__.objects.select_for_update().get(pk=p.pk)
-    ref = getattr(project, seq_field) + 1
-
-    while True:
-        params = {field: ref, 'project': project}
-        if not model.objects.filter(**params).exists():
-            setattr(project, seq_field, ref)
-            project.save(update_fields=[seq_field])
-            return ref
-
-        time.sleep(0.0002)
-        ref += 1
+    """
+    Increment the sequence field of the project past the greatest ref
+    already used by the model, with a single statement
+    """
+    sql = """
+        UPDATE {project_table}
+           SET {seq_column} = GREATEST({seq_column},
+                                       COALESCE((SELECT max({ref_column})
+                                                   FROM {model_table}
+                                                  WHERE project_id = %s), 0)) + 1
+         WHERE id = %s
+     RETURNING {seq_column}
+    """.format(project_table=p._meta.db_table,
+               seq_column=p._meta.get_field(seq_field).column,
+               model_table=model._meta.db_table,
+               ref_column=model._meta.get_field(field).column)
+
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [p.pk, p.pk])
+        ref = cursor.fetchone()[0]
+
+    setattr(p, seq_field, ref)
+    return ref
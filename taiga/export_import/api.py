@@ -24,7 +24,6 @@ from django.db.transaction import atomic
 from django.db.models import signals
 from django.conf import settings
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 
 from taiga.base.decorators import detail_route, list_route
 from taiga.base import exceptions as exc
@@ -42,7 +41,6 @@ from . import permissions
 from . import tasks
 from . import dump_service
 from . import throttling
-from .renderers import ExportRenderer
 
 from taiga.base.api.utils import get_object_or_404
 
@@ -67,10 +65,7 @@ class ProjectExporterViewSet(mixins.ImportThrottlingPolicyMixin, GenericViewSet)
             return response.Accepted({"export_id": task.id})
 
         path = "exports/{}/{}-{}.json".format(project.pk, project.slug, uuid.uuid4().hex)
-        content = ContentFile(ExportRenderer().render(service.project_to_dict(project),
-                                                      renderer_context={"indent": 4}).decode('utf-8'))
-
-        default_storage.save(path, content)
+        service.dump_project_to_storage(project, path)
         response_data = {
             "url": default_storage.url(path)
         }
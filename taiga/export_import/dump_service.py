@@ -27,9 +27,12 @@ class TaigaImportError(Exception):
         self.message = message
 
 
-def store_milestones(project, data):
+def store_milestones(project, data, bulk=False):
     results = []
     for milestone_data in data.get("milestones", []):
+        if bulk:
+            # The tasks without user story are stored with the rest of tasks
+            milestone_data = dict(milestone_data, tasks_without_us=[])
         milestone = service.store_milestone(project, milestone_data)
         results.append(milestone)
     return results
@@ -86,7 +89,16 @@ def store_tags_colors(project, data):
     return None
 
 
-def dict_to_project(data, owner=None):
+def dict_to_project(data, owner=None, bulk=False, progress=None):
+    """
+    Create a project from the data of a dump.
+
+    With `bulk` the user stories, tasks, issues and timeline entries
+    are validated and inserted in batches, with one query per model
+    and batch, and without sending the model signals. `progress`, if
+    given, is called as `progress(section, done, total)` after every
+    batch.
+    """
     if owner:
         data["owner"] = owner
 
@@ -143,7 +155,10 @@ def dict_to_project(data, owner=None):
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing memberships"))
 
-    store_milestones(proj, data)
+    if bulk:
+        service.bulk_prepare_references(proj, data)
+
+    store_milestones(proj, data, bulk=bulk)
 
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing sprints"))
@@ -158,17 +173,26 @@ def dict_to_project(data, owner=None):
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing wiki links"))
 
-    store_issues(proj, data)
+    if bulk:
+        service.bulk_store_issues(proj, data, progress=progress)
+    else:
+        store_issues(proj, data)
 
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing issues"))
 
-    store_user_stories(proj, data)
+    if bulk:
+        service.bulk_store_user_stories(proj, data, progress=progress)
+    else:
+        store_user_stories(proj, data)
 
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing user stories"))
 
-    store_tasks(proj, data)
+    if bulk:
+        service.bulk_store_tasks(proj, data, progress=progress)
+    else:
+        store_tasks(proj, data)
 
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing tasks"))
@@ -178,7 +202,11 @@ def dict_to_project(data, owner=None):
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing tags"))
 
-    store_timeline_entries(proj, data)
+    if bulk:
+        service.bulk_store_timeline_entries(proj, data, progress=progress)
+    else:
+        store_timeline_entries(proj, data)
+
     if service.get_errors(clear=False):
         raise TaigaImportError(_("error importing timelines"))
 
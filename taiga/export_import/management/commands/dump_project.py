@@ -16,16 +16,15 @@
 
 from django.core.management.base import BaseCommand, CommandError
 
+import sys
+
 from taiga.projects.models import Project
-from taiga.export_import.renderers import ExportRenderer
-from taiga.export_import.service import project_to_dict
+from taiga.export_import.service import render_project
 
 
 class Command(BaseCommand):
     args = '<project_slug project_slug ...>'
     help = 'Export a project to json'
-    renderer_context = {"indent": 4}
-    renderer = ExportRenderer()
 
     def handle(self, *args, **options):
         for project_slug in args:
@@ -34,5 +33,6 @@ class Command(BaseCommand):
             except Project.DoesNotExist:
                 raise CommandError('Project "%s" does not exist' % project_slug)
 
-            data = project_to_dict(project)
-            print(self.renderer.render(data, renderer_context=self.renderer_context).decode('utf-8'))
+            render_project(project, sys.stdout.buffer)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
@@ -38,8 +38,16 @@ class Command(BaseCommand):
                     dest='overwrite',
                     default=False,
                     help='Delete project if exists'),
+        make_option('--bulk',
+                    action='store_true',
+                    dest='bulk',
+                    default=False,
+                    help='Insert the user stories, tasks, issues and timeline in batches'),
         )
 
+    def _print_progress(self, section, done, total):
+        print("{}: {}/{}".format(section, done, total))
+
     def handle(self, *args, **options):
         data = json.loads(open(args[0], 'r').read())
         try:
@@ -58,7 +66,8 @@ class Command(BaseCommand):
                     except Project.DoesNotExist:
                         pass
                     signals.post_delete.receivers = receivers_back
-                dict_to_project(data, args[1])
+                dict_to_project(data, args[1], bulk=options["bulk"],
+                                progress=self._print_progress if options["bulk"] else None)
         except TaigaImportError as e:
             print("ERROR:", end=" ")
             print(e.message)
@@ -54,7 +54,11 @@ class AttachedFileField(serializers.WritableField):
         if not obj:
             return None
 
-        data = base64.b64encode(obj.read()).decode('utf-8')
+        if self.context.get("stream_files", False):
+            # The streaming exporter encodes the file content by chunks
+            data = obj
+        else:
+            data = base64.b64encode(obj.read()).decode('utf-8')
 
         return OrderedDict([
             ("data", data),
@@ -109,10 +113,19 @@ class UserRelatedField(RelatedNoneSafeField):
         return None
 
     def from_native(self, data):
+        cache = getattr(self, "context", {}).get("related_objects_cache", None)
+        cache_key = (users_models.User, "email", data)
+        if cache is not None and cache_key in cache:
+            return cache[cache_key]
+
         try:
-            return users_models.User.objects.get(email=data)
+            value = users_models.User.objects.get(email=data)
         except users_models.User.DoesNotExist:
-            return None
+            value = None
+
+        if cache is not None:
+            cache[cache_key] = value
+        return value
 
 
 class UserPkField(serializers.RelatedField):
@@ -154,12 +167,23 @@ class ProjectRelatedField(serializers.RelatedField):
         return None
 
     def from_native(self, data):
+        # The bulk importer shares a cache of the resolved objects
+        # between all the serializers of the same project.
+        cache = getattr(self, "context", {}).get("related_objects_cache", None)
+        cache_key = (self.queryset.model, self.slug_field, data)
+        if cache is not None and cache_key in cache:
+            return cache[cache_key]
+
         try:
             kwargs = {self.slug_field: data, "project": self.context['project']}
-            return self.queryset.get(**kwargs)
+            value = self.queryset.get(**kwargs)
         except ObjectDoesNotExist:
             raise ValidationError(_("{}=\"{}\" not found in this project".format(self.slug_field, data)))
 
+        if cache is not None:
+            cache[cache_key] = value
+        return value
+
 
 class HistoryUserField(JsonField):
     def to_native(self, obj):
@@ -262,7 +286,7 @@ class AttachmentExportSerializerMixin(serializers.ModelSerializer):
         content_type = ContentType.objects.get_for_model(obj.__class__)
         attachments_qs = attachments_models.Attachment.objects.filter(object_id=obj.pk,
                                                                       content_type=content_type)
-        return AttachmentExportSerializer(attachments_qs, many=True).data
+        return AttachmentExportSerializer(attachments_qs, many=True, context=self.context).data
 
 
 class PointsExportSerializer(serializers.ModelSerializer):
@@ -370,7 +394,7 @@ class BaseCustomAttributesValuesExportSerializer(serializers.ModelSerializer):
     _container_field = None
 
     class Meta:
-        exclude = ("id",)
+        exclude = ("id", "version_changes")
 
     def validate_attributes_values(self, attrs, source):
         # values must be a dict
@@ -484,7 +508,7 @@ class TaskExportSerializer(CustomAttributesValuesExportSerializerMixin, HistoryE
 
     class Meta:
         model = tasks_models.Task
-        exclude = ('id', 'project')
+        exclude = ('id', 'project', 'version_changes')
 
     def custom_attributes_queryset(self, project):
         return project.taskcustomattributes.all()
@@ -503,7 +527,7 @@ class UserStoryExportSerializer(CustomAttributesValuesExportSerializerMixin, His
 
     class Meta:
         model = userstories_models.UserStory
-        exclude = ('id', 'project', 'points', 'tasks')
+        exclude = ('id', 'project', 'points', 'tasks', 'version_changes')
 
     def custom_attributes_queryset(self, project):
         return project.userstorycustomattributes.all()
@@ -524,7 +548,7 @@ class IssueExportSerializer(CustomAttributesValuesExportSerializerMixin, History
 
     class Meta:
         model = issues_models.Issue
-        exclude = ('id', 'project')
+        exclude = ('id', 'project', 'version_changes', 'total_voters')
 
     def get_votes(self, obj):
         return [x.email for x in votes_service.get_voters(obj)]
@@ -542,7 +566,7 @@ class WikiPageExportSerializer(HistoryExportSerializerMixin, AttachmentExportSer
 
     class Meta:
         model = wiki_models.WikiPage
-        exclude = ('id', 'project')
+        exclude = ('id', 'project', 'version_changes')
 
 
 class WikiLinkExportSerializer(serializers.ModelSerializer):
@@ -619,7 +643,7 @@ class ProjectExportSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = projects_models.Project
-        exclude = ('id', 'creation_template', 'members')
+        exclude = ('id', 'creation_template', 'members', 'total_voters')
 
     def get_timeline(self, obj):
         timeline_qs = timeline_service.get_project_timeline(obj)
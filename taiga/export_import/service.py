@@ -14,6 +14,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import base64
+import itertools
+import tempfile
+import types
 import uuid
 import os.path as path
 from unidecode import unidecode
@@ -21,12 +25,25 @@ from unidecode import unidecode
 from django.template.defaultfilters import slugify
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
 
+from taiga.base.api.serializers import BaseSerializer
+from taiga.base.api.utils import encoders
+from taiga.base.utils import db
+
+from taiga.projects.history.models import HistoryEntry
 from taiga.projects.history.services import make_key_from_model_object
-from taiga.timeline.service import build_project_namespace
+from taiga.projects.custom_attributes.models import UserStoryCustomAttributesValues
+from taiga.projects.custom_attributes.models import TaskCustomAttributesValues
+from taiga.projects.custom_attributes.models import IssueCustomAttributesValues
+from taiga.projects.userstories.models import RolePoints
+from taiga.timeline.service import build_project_namespace, get_project_timeline
 from taiga.projects.references import sequences as seq
 from taiga.projects.references import models as refs
 from taiga.projects.services import find_invited_user
+from taiga.timeline.models import Timeline
 
 from . import serializers
 
@@ -51,6 +68,98 @@ def project_to_dict(project):
     return serializers.ProjectExportSerializer(project).data
 
 
+# Streaming export
+
+# Multiple of 3 so the base64 encoded chunks can be concatenated
+ATTACHMENTS_CHUNK_SIZE = 3 * 64 * 1024
+
+_json_encoder = encoders.JSONEncoder(ensure_ascii=False)
+
+
+def _write(outfile, data):
+    outfile.write(data.encode("utf-8"))
+
+
+def _write_json_file(outfile, file):
+    _write(outfile, '"')
+    try:
+        for chunk in file.chunks(ATTACHMENTS_CHUNK_SIZE):
+            _write(outfile, base64.b64encode(chunk).decode("utf-8"))
+    finally:
+        file.close()
+    _write(outfile, '"')
+
+
+def _write_json_container(outfile, brackets, items, indent, level):
+    separator = "\n" + " " * indent * (level + 1) if indent else ""
+
+    _write(outfile, brackets[0])
+    empty = True
+    for key, value in items:
+        _write(outfile, ("," if not empty else "") + separator)
+        if key is not None:
+            _write(outfile, _json_encoder.encode(str(key)) + ": ")
+        _write_json(outfile, value, indent, level + 1)
+        empty = False
+
+    if not empty and indent:
+        _write(outfile, "\n" + " " * indent * level)
+    _write(outfile, brackets[1])
+
+
+def _write_json(outfile, value, indent=None, level=0):
+    if isinstance(value, File):
+        _write_json_file(outfile, value)
+    elif isinstance(value, dict):
+        _write_json_container(outfile, "{}", value.items(), indent, level)
+    elif isinstance(value, (list, tuple, types.GeneratorType)):
+        _write_json_container(outfile, "[]", ((None, item) for item in value), indent, level)
+    else:
+        _write(outfile, _json_encoder.encode(value))
+
+
+def _iter_project_export_sections(project, serializer):
+    for field_name, field in serializer.fields.items():
+        field.initialize(parent=serializer, field_name=field_name)
+
+        if field_name == "timeline":
+            timeline_qs = get_project_timeline(project)
+            value = (serializers.TimelineExportSerializer(item).data
+                     for item in timeline_qs.iterator())
+        elif isinstance(field, BaseSerializer) and field.many:
+            related_qs = getattr(project, field.source or field_name).all()
+            value = (field.to_native(item) for item in related_qs.iterator())
+        else:
+            value = field.field_to_native(project, field_name)
+
+        yield serializer.get_field_key(field_name), value
+
+
+def render_project(project, outfile, indent=4):
+    """
+    Write the json export of a project to `outfile` (a file-like
+    object opened in binary mode).
+
+    Unlike `project_to_dict`, the dump is written section by section
+    and object by object, and the attachments are encoded by chunks,
+    so the used memory does not depend on the project size.
+    """
+    serializer = serializers.ProjectExportSerializer(context={"stream_files": True})
+    _write_json_container(outfile, "{}", _iter_project_export_sections(project, serializer),
+                          indent, 0)
+
+
+def dump_project_to_storage(project, path):
+    """
+    Render the export of a project to a temporary file and
+    store it in the default storage with the given path.
+    """
+    with tempfile.TemporaryFile() as dump_file:
+        render_project(project, dump_file)
+        dump_file.seek(0)
+        default_storage.save(path, File(dump_file))
+
+
 def store_project(data):
     project_data = {}
     for key, value in data.items():
@@ -449,3 +558,237 @@ def store_issue(project, data):
 
     add_errors("issues", serialized.errors)
     return None
+
+
+# Bulk import
+
+BULK_IMPORT_BATCH_SIZE = 500
+
+
+def _batches(items, size=BULK_IMPORT_BATCH_SIZE):
+    for index in range(0, len(items), size):
+        yield items[index:index + size]
+
+
+def _get_max_ref(data):
+    items = itertools.chain(data.get("user_stories", []), data.get("tasks", []), data.get("issues", []),
+                            *[milestone.get("tasks_without_us", []) for milestone in data.get("milestones", [])])
+    return max([item["ref"] for item in items if item.get("ref", None)] or [0])
+
+
+def bulk_prepare_references(project, data):
+    """
+    Create the references sequence of a project and move it after
+    the biggest ref of the dump, so refs can be allocated in blocks
+    for the items that don't have one.
+    """
+    sequence_name = refs.make_sequence_name(project)
+    if not seq.exists(sequence_name):
+        seq.create(sequence_name)
+
+    max_ref = _get_max_ref(data)
+    if max_ref:
+        seq.set_max(sequence_name, max_ref)
+
+
+def _bulk_allocate_refs(project, instances):
+    without_ref = [instance for instance in instances if not instance.ref]
+    if without_ref:
+        sequence_name = refs.make_sequence_name(project)
+        for instance, ref in zip(without_ref, seq.next_values(sequence_name, len(without_ref))):
+            instance.ref = ref
+    return without_ref
+
+
+def _bulk_store_references(project, instances):
+    if not instances:
+        return
+
+    content_type = ContentType.objects.get_for_model(instances[0].__class__)
+    refs.Reference.objects.bulk_create([
+        refs.Reference(content_type=content_type, object_id=instance.pk,
+                       ref=instance.ref, project=project)
+        for instance in instances
+    ])
+
+
+def _bulk_store_m2m_data(instances):
+    through_rows = {}
+    for instance in instances:
+        for field_name, values in getattr(instance, "_m2m_data", {}).items():
+            field = instance._meta.get_field(field_name)
+            through = field.rel.through
+            for value in values or []:
+                through_rows.setdefault(through, []).append(through(**{
+                    "{}_id".format(field.m2m_field_name()): instance.pk,
+                    "{}_id".format(field.m2m_reverse_field_name()): value.pk,
+                }))
+        instance._m2m_data = {}
+
+    for through, rows in through_rows.items():
+        through.objects.bulk_create(rows)
+
+
+def _bulk_store_histories(project, items):
+    entries = []
+    for obj, data in items:
+        for history in data.get("history", []):
+            serialized = serializers.HistoryExportSerializer(data=history, context={"project": project})
+            if not serialized.is_valid():
+                add_errors("history", serialized.errors)
+                continue
+
+            serialized.object.key = make_key_from_model_object(obj)
+            if serialized.object.diff is None:
+                serialized.object.diff = []
+            entries.append(serialized.object)
+
+    HistoryEntry.objects.bulk_create(entries)
+
+
+def _bulk_store_role_points(project, items, context):
+    role_points = []
+    for obj, data in items:
+        for role_point in data.get("role_points", []):
+            serialized = serializers.RolePointsExportSerializer(data=role_point, context=context)
+            if not serialized.is_valid():
+                add_errors("role_points", serialized.errors)
+                continue
+
+            serialized.object.user_story = obj
+            role_points.append(serialized.object)
+
+    RolePoints.objects.bulk_create(role_points)
+
+
+def _bulk_store_custom_attributes_values(project, items, values_model, container_field, custom_attributes):
+    values = []
+    for obj, data in items:
+        attributes_values = _use_id_instead_name_as_key_in_custom_attributes_values(
+            custom_attributes, data.get("custom_attributes_values", None) or {})
+        values.append(values_model(**{container_field: obj, "attributes_values": attributes_values}))
+
+    values_model.objects.bulk_create(values)
+
+
+def _bulk_store_items(project, items_data, section, serializer_class, values_model, container_field,
+                      custom_attributes, context, progress=None):
+    total = len(items_data)
+    done = 0
+    for batch in _batches(items_data):
+        items = []
+        for data in batch:
+            item_data = {key: value for key, value in data.items()
+                         if key not in ["role_points", "custom_attributes_values"]}
+            serialized = serializer_class(data=item_data, context=context)
+            if not serialized.is_valid():
+                add_errors(section, serialized.errors)
+                continue
+
+            obj = serialized.object
+            obj.project = project
+            if obj.owner is None:
+                obj.owner = project.owner
+            if obj.modified_date is None:
+                obj.modified_date = timezone.now()
+            obj._importing = True
+            obj._not_notify = True
+            items.append((obj, data))
+
+        instances = [obj for obj, data in items]
+        new_refs = _bulk_allocate_refs(project, instances)
+        db.bulk_create_with_ids(serializer_class.Meta.model, instances)
+        _bulk_store_references(project, new_refs)
+        _bulk_store_m2m_data(instances)
+
+        if section == "user_stories":
+            _bulk_store_role_points(project, items, context)
+
+        _bulk_store_custom_attributes_values(project, items, values_model, container_field,
+                                             custom_attributes)
+        _bulk_store_histories(project, items)
+
+        for obj, data in items:
+            for attachment in data.get("attachments", []):
+                store_attachment(project, obj, attachment)
+
+        done += len(batch)
+        if progress is not None:
+            progress(section, done, total)
+
+
+def bulk_store_issues(project, data, progress=None):
+    issues_data = data.get("issues", [])
+    for issue_data in issues_data:
+        if "type" not in issue_data and project.default_issue_type:
+            issue_data["type"] = project.default_issue_type.name
+        if "status" not in issue_data and project.default_issue_status:
+            issue_data["status"] = project.default_issue_status.name
+        if "priority" not in issue_data and project.default_priority:
+            issue_data["priority"] = project.default_priority.name
+        if "severity" not in issue_data and project.default_severity:
+            issue_data["severity"] = project.default_severity.name
+
+    custom_attributes = list(project.issuecustomattributes.all().values('id', 'name'))
+    context = {"project": project, "related_objects_cache": {}}
+    _bulk_store_items(project, issues_data, "issues", serializers.IssueExportSerializer,
+                      IssueCustomAttributesValues, "issue", custom_attributes, context,
+                      progress=progress)
+
+
+def bulk_store_user_stories(project, data, progress=None):
+    user_stories_data = data.get("user_stories", [])
+    for us_data in user_stories_data:
+        if "status" not in us_data and project.default_us_status:
+            us_data["status"] = project.default_us_status.name
+
+    custom_attributes = list(project.userstorycustomattributes.all().values('id', 'name'))
+    context = {"project": project, "related_objects_cache": {}}
+    _bulk_store_items(project, user_stories_data, "user_stories", serializers.UserStoryExportSerializer,
+                      UserStoryCustomAttributesValues, "user_story", custom_attributes, context,
+                      progress=progress)
+
+
+def bulk_store_tasks(project, data, progress=None):
+    tasks_data = list(data.get("tasks", []))
+    for milestone in data.get("milestones", []):
+        for task_without_us in milestone.get("tasks_without_us", []):
+            task_without_us["user_story"] = None
+            tasks_data.append(task_without_us)
+
+    for task_data in tasks_data:
+        if "status" not in task_data and project.default_task_status:
+            task_data["status"] = project.default_task_status.name
+
+    custom_attributes = list(project.taskcustomattributes.all().values('id', 'name'))
+    context = {"project": project, "related_objects_cache": {}}
+    _bulk_store_items(project, tasks_data, "tasks", serializers.TaskExportSerializer,
+                      TaskCustomAttributesValues, "task", custom_attributes, context,
+                      progress=progress)
+
+
+def bulk_store_timeline_entries(project, data, progress=None):
+    timeline_data = data.get("timeline", [])
+    namespace = build_project_namespace(project)
+    context = {"project": project}
+
+    total = len(timeline_data)
+    done = 0
+    for batch in _batches(timeline_data):
+        entries = []
+        for timeline in batch:
+            serialized = serializers.TimelineExportSerializer(data=timeline, context=context)
+            if not serialized.is_valid():
+                add_errors("timeline", serialized.errors)
+                continue
+
+            serialized.object.project = project
+            serialized.object.namespace = namespace
+            serialized.object.object_id = project.id
+            entries.append(serialized.object)
+
+        Timeline.objects.bulk_create(entries)
+
+        done += len(batch)
+        if progress is not None:
+            progress("timeline", done, total)
@@ -17,7 +17,6 @@
 import datetime
 
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 from django.utils import timezone
 from django.conf import settings
 from django.utils.translation import ugettext as _
@@ -26,9 +25,8 @@ from djmail.template_mail import MagicMailBuilder, InlineCSSTemplateMail
 
 from taiga.celery import app
 
-from .service import project_to_dict
+from .service import dump_project_to_storage
 from .dump_service import dict_to_project
-from .renderers import ExportRenderer
 
 
 @app.task(bind=True)
@@ -37,11 +35,7 @@ def dump_project(self, user, project):
     path = "exports/{}/{}-{}.json".format(project.pk, project.slug, self.request.id)
 
     try:
-        content = ExportRenderer().render(project_to_dict(project), renderer_context={"indent": 4})
-        content = content.decode('utf-8')
-        content = ContentFile(content)
-
-        default_storage.save(path, content)
+        dump_project_to_storage(project, path)
         url = default_storage.url(path)
     except Exception:
         ctx = {
@@ -70,12 +64,17 @@ def delete_project_dump(project_id, project_slug, task_id):
     default_storage.delete("exports/{}/{}-{}.json".format(project_id, project_slug, task_id))
 
 
-@app.task
-def load_project_dump(user, dump):
+@app.task(bind=True)
+def load_project_dump(self, user, dump):
     mbuilder = MagicMailBuilder(template_mail_cls=InlineCSSTemplateMail)
 
+    def progress(section, done, total):
+        if self.request.is_eager:
+            return
+        self.update_state(state="PROGRESS", meta={"section": section, "done": done, "total": total})
+
     try:
-        project = dict_to_project(dump, user.email)
+        project = dict_to_project(dump, user.email, bulk=settings.IMPORTS_BULK_MODE, progress=progress)
     except Exception:
         ctx = {
             "user": user,
@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from django.conf import settings
 from django.utils.translation import ugettext as _
 
 from taiga.base import exceptions as exc
@@ -23,6 +24,7 @@ from taiga.base.utils import json
 from taiga.projects.models import Project
 
 from .exceptions import ActionSyntaxException
+from . import tasks
 
 
 class BaseWebhookApiViewSet(GenericViewSet):
@@ -68,6 +70,14 @@ class BaseWebhookApiViewSet(GenericViewSet):
         payload = self._get_payload(request)
 
         event_hook_class = self.event_hook_classes.get(event_name, None)
+        if event_hook_class is not None and settings.CELERY_ENABLED and settings.HOOKS_ASYNC_PROCESSING:
+            # Reply before processing the event so the provider doesn't time
+            # out (and redeliver it) on large pushes.
+            event_hook_class_path = "{}.{}".format(event_hook_class.__module__,
+                                                   event_hook_class.__name__)
+            tasks.process_event.delay(project.id, event_hook_class_path, payload)
+            return response.Accepted()
+
         if event_hook_class is not None:
             event_hook = event_hook_class(project, payload)
             try:
@@ -14,6 +14,16 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import re
+
+from django.utils.translation import ugettext as _
+
+from taiga.projects.history.services import take_snapshot
+from taiga.projects.notifications.services import send_notifications
+from taiga.projects.references.services import get_instances_by_refs
+
+from .exceptions import ActionSyntaxException
+
 
 class BaseEventHook:
     def __init__(self, project, payload):
@@ -22,3 +32,84 @@ class BaseEventHook:
 
     def process_event(self):
         raise NotImplementedError("process_event must be overwritten")
+
+
+class BasePushEventHook(BaseEventHook):
+    """
+    Change the status of the user stories, tasks and issues referenced
+    in the messages of the pushed commits.
+
+    The references and the statuses of every commit of the push are
+    resolved in bulk before the changes are applied.
+    """
+    change_status_rx = re.compile(r"tg-(\d+) +#([-\w]+)")
+
+    def get_commits(self):
+        """
+        Return a list of (commit, vcs_user) for every pushed commit.
+        """
+        raise NotImplementedError("get_commits must be overwritten")
+
+    def get_comment(self, commit, vcs_user):
+        raise NotImplementedError("get_comment must be overwritten")
+
+    def get_user(self, commit, vcs_user):
+        raise NotImplementedError("get_user must be overwritten")
+
+    def process_event(self):
+        if self.payload is None:
+            return
+
+        changes = []
+        for commit, vcs_user in self.get_commits():
+            # The message we will be looking for seems like
+            #   TG-XX #yyyyyy
+            # Where:
+            #   XX: is the ref for us, issue or task
+            #   yyyyyy: is the status slug we are setting
+            message = commit.get("message", None)
+            if message is None:
+                continue
+
+            m = self.change_status_rx.search(message.lower())
+            if m:
+                changes.append((int(m.group(1)), m.group(2), commit, vcs_user))
+
+        if not changes:
+            return
+
+        references = get_instances_by_refs(self.project.id, [change[0] for change in changes])
+        statuses = self._get_statuses(references.values(), [change[1] for change in changes])
+
+        for ref, status_slug, commit, vcs_user in changes:
+            reference = references.get(ref, None)
+            if reference is None or reference.content_object is None:
+                raise ActionSyntaxException(_("The referenced element doesn't exist"))
+
+            element = reference.content_object
+            status = statuses.get((self._get_status_model(element), status_slug), None)
+            if status is None:
+                raise ActionSyntaxException(_("The status doesn't exist"))
+
+            self._change_status(element, status, commit, vcs_user)
+
+    def _get_status_model(self, element):
+        return element._meta.get_field("status").rel.to
+
+    def _get_statuses(self, references, status_slugs):
+        status_models = {self._get_status_model(reference.content_object) for reference in references
+                                                                          if reference.content_object is not None}
+        statuses = {}
+        for status_model in status_models:
+            for status in status_model.objects.filter(project=self.project, slug__in=set(status_slugs)):
+                statuses[(status_model, status.slug)] = status
+        return statuses
+
+    def _change_status(self, element, status, commit, vcs_user):
+        element.status = status
+        element.save()
+
+        snapshot = take_snapshot(element,
+                                 comment=self.get_comment(commit, vcs_user),
+                                 user=self.get_user(commit, vcs_user))
+        send_notifications(element, history=snapshot)
@@ -16,14 +16,12 @@
 
 from django.utils.translation import ugettext as _
 
-from taiga.projects.models import IssueStatus, TaskStatus, UserStoryStatus
-
 from taiga.projects.issues.models import Issue
 from taiga.projects.tasks.models import Task
 from taiga.projects.userstories.models import UserStory
 from taiga.projects.history.services import take_snapshot
 from taiga.projects.notifications.services import send_notifications
-from taiga.hooks.event_hooks import BaseEventHook
+from taiga.hooks.event_hooks import BaseEventHook, BasePushEventHook
 from taiga.hooks.exceptions import ActionSyntaxException
 
 from .services import get_github_user
@@ -31,60 +29,15 @@ from .services import get_github_user
 import re
 
 
-class PushEventHook(BaseEventHook):
-    def process_event(self):
-        if self.payload is None:
-            return
-
+class PushEventHook(BasePushEventHook):
+    def get_commits(self):
         github_user = self.payload.get('sender', {})
+        return [(commit, github_user) for commit in self.payload.get("commits", [])]
 
-        commits = self.payload.get("commits", [])
-        for commit in commits:
-            self._process_commit(commit, github_user)
-
-    def _process_commit(self, commit, github_user):
-        """
-          The message we will be looking for seems like
-            TG-XX #yyyyyy
-          Where:
-            XX: is the ref for us, issue or task
-            yyyyyy: is the status slug we are setting
-        """
-        message = commit.get("message", None)
-
-        if message is None:
-            return
-
-        p = re.compile("tg-(\d+) +#([-\w]+)")
-        m = p.search(message.lower())
-        if m:
-            ref = m.group(1)
-            status_slug = m.group(2)
-            self._change_status(ref, status_slug, github_user, commit)
-
-    def _change_status(self, ref, status_slug, github_user, commit):
-        if Issue.objects.filter(project=self.project, ref=ref).exists():
-            modelClass = Issue
-            statusClass = IssueStatus
-        elif Task.objects.filter(project=self.project, ref=ref).exists():
-            modelClass = Task
-            statusClass = TaskStatus
-        elif UserStory.objects.filter(project=self.project, ref=ref).exists():
-            modelClass = UserStory
-            statusClass = UserStoryStatus
-        else:
-            raise ActionSyntaxException(_("The referenced element doesn't exist"))
-
-        element = modelClass.objects.get(project=self.project, ref=ref)
-
-        try:
-            status = statusClass.objects.get(project=self.project, slug=status_slug)
-        except statusClass.DoesNotExist:
-            raise ActionSyntaxException(_("The status doesn't exist"))
-
-        element.status = status
-        element.save()
+    def get_user(self, commit, github_user):
+        return get_github_user(github_user.get('id', None))
 
+    def get_comment(self, commit, github_user):
         github_user_id = github_user.get('id', None)
         github_user_name = github_user.get('login', None)
         github_user_url = github_user.get('html_url', None)
@@ -94,23 +47,17 @@ class PushEventHook(BaseEventHook):
 
         if (github_user_id and github_user_name and github_user_url and
                 commit_id and commit_url and commit_message):
-            comment = _("Status changed by [@{github_user_name}]({github_user_url} "
-                        "\"See @{github_user_name}'s GitHub profile\") "
-                        "from GitHub commit [{commit_id}]({commit_url} "
-                        "\"See commit '{commit_id} - {commit_message}'\").").format(
-                                                               github_user_name=github_user_name,
-                                                               github_user_url=github_user_url,
-                                                               commit_id=commit_id[:7],
-                                                               commit_url=commit_url,
-                                                               commit_message=commit_message)
-
-        else:
-            comment = _("Status changed from GitHub commit.")
-
-        snapshot = take_snapshot(element,
-                                 comment=comment,
-                                 user=get_github_user(github_user_id))
-        send_notifications(element, history=snapshot)
+            return _("Status changed by [@{github_user_name}]({github_user_url} "
+                     "\"See @{github_user_name}'s GitHub profile\") "
+                     "from GitHub commit [{commit_id}]({commit_url} "
+                     "\"See commit '{commit_id} - {commit_message}'\").").format(
+                                                            github_user_name=github_user_name,
+                                                            github_user_url=github_user_url,
+                                                            commit_id=commit_id[:7],
+                                                            commit_url=commit_url,
+                                                            commit_message=commit_message)
+
+        return _("Status changed from GitHub commit.")
 
 
 def replace_github_references(project_url, wiki_text):
@@ -19,74 +19,24 @@ import os
 
 from django.utils.translation import ugettext as _
 
-from taiga.projects.models import IssueStatus, TaskStatus, UserStoryStatus
-
 from taiga.projects.issues.models import Issue
-from taiga.projects.tasks.models import Task
-from taiga.projects.userstories.models import UserStory
 from taiga.projects.history.services import take_snapshot
 from taiga.projects.notifications.services import send_notifications
-from taiga.hooks.event_hooks import BaseEventHook
+from taiga.hooks.event_hooks import BaseEventHook, BasePushEventHook
 from taiga.hooks.exceptions import ActionSyntaxException
 
 from .services import get_gitlab_user
 
 
-class PushEventHook(BaseEventHook):
-    def process_event(self):
-        if self.payload is None:
-            return
+class PushEventHook(BasePushEventHook):
+    def get_commits(self):
+        return [(commit, None) for commit in self.payload.get("commits", [])]
 
-        commits = self.payload.get("commits", [])
-        for commit in commits:
-            message = commit.get("message", None)
-            self._process_message(message, None)
-
-    def _process_message(self, message, gitlab_user):
-        """
-          The message we will be looking for seems like
-            TG-XX #yyyyyy
-          Where:
-            XX: is the ref for us, issue or task
-            yyyyyy: is the status slug we are setting
-        """
-        if message is None:
-            return
+    def get_user(self, commit, gitlab_user):
+        return get_gitlab_user(gitlab_user)
 
-        p = re.compile("tg-(\d+) +#([-\w]+)")
-        m = p.search(message.lower())
-        if m:
-            ref = m.group(1)
-            status_slug = m.group(2)
-            self._change_status(ref, status_slug, gitlab_user)
-
-    def _change_status(self, ref, status_slug, gitlab_user):
-        if Issue.objects.filter(project=self.project, ref=ref).exists():
-            modelClass = Issue
-            statusClass = IssueStatus
-        elif Task.objects.filter(project=self.project, ref=ref).exists():
-            modelClass = Task
-            statusClass = TaskStatus
-        elif UserStory.objects.filter(project=self.project, ref=ref).exists():
-            modelClass = UserStory
-            statusClass = UserStoryStatus
-        else:
-            raise ActionSyntaxException(_("The referenced element doesn't exist"))
-
-        element = modelClass.objects.get(project=self.project, ref=ref)
-
-        try:
-            status = statusClass.objects.get(project=self.project, slug=status_slug)
-        except statusClass.DoesNotExist:
-            raise ActionSyntaxException(_("The status doesn't exist"))
-
-        element.status = status
-        element.save()
-
-        snapshot = take_snapshot(element,
-                                 comment=_("Status changed from GitLab commit"),
-                                 user=get_gitlab_user(gitlab_user))
-        send_notifications(element, history=snapshot)
+    def get_comment(self, commit, gitlab_user):
+        return _("Status changed from GitLab commit")
 
 
 def replace_gitlab_references(project_url, wiki_text):
@@ -0,0 +1,48 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from taiga.base import exceptions as exc
+from taiga.celery import app
+from taiga.projects.models import Project
+
+from .exceptions import ActionSyntaxException
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def process_event(project_id, event_hook_class_path, payload):
+    try:
+        project = Project.objects.get(id=project_id)
+    except Project.DoesNotExist:
+        return
+
+    event_hook_class = import_string(event_hook_class_path)
+    event_hook = event_hook_class(project, payload)
+
+    try:
+        with transaction.atomic():
+            event_hook.process_event()
+    except (ActionSyntaxException, exc.BadRequest) as e:
+        # The provider got its response when the payload was queued, so the
+        # errors can only be logged here.
+        logger.warning("Error processing the %s event of the project %s: %s",
+                       event_hook_class_path, project_id, e)
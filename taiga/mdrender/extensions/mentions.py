@@ -23,28 +23,61 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import re
+
 from markdown.extensions import Extension
 from markdown.inlinepatterns import Pattern
+from markdown.preprocessors import Preprocessor
 from markdown.util import etree, AtomicString
 
 from taiga.users.models import User
 
 
+MENTION_RE = r'(@)([a-z0-9.-\.]+)'
+
+
 class MentionsExtension(Extension):
     def extendMarkdown(self, md, md_globals):
-        MENTION_RE = r'(@)([a-z0-9.-\.]+)'
         mentionsPattern = MentionsPattern(MENTION_RE)
         mentionsPattern.md = md
         md.inlinePatterns.add('mentions', mentionsPattern, '_end')
+        md.preprocessors.add('mentions', MentionsPreprocessor(md, mentionsPattern), '_begin')
+
+
+class MentionsPreprocessor(Preprocessor):
+    """
+    Resolve every mentioned user found in the text with one
+    query before the inline patterns run.
+    """
+    mentions_rx = re.compile(MENTION_RE)
+
+    def __init__(self, md, pattern):
+        self.pattern = pattern
+        super().__init__(md)
+
+    def run(self, lines):
+        usernames = {username for _, username in self.mentions_rx.findall("\n".join(lines))}
+        self.pattern.users = dict.fromkeys(usernames)
+        if usernames:
+            self.pattern.users.update((user.username, user)
+                                      for user in User.objects.filter(username__in=usernames))
+        return lines
 
 
 class MentionsPattern(Pattern):
+    # Dict of username -> User (or None) filled by the preprocessor
+    users = None
+
+    def _get_user(self, username):
+        if self.users is None or username not in self.users:
+            return User.objects.filter(username=username).first()
+        return self.users[username]
+
     def handleMatch(self, m):
         username = m.group(3)
 
-        try:
-            user = User.objects.get(username=username)
-        except User.DoesNotExist:
+        user = self._get_user(username)
+        if user is None:
             return "@{}".format(username)
 
         url = "/profile/{}".format(username)
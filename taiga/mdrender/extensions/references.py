@@ -23,35 +23,70 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import re
+
 from markdown.extensions import Extension
 from markdown.inlinepatterns import Pattern
+from markdown.preprocessors import Preprocessor
 from markdown.util import etree
 
-from taiga.projects.references.services import get_instance_by_ref
+from taiga.projects.references.services import get_instance_by_ref, get_instances_by_refs
 from taiga.front import resolve
 
 
+TAIGA_REFERENCE_RE = r'(?<=^|(?<=[^a-zA-Z0-9-\[]))#(\d+)'
+
+
 class TaigaReferencesExtension(Extension):
     def __init__(self, project, *args, **kwargs):
         self.project = project
         return super().__init__(*args, **kwargs)
 
     def extendMarkdown(self, md, md_globals):
-        TAIGA_REFERENCE_RE = r'(?<=^|(?<=[^a-zA-Z0-9-\[]))#(\d+)'
         referencesPattern = TaigaReferencesPattern(TAIGA_REFERENCE_RE, self.project)
         referencesPattern.md = md
         md.inlinePatterns.add('taiga-references', referencesPattern, '_begin')
+        md.preprocessors.add('taiga-references',
+                             TaigaReferencesPreprocessor(md, referencesPattern),
+                             '_begin')
+
+
+class TaigaReferencesPreprocessor(Preprocessor):
+    """
+    Resolve every ref found in the text with one query (and one more
+    for each type of referenced object) before the inline patterns run.
+    """
+    refs_rx = re.compile(TAIGA_REFERENCE_RE, re.MULTILINE)
+
+    def __init__(self, md, pattern):
+        self.pattern = pattern
+        super().__init__(md)
+
+    def run(self, lines):
+        obj_refs = {int(obj_ref) for obj_ref in self.refs_rx.findall("\n".join(lines))}
+        self.pattern.references = dict.fromkeys(obj_refs)
+        if obj_refs:
+            self.pattern.references.update(get_instances_by_refs(self.pattern.project.id, obj_refs))
+        return lines
 
 
 class TaigaReferencesPattern(Pattern):
+    # Dict of ref -> Reference (or None) filled by the preprocessor
+    references = None
+
     def __init__(self, pattern, project):
         self.project = project
         super().__init__(pattern)
 
+    def _get_instance(self, obj_ref):
+        if self.references is None or int(obj_ref) not in self.references:
+            return get_instance_by_ref(self.project.id, obj_ref)
+        return self.references[int(obj_ref)]
+
     def handleMatch(self, m):
         obj_ref = m.group(2)
 
-        instance = get_instance_by_ref(self.project.id, obj_ref)
+        instance = self._get_instance(obj_ref)
         if instance is None or instance.content_object is None:
             return "#{}".format(obj_ref)
 
@@ -15,14 +15,55 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from django.db.models import Prefetch
+
 from taiga.projects.models import Membership, Project
 from .permissions import OWNERS_PERMISSIONS, MEMBERS_PERMISSIONS, ANON_PERMISSIONS, USER_PERMISSIONS
 
 
+def _get_user_memberships_attr(user):
+    return "_user_{}_memberships".format(user.id)
+
+
+def attach_user_memberships_to_project_queryset(user, queryset):
+    """
+    Prefetch the membership (and role) of the user on each project of the
+    queryset so permissions checks over them don't hit the database.
+    """
+    if user.is_anonymous():
+        return queryset
+
+    memberships = Membership.objects.filter(user=user).select_related("role")
+    return queryset.prefetch_related(Prefetch("memberships", queryset=memberships,
+                                              to_attr=_get_user_memberships_attr(user)))
+
+
+def attach_is_owner_to_project_queryset(user, queryset, as_field="i_am_owner"):
+    """
+    Attach a boolean, true if the user is owner of the project, to each project
+    of the queryset.
+    """
+    if user.is_superuser:
+        sql = "TRUE"
+    elif user.is_anonymous():
+        sql = "FALSE"
+    else:
+        sql = ("EXISTS (SELECT 1 FROM projects_membership "
+               "WHERE projects_membership.project_id = projects_project.id "
+               "AND projects_membership.user_id = {user_id} "
+               "AND projects_membership.is_owner)").format(user_id=user.id)
+    return queryset.extra(select={as_field: sql})
+
+
 def _get_user_project_membership(user, project):
     if user.is_anonymous():
         return None
 
+    # Memberships attached with attach_user_memberships_to_project_queryset
+    memberships = getattr(project, _get_user_memberships_attr(user), None)
+    if memberships is not None:
+        return memberships[0] if memberships else None
+
     try:
         return Membership.objects.get(user=user, project=project)
     except Membership.DoesNotExist:
@@ -37,6 +37,7 @@ from taiga.projects.mixins.on_destroy import MoveOnDestroyMixin
 from taiga.projects.userstories.models import UserStory, RolePoints
 from taiga.projects.tasks.models import Task
 from taiga.projects.issues.models import Issue
+from taiga.projects.issues.api import IssuesFilter
 from taiga.permissions import service as permissions_service
 
 from . import serializers
@@ -46,7 +47,6 @@ from . import services
 
 from .votes import serializers as votes_serializers
 from .votes import services as votes_service
-from .votes.utils import attach_votescount_to_queryset
 
 ######################################################
 ## Project
@@ -59,7 +59,8 @@ class ProjectViewSet(HistoryResourceMixin, ModelCrudViewSet):
     permission_classes = (permissions.ProjectPermission, )
     filter_backends = (filters.CanViewProjectObjFilterBackend,)
     filter_fields = (('member', 'members'),)
-    order_by_fields = ("memberships__user_order",)
+    order_by_fields = ("memberships__user_order",
+                       "total_voters")
 
     @list_route(methods=["POST"])
     def bulk_update_order(self, request, **kwargs):
@@ -75,8 +76,7 @@ class ProjectViewSet(HistoryResourceMixin, ModelCrudViewSet):
         return response.NoContent(data=None)
 
     def get_queryset(self):
-        qs = models.Project.objects.all()
-        return attach_votescount_to_queryset(qs, as_field="stars_count")
+        return models.Project.objects.all()
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -164,7 +164,8 @@ class ProjectViewSet(HistoryResourceMixin, ModelCrudViewSet):
     def issue_filters_data(self, request, pk=None):
         project = self.get_object()
         self.check_permissions(request, "issues_filters_data", project)
-        return response.Ok(services.get_issues_filters_data(project))
+        filters = IssuesFilter()._prepare_filters_data(request)
+        return response.Ok(services.get_issues_filters_data(project, filters))
 
     @detail_route(methods=["GET"])
     def tags_colors(self, request, pk=None):
@@ -51,3 +51,22 @@ class ProjectsAppConfig(AppConfig):
                                  sender=apps.get_model("projects", "Project"))
         signals.pre_save.connect(handlers.update_project_tags_when_create_or_edit_taggable_item,
                                   sender=apps.get_model("projects", "Project"))
+
+        # Issues filters data
+        for model_name in ["Membership", "IssueStatus", "IssueType", "Priority", "Severity"]:
+            model = apps.get_model("projects", model_name)
+            signals.post_save.connect(handlers.invalidate_issues_filters_data_cache, sender=model,
+                                      dispatch_uid="invalidate_issues_filters_data_cache_{}".format(model_name))
+            signals.post_delete.connect(handlers.invalidate_issues_filters_data_cache, sender=model,
+                                        dispatch_uid="invalidate_issues_filters_data_cache_{}".format(model_name))
+
+        # Users contacts and stats
+        signals.post_save.connect(handlers.invalidate_profile_data_cache_of_members,
+                                  sender=apps.get_model("projects", "Membership"),
+                                  dispatch_uid="invalidate_profile_data_cache_of_members")
+        signals.post_delete.connect(handlers.invalidate_profile_data_cache_of_members,
+                                    sender=apps.get_model("projects", "Membership"),
+                                    dispatch_uid="invalidate_profile_data_cache_of_members")
+        signals.post_save.connect(handlers.invalidate_profile_data_cache_of_project_members,
+                                  sender=apps.get_model("projects", "Project"),
+                                  dispatch_uid="invalidate_profile_data_cache_of_project_members")
@@ -18,13 +18,17 @@ import os.path as path
 import mimetypes
 mimetypes.init()
 
+from django.conf import settings
+from django.db import transaction
 from django.utils.translation import ugettext as _
 from django.contrib.contenttypes.models import ContentType
 
 from taiga.base import filters
 from taiga.base import exceptions as exc
+from taiga.base import response
 from taiga.base.api import ModelCrudViewSet
 from taiga.base.api.utils import get_object_or_404
+from taiga.base.decorators import list_route
 
 from taiga.projects.notifications.mixins import WatchedResourceMixin
 from taiga.projects.history.mixins import HistoryResourceMixin
@@ -32,6 +36,7 @@ from taiga.projects.history.mixins import HistoryResourceMixin
 from . import permissions
 from . import serializers
 from . import models
+from . import services
 
 
 class BaseAttachmentViewSet(HistoryResourceMixin, WatchedResourceMixin, ModelCrudViewSet):
@@ -72,6 +77,109 @@ class BaseAttachmentViewSet(HistoryResourceMixin, WatchedResourceMixin, ModelCru
     def get_object_for_snapshot(self, obj):
         return obj.content_object
 
+    # Chunked uploads
+
+    def _get_upload(self, request):
+        if not request.user.is_authenticated():
+            raise exc.NotAuthenticated()
+
+        queryset = models.AttachmentUpload.objects.select_for_update()
+        return get_object_or_404(queryset,
+                                 id=request.QUERY_PARAMS.get("upload", None),
+                                 content_type=self.get_content_type(),
+                                 owner=request.user)
+
+    @list_route(methods=["POST"])
+    def start_upload(self, request, **kwargs):
+        """
+        Start a chunked upload of a new attachment.
+        """
+        if not request.user.is_authenticated():
+            raise exc.NotAuthenticated()
+
+        serializer = serializers.AttachmentUploadSerializer(data=request.DATA)
+        if not serializer.is_valid():
+            return response.BadRequest(serializer.errors)
+
+        upload = serializer.object
+        upload.content_type = self.get_content_type()
+        upload.owner = request.user
+        self.check_permissions(request, "create", upload)
+
+        if upload.content_object is None or upload.project_id != upload.content_object.project_id:
+            raise exc.WrongArguments(_("Project ID not matches between object and project"))
+
+        upload.save()
+        return response.Created(serializers.AttachmentUploadSerializer(upload).data)
+
+    @list_route(methods=["GET"])
+    @transaction.atomic
+    def upload_status(self, request, **kwargs):
+        """
+        Get the received size of a chunked upload, to resume it.
+        """
+        upload = self._get_upload(request)
+        return response.Ok(serializers.AttachmentUploadSerializer(upload).data)
+
+    # The chunks are the raw body of the request
+    @list_route(methods=["POST"], parser_classes=())
+    @transaction.atomic
+    def upload_chunk(self, request, **kwargs):
+        """
+        Store the next chunk of a chunked upload. The `offset` param
+        must be the size received until now.
+        """
+        upload = self._get_upload(request)
+
+        try:
+            offset = int(request.QUERY_PARAMS.get("offset", None))
+            size = int(request.META.get("CONTENT_LENGTH", None))
+        except (TypeError, ValueError):
+            raise exc.WrongArguments(_("Invalid offset or content length"))
+
+        if offset != upload.received_size:
+            return response.Conflict(serializers.AttachmentUploadSerializer(upload).data)
+
+        if size <= 0 or size > settings.ATTACHMENTS_UPLOAD_CHUNK_MAX_SIZE:
+            raise exc.WrongArguments(_("Invalid chunk size"))
+
+        if upload.received_size + size > upload.size:
+            raise exc.WrongArguments(_("The chunk exceeds the size of the upload"))
+
+        services.store_upload_chunk(upload, request.stream, size)
+        return response.Ok(serializers.AttachmentUploadSerializer(upload).data)
+
+    @list_route(methods=["POST"])
+    @transaction.atomic
+    def complete_upload(self, request, **kwargs):
+        """
+        Assemble the chunks of a chunked upload and create the attachment.
+        """
+        upload = self._get_upload(request)
+        if upload.received_size != upload.size:
+            raise exc.WrongArguments(_("The upload is not complete"))
+
+        obj = models.Attachment(project=upload.project,
+                                content_type=upload.content_type,
+                                object_id=upload.object_id,
+                                description=upload.description,
+                                is_deprecated=upload.is_deprecated)
+        self.check_permissions(request, "create", obj)
+
+        services.assemble_upload(upload, obj)
+
+        self.pre_save(obj)
+        # The stored file is named by its content hash
+        obj.name = path.basename(upload.name).lower()
+        self.pre_conditions_on_save(obj)
+        self.post_conditions_on_save(obj)
+        obj.save(force_insert=True)
+        self.object = obj
+        self.post_save(obj, created=True)
+
+        services.delete_upload(upload)
+        return response.Created(self.get_serializer(obj).data)
+
 
 class UserStoryAttachmentViewSet(BaseAttachmentViewSet):
     permission_classes = (permissions.UserStoryAttachmentPermission,)
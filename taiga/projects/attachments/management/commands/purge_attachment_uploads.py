@@ -0,0 +1,39 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# Copyright (C) 2014 Anler Hernández <hello@anler.me>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from taiga.projects.attachments.services import purge_expired_uploads
+
+
+class Command(BaseCommand):
+    help = "Delete the unfinished chunked uploads of attachments that have expired"
+
+    option_list = BaseCommand.option_list + (
+        make_option("--expiration",
+                    action="store",
+                    dest="expiration",
+                    type="int",
+                    default=settings.ATTACHMENTS_UPLOAD_EXPIRATION,
+                    help="Seconds without receiving chunks after which an upload expires"),
+    )
+
+    def handle(self, *args, **options):
+        count = purge_expired_uploads(options["expiration"])
+        self.stdout.write("Purged {} uploads".format(count))
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.conf import settings
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0002_auto_20140903_0920'),
+        ('attachments', '0004_auto_20150508_1141'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentUpload',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', auto_created=True, serialize=False, primary_key=True)),
+                ('object_id', models.PositiveIntegerField(verbose_name='object id')),
+                ('created_date', models.DateTimeField(verbose_name='created date', default=django.utils.timezone.now)),
+                ('modified_date', models.DateTimeField(verbose_name='modified date')),
+                ('name', models.CharField(verbose_name='name', max_length=500)),
+                ('size', models.BigIntegerField(verbose_name='size')),
+                ('sha256', models.CharField(verbose_name='sha256', blank=True, default='', max_length=64)),
+                ('received_size', models.BigIntegerField(verbose_name='received size', default=0)),
+                ('received_chunks', models.IntegerField(verbose_name='received chunks', default=0)),
+                ('is_deprecated', models.BooleanField(verbose_name='is deprecated', default=False)),
+                ('description', models.TextField(verbose_name='description', blank=True)),
+                ('content_type', models.ForeignKey(verbose_name='content type', to='contenttypes.ContentType')),
+                ('owner', models.ForeignKey(verbose_name='owner', related_name='attachment_uploads', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(verbose_name='project', related_name='attachment_uploads', to='projects.Project')),
+            ],
+            options={
+                'verbose_name': 'attachment upload',
+                'verbose_name_plural': 'attachment uploads',
+                'ordering': ['project', 'created_date', 'id'],
+            },
+            bases=(models.Model,),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attachments', '0005_attachmentupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='sha256',
+            field=models.CharField(verbose_name='sha256', blank=True, default='', max_length=64, db_index=True),
+            preserve_default=True,
+        ),
+    ]
@@ -18,9 +18,14 @@ import hashlib
 import os
 import os.path as path
 
+from contextlib import closing
+
 from unidecode import unidecode
 
+from django.db import connection
 from django.db import models
+from django.db import transaction
+from django.dispatch import receiver
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes import generic
@@ -33,8 +38,18 @@ from taiga.base.utils.iterators import split_by_n
 
 
 def get_attachment_file_path(instance, filename):
+    """
+    The files are stored by content (the sha256 of the attachment) so
+    the same file attached many times is stored only once. Attachments
+    without hash get a random path.
+    """
     basename = path.basename(filename).lower()
     base, ext = path.splitext(basename)
+
+    if instance.sha256:
+        p1, p2, p3, p4, *p5 = split_by_n(instance.sha256, 1)
+        return path.join("attachments", p1, p2, p3, p4, "".join(p5) + ext)
+
     base = slugify(unidecode(base))
     basename = "".join([base, ext])
 
@@ -48,6 +63,43 @@ def get_attachment_file_path(instance, filename):
     return path.join("attachments", hash_part, basename)
 
 
+def get_file_sha256(file):
+    hasher = hashlib.sha256()
+    for data in file.chunks():
+        hasher.update(data)
+    return hasher.hexdigest()
+
+
+def lock_attached_file(sha256):
+    """
+    Serialize, until the end of the current transaction, the storage and
+    the deletion of the files with this content hash; a file can't be
+    deleted while a new attachment that references it is being saved.
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [sha256])
+
+
+def store_attached_file(attachment, name, content):
+    """
+    Store the content as the file of the attachment, unless the same
+    content (with the same extension) is already stored; then the
+    attachment just references it.
+
+    `attachment.sha256` must be the hash of the content, and the attachment
+    must be saved in the same transaction (it holds the lock of the hash).
+    """
+    lock_attached_file(attachment.sha256)
+
+    field = attachment._meta.get_field("attached_file")
+    file_path = field.generate_filename(attachment, name)
+
+    if field.storage.exists(file_path):
+        attachment.attached_file = file_path
+    else:
+        attachment.attached_file.save(name, content, save=False)
+
+
 class Attachment(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True,
                               related_name="change_attachments",
@@ -69,6 +121,8 @@ class Attachment(models.Model):
     attached_file = models.FileField(max_length=500, null=True, blank=True,
                                      upload_to=get_attachment_file_path,
                                      verbose_name=_("attached file"))
+    sha256 = models.CharField(null=False, blank=True, default="", max_length=64,
+                              db_index=True, verbose_name=_("sha256"))
 
 
     is_deprecated = models.BooleanField(default=False, verbose_name=_("is deprecated"))
@@ -89,7 +143,90 @@ class Attachment(models.Model):
         if not self._importing or not self.modified_date:
             self.modified_date = timezone.now()
 
-        return super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self.attached_file and not self.attached_file._committed:
+                self.sha256 = get_file_sha256(self.attached_file)
+                store_attached_file(self, self.attached_file.name, self.attached_file.file)
+
+            return super().save(*args, **kwargs)
 
     def __str__(self):
         return "Attachment: {}".format(self.id)
+
+    def is_attached_file_referenced(self):
+        """
+        Check if the file of this attachment is used by other attachments.
+        """
+        return (type(self).objects.filter(sha256=self.sha256, attached_file=self.attached_file.name)
+                                  .exclude(id=self.id)
+                                  .exists())
+
+
+# On Attachment object is deleted, delete its file when no other
+# attachment references it (and the deletion is committed).
+@receiver(models.signals.post_delete, sender=Attachment,
+          dispatch_uid="attachment_post_delete_attached_file")
+def delete_unreferenced_attached_file(sender, instance, **kwargs):
+    if not instance.attached_file:
+        return
+
+    storage, name, sha256 = instance.attached_file.storage, instance.attached_file.name, instance.sha256
+
+    def delete_attached_file():
+        # Checked under the lock of the hash, so the attachments committed
+        # meanwhile, or being saved now, keep the file
+        with transaction.atomic():
+            lock_attached_file(sha256)
+            if not sender.objects.filter(sha256=sha256, attached_file=name).exists():
+                storage.delete(name)
+
+    connection.on_commit(delete_attached_file)
+
+
+class AttachmentUpload(models.Model):
+    """
+    An attachment uploaded in chunks. Every chunk is stored as a
+    separated file until the upload is completed and the attachment
+    is created.
+    """
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, null=False, blank=False,
+                              related_name="attachment_uploads",
+                              verbose_name=_("owner"))
+    project = models.ForeignKey("projects.Project", null=False, blank=False,
+                                related_name="attachment_uploads", verbose_name=_("project"))
+    content_type = models.ForeignKey(ContentType, null=False, blank=False,
+                                     verbose_name=_("content type"))
+    object_id = models.PositiveIntegerField(null=False, blank=False,
+                                            verbose_name=_("object id"))
+    content_object = generic.GenericForeignKey("content_type", "object_id")
+    created_date = models.DateTimeField(null=False, blank=False,
+                                        verbose_name=_("created date"),
+                                        default=timezone.now)
+    modified_date = models.DateTimeField(null=False, blank=False,
+                                         verbose_name=_("modified date"))
+    name = models.CharField(null=False, blank=False, max_length=500, verbose_name=_("name"))
+    size = models.BigIntegerField(null=False, blank=False, verbose_name=_("size"))
+    sha256 = models.CharField(null=False, blank=True, default="", max_length=64,
+                              verbose_name=_("sha256"))
+    received_size = models.BigIntegerField(null=False, blank=False, default=0,
+                                           verbose_name=_("received size"))
+    received_chunks = models.IntegerField(null=False, blank=False, default=0,
+                                          verbose_name=_("received chunks"))
+
+    is_deprecated = models.BooleanField(default=False, verbose_name=_("is deprecated"))
+    description = models.TextField(null=False, blank=True, verbose_name=_("description"))
+
+    class Meta:
+        verbose_name = "attachment upload"
+        verbose_name_plural = "attachment uploads"
+        ordering = ["project", "created_date", "id"]
+
+    def save(self, *args, **kwargs):
+        self.modified_date = timezone.now()
+        return super().save(*args, **kwargs)
+
+    def __str__(self):
+        return "Attachment upload: {}".format(self.id)
+
+    def get_chunk_path(self, index):
+        return path.join("attachments", "uploads", str(self.id), "{:08d}".format(index))
@@ -18,6 +18,7 @@ from os import path
 import hashlib
 
 from django.conf import settings
+from django.utils.translation import ugettext as _
 
 from taiga.base.api import serializers
 
@@ -39,3 +40,16 @@ class AttachmentSerializer(serializers.ModelSerializer):
 
     def get_url(self, obj):
         return obj.attached_file.url
+
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.AttachmentUpload
+        fields = ("id", "project", "object_id", "name", "size", "sha256", "description",
+                  "is_deprecated", "received_size", "created_date", "modified_date")
+        read_only_fields = ("received_size", "created_date", "modified_date")
+
+    def validate_size(self, attrs, source):
+        if attrs[source] is None or attrs[source] <= 0:
+            raise serializers.ValidationError(_("The size must be greater than zero"))
+        return attrs
@@ -0,0 +1,134 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# Copyright (C) 2014 Anler Hernández <hello@anler.me>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import datetime
+
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import ugettext as _
+
+from taiga.base import exceptions as exc
+
+from . import models
+
+
+class UploadedChunkFile(File):
+    """
+    A chunk of an upload read from the request stream while it's
+    written to the storage (it's never buffered completely).
+    """
+    def __init__(self, stream, size):
+        super().__init__(stream, name="chunk")
+        self.size = size
+        self.read_size = 0
+
+    def chunks(self, chunk_size=None):
+        chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        while self.read_size < self.size:
+            data = self.file.read(min(chunk_size, self.size - self.read_size))
+            if not data:
+                break
+            self.read_size += len(data)
+            yield data
+
+
+class AssembledUploadFile(File):
+    """
+    The content of a completed upload, read chunk by chunk from the
+    storage while it's written to its final path.
+    """
+    def __init__(self, upload):
+        super().__init__(None, name=upload.name)
+        self.upload = upload
+        self.size = upload.size
+
+    def chunks(self, chunk_size=None):
+        for index in range(self.upload.received_chunks):
+            with default_storage.open(self.upload.get_chunk_path(index)) as chunk:
+                for data in chunk.chunks(chunk_size):
+                    yield data
+
+
+def store_upload_chunk(upload, stream, size):
+    """
+    Store the next chunk of an upload.
+
+    :return: The number of bytes stored.
+    """
+    chunk_path = upload.get_chunk_path(upload.received_chunks)
+
+    # Remains of a previous attempt interrupted before being recorded
+    if default_storage.exists(chunk_path):
+        default_storage.delete(chunk_path)
+
+    chunk = UploadedChunkFile(stream, size)
+    default_storage.save(chunk_path, chunk)
+
+    upload.received_size += chunk.read_size
+    upload.received_chunks += 1
+    upload.save(update_fields=["received_size", "received_chunks", "modified_date"])
+    return chunk.read_size
+
+
+def assemble_upload(upload, attachment):
+    """
+    Write the chunks of a completed upload as the file of the
+    attachment, verifying the content hash given when it was started.
+    The attachment must be saved in the same transaction.
+    """
+    content = AssembledUploadFile(upload)
+
+    # The content is hashed before being written because the files
+    # are stored by hash (see `models.get_attachment_file_path`)
+    sha256 = models.get_file_sha256(content)
+    if upload.sha256 and upload.sha256.lower() != sha256:
+        raise exc.WrongArguments(_("The uploaded content doesn't match its sha256"))
+
+    attachment.sha256 = sha256
+    models.store_attached_file(attachment, upload.name, content)
+
+
+def delete_upload(upload):
+    for index in range(upload.received_chunks):
+        default_storage.delete(upload.get_chunk_path(index))
+    upload.delete()
+
+
+def purge_expired_uploads(expiration=None):
+    """
+    Delete the chunked uploads (and their chunks) that haven't received
+    anything for `expiration` seconds.
+
+    :return: The number of purged uploads.
+    """
+    if expiration is None:
+        expiration = settings.ATTACHMENTS_UPLOAD_EXPIRATION
+
+    modified_before = timezone.now() - datetime.timedelta(seconds=expiration)
+    uploads = models.AttachmentUpload.objects.filter(modified_date__lt=modified_before)
+
+    count = 0
+    for upload_id in uploads.values_list("id", flat=True):
+        # Locked and checked again, a chunk could be arriving right now
+        with transaction.atomic():
+            upload = uploads.select_for_update().filter(id=upload_id).first()
+            if upload is not None:
+                delete_upload(upload)
+                count += 1
+    return count
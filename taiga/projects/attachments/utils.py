@@ -0,0 +1,35 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# Copyright (C) 2014 Anler Hernández <hello@anler.me>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from django.apps import apps
+
+
+def attach_attachments_count_to_queryset(queryset, as_field="attachments_count"):
+    """Attach the number of attachments to each object of the queryset.
+
+    :param queryset: A Django queryset object.
+    :param as_field: Attach the attachments count as an attribute with this name.
+
+    :return: Queryset object with the additional `as_field` field.
+    """
+    model = queryset.model
+    type = apps.get_model("contenttypes", "ContentType").objects.get_for_model(model)
+    sql = ("SELECT count(*) FROM attachments_attachment "
+           "WHERE attachments_attachment.content_type_id = {type_id} "
+           "AND attachments_attachment.object_id = {tbl}.id")
+    sql = sql.format(type_id=type.id, tbl=model._meta.db_table)
+    return queryset.extra(select={as_field: sql})
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django_pgjson.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_attributes', '0005_auto_20150505_1639'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstorycustomattributesvalues',
+            name='version_changes',
+            field=django_pgjson.fields.JsonField(verbose_name='version changes', blank=True, default={}),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='taskcustomattributesvalues',
+            name='version_changes',
+            field=django_pgjson.fields.JsonField(verbose_name='version changes', blank=True, default={}),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='issuecustomattributesvalues',
+            name='version_changes',
+            field=django_pgjson.fields.JsonField(verbose_name='version changes', blank=True, default={}),
+            preserve_default=True,
+        ),
+    ]
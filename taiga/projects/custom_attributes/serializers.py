@@ -91,7 +91,7 @@ class BaseCustomAttributesValuesSerializer(ModelSerializer):
     _container_field = None
 
     class Meta:
-        exclude = ("id",)
+        exclude = ("id", "version_changes")
 
     def validate_attributes_values(self, attrs, source):
         # values must be a dict
@@ -14,56 +14,18 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from django.db import transaction
-from django.db import connection
+from taiga.base.utils import db
 
+from . import models
 
-@transaction.atomic
-def bulk_update_userstory_custom_attribute_order(project, user, data):
-    cursor = connection.cursor()
 
-    sql = """
-    prepare bulk_update_order as update custom_attributes_userstorycustomattribute set "order" = $1
-        where custom_attributes_userstorycustomattribute.id = $2 and
-              custom_attributes_userstorycustomattribute.project_id = $3;
-    """
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+def bulk_update_userstory_custom_attribute_order(project, user, data):
+    db.update_field_in_bulk(models.UserStoryCustomAttribute, "order", data, project_id=project.id)
 
 
-@transaction.atomic
 def bulk_update_task_custom_attribute_order(project, user, data):
-    cursor = connection.cursor()
+    db.update_field_in_bulk(models.TaskCustomAttribute, "order", data, project_id=project.id)
 
-    sql = """
-    prepare bulk_update_order as update custom_attributes_taskcustomattribute set "order" = $1
-        where custom_attributes_taskcustomattribute.id = $2 and
-              custom_attributes_taskcustomattribute.project_id = $3;
-    """
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
 
-
-@transaction.atomic
 def bulk_update_issue_custom_attribute_order(project, user, data):
-    cursor = connection.cursor()
-
-    sql = """
-    prepare bulk_update_order as update custom_attributes_issuecustomattribute set "order" = $1
-        where custom_attributes_issuecustomattribute.id = $2 and
-              custom_attributes_issuecustomattribute.project_id = $3;
-    """
-    cursor.execute(sql)
-    for id, order in data:
-        cursor.execute("EXECUTE bulk_update_order (%s, %s, %s);",
-                       (order, id, project.id))
-    cursor.execute("DEALLOCATE bulk_update_order")
-    cursor.close()
+    db.update_field_in_bulk(models.IssueCustomAttribute, "order", data, project_id=project.id)
@@ -180,7 +180,7 @@ def _generic_extract(obj:object, fields:list, default=None) -> dict:
 def extract_attachments(obj) -> list:
     for attach in obj.attachments.all():
         yield {"id": attach.id,
-               "filename": os.path.basename(attach.attached_file.name),
+               "filename": attach.name or os.path.basename(attach.attached_file.name),
                "url": attach.attached_file.url,
                "description": attach.description,
                "is_deprecated": attach.is_deprecated,
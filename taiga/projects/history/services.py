@@ -44,6 +44,7 @@ from taiga.base.utils.db import get_typename_for_model_class
 from taiga.base.utils.diff import make_diff as make_diff_from_dicts
 
 from .models import HistoryType
+from .signals import history_entries_created_in_bulk
 
 
 # Type that represents a freezed object
@@ -335,6 +336,48 @@ def take_snapshot(obj:object, *, comment:str="", user=None, delete:bool=False):
         return entry_model.objects.create(**kwargs)
 
 
+@tx.atomic
+def take_snapshots_of_new_objects_in_bulk(objs:list, *, comment:str="", user=None) -> list:
+    """
+    Create the "create" history entries of a list of new model
+    instances of the same model with one insert.
+
+    The instances are frozen as they are (they are not fetched again)
+    and `history_entries_created_in_bulk` is sent instead of a
+    `post_save` signal for each entry.
+    """
+    if not objs:
+        return []
+
+    entry_model = apps.get_model("history", "HistoryEntry")
+    typename = get_typename_for_model_class(objs[0].__class__)
+    if typename not in _freeze_impl_map:
+        raise RuntimeError("No implementation found for {}".format(typename))
+
+    impl_fn = _freeze_impl_map[typename]
+    user_data = {"pk": None if user is None else user.id,
+                 "name": "" if user is None else user.get_full_name()}
+    comment_html = mdrender(objs[0].project, comment)
+
+    entries = []
+    for obj in objs:
+        fdiff = make_diff(None, FrozenObj(make_key_from_model_object(obj), impl_fn(obj)))
+        entries.append(entry_model(user=user_data,
+                                   key=fdiff.key,
+                                   type=HistoryType.create,
+                                   snapshot=fdiff.snapshot,
+                                   diff=fdiff.diff,
+                                   values=make_diff_values(typename, fdiff),
+                                   comment=comment,
+                                   comment_html=comment_html,
+                                   is_hidden=False,
+                                   is_snapshot=True))
+
+    entry_model.objects.bulk_create(entries)
+    history_entries_created_in_bulk.send(sender=entry_model, entries=entries, objects=objs)
+    return entries
+
+
 # High level query api
 
 def get_history_queryset_by_model_instance(obj:object, types=(HistoryType.change,),
@@ -14,9 +14,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from django.conf import settings
 from django.utils.translation import ugettext as _
 from django.db.models import Q
-from django.http import Http404, HttpResponse
+from django.http import Http404
 
 from taiga.base import filters
 from taiga.base import exceptions as exc
@@ -24,6 +25,7 @@ from taiga.base import response
 from taiga.base.decorators import detail_route, list_route
 from taiga.base.api import ModelCrudViewSet, ModelListViewSet
 from taiga.base.api.utils import get_object_or_404
+from taiga.base.utils.csv import streaming_csv_response
 
 from taiga.users.models import User
 
@@ -32,7 +34,6 @@ from taiga.projects.occ import OCCResourceMixin
 from taiga.projects.history.mixins import HistoryResourceMixin
 
 from taiga.projects.models import Project
-from taiga.projects.votes.utils import attach_votescount_to_queryset
 from taiga.projects.votes import services as votes_service
 from taiga.projects.votes import serializers as votes_serializers
 from . import models
@@ -104,6 +105,7 @@ class IssuesOrdering(filters.FilterBackend):
 class IssueViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin, ModelCrudViewSet):
     serializer_class = serializers.IssueNeighborsSerializer
     list_serializer_class = serializers.IssueSerializer
+    compiled_list_serializer = True
     permission_classes = (permissions.IssuePermission, )
 
     filter_backends = (filters.CanViewIssuesFilterBackend, filters.QFilter,
@@ -119,12 +121,12 @@ class IssueViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin,
                        "modified_date",
                        "owner",
                        "assigned_to",
-                       "subject")
+                       "subject",
+                       "total_voters")
 
     def get_queryset(self):
         qs = models.Issue.objects.all()
         qs = qs.prefetch_related("attachments")
-        qs = attach_votescount_to_queryset(qs, as_field="votes_count")
         return qs
 
     def pre_save(self, obj):
@@ -170,10 +172,9 @@ class IssueViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin,
 
         project = get_object_or_404(Project, issues_csv_uuid=uuid)
         queryset = project.issues.all().order_by('ref')
-        data = services.issues_to_csv(project, queryset)
-        csv_response = HttpResponse(data.getvalue(), content_type='application/csv; charset=utf-8')
-        csv_response['Content-Disposition'] = 'attachment; filename="issues.csv"'
-        return csv_response
+        etag = services.issues_csv_etag(project, queryset) if settings.CSV_USE_ETAGS else None
+        lines = services.issues_to_csv_stream(project, queryset)
+        return streaming_csv_response(request, "issues.csv", lines, etag=etag)
 
     @list_route(methods=["POST"])
     def bulk_create(self, request, **kwargs):
@@ -182,11 +183,12 @@ class IssueViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin,
             data = serializer.data
             project = Project.objects.get(pk=data["project_id"])
             self.check_permissions(request, 'bulk_create', project)
-            issues = services.create_issues_in_bulk(
+            issues, history_entries = services.bulk_create_issues(
                 data["bulk_issues"], project=project, owner=request.user,
                 status=project.default_issue_status, severity=project.default_severity,
-                priority=project.default_priority, type=project.default_issue_type,
-                callback=self.post_save, precall=self.pre_save)
+                priority=project.default_priority, type=project.default_issue_type)
+            for issue, history in zip(issues, history_entries):
+                self.send_notifications(issue, history)
             issues_serialized = self.serializer_class(issues, many=True)
 
             return response.Ok(data=issues_serialized.data)
@@ -41,6 +41,14 @@ class IssuesAppConfig(AppConfig):
         signals.post_delete.connect(generic_handlers.update_project_tags_when_delete_taggable_item,
                                     sender=apps.get_model("issues", "Issue"))
 
+        # Issues filters data
+        signals.post_save.connect(generic_handlers.invalidate_issues_filters_data_cache,
+                                  sender=apps.get_model("issues", "Issue"),
+                                  dispatch_uid="invalidate_issues_filters_data_cache_issue")
+        signals.post_delete.connect(generic_handlers.invalidate_issues_filters_data_cache,
+                                    sender=apps.get_model("issues", "Issue"),
+                                    dispatch_uid="invalidate_issues_filters_data_cache_issue")
+
         # Custom Attributes
         signals.post_save.connect(custom_attributes_handlers.create_custom_attribute_value_when_create_issue,
                                   sender=apps.get_model("issues", "Issue"),
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0006_issue_version_changes'),
+        ('votes', '0001_initial'),
+        ('contenttypes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='total_voters',
+            field=models.PositiveIntegerField(default=0, verbose_name='count voters', db_index=True),
+            preserve_default=True,
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE issues_issue
+               SET total_voters = votes_votes.count
+              FROM votes_votes
+        INNER JOIN django_content_type ON django_content_type.id = votes_votes.content_type_id
+             WHERE django_content_type.app_label = 'issues'
+               AND django_content_type.model = 'issue'
+               AND votes_votes.object_id = issues_issue.id;
+            """
+        ),
+    ]
@@ -26,12 +26,13 @@ from djorm_pgarray.fields import TextArrayField
 from taiga.projects.occ import OCCModelMixin
 from taiga.projects.notifications.mixins import WatchedModelMixin
 from taiga.projects.mixins.blocked import BlockedMixin
+from taiga.projects.votes.mixins import VotedModelMixin
 from taiga.base.tags import TaggedMixin
 
 from taiga.projects.services.tags_colors import update_project_tags_colors_handler, remove_unused_tags
 
 
-class Issue(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, models.Model):
+class Issue(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, VotedModelMixin, models.Model):
     ref = models.BigIntegerField(db_index=True, null=True, blank=True, default=None,
                                  verbose_name=_("ref"))
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, default=None,
@@ -63,6 +64,7 @@ class Issue(OCCModelMixin, WatchedModelMixin, BlockedMixin, TaggedMixin, models.
                                     default=None, related_name="issues_assigned_to_me",
                                     verbose_name=_("assigned to"))
     attachments = generic.GenericRelation("attachments.Attachment")
+    object_votes = generic.GenericRelation("votes.Vote")
     external_reference = TextArrayField(default=None, verbose_name=_("external reference"))
     _importing = None
 
@@ -24,33 +24,50 @@ from taiga.mdrender.service import render as mdrender
 from taiga.projects.validators import ProjectExistsValidator
 from taiga.projects.notifications.validators import WatchersValidator
 from taiga.projects.serializers import BasicIssueStatusSerializer
+from taiga.projects.votes.services import is_voter
+from taiga.projects.votes.utils import attach_user_votes_to_queryset
 from taiga.users.serializers import BasicInfoSerializer as UserBasicInfoSerializer
 
 from . import models
 
 
+def _attach_generated_user_stories(queryset, context):
+    return queryset.prefetch_related("generated_user_stories")
+
+
+def _attach_user_votes(queryset, context):
+    if "request" not in context:
+        return queryset
+    return attach_user_votes_to_queryset(context["request"].user, queryset)
+
+
 class IssueSerializer(WatchersValidator, serializers.ModelSerializer):
     tags = TagsField(required=False)
     external_reference = PgArrayField(required=False)
     is_closed = serializers.Field(source="is_closed")
     comment = serializers.SerializerMethodField("get_comment")
-    generated_user_stories = serializers.SerializerMethodField("get_generated_user_stories")
+    generated_user_stories = serializers.AnnotatedField("get_generated_user_stories",
+                                                        _attach_generated_user_stories)
     blocked_note_html = serializers.SerializerMethodField("get_blocked_note_html")
     description_html = serializers.SerializerMethodField("get_description_html")
     votes = serializers.SerializerMethodField("get_votes_number")
+    is_voter = serializers.AnnotatedField("get_is_voter", _attach_user_votes)
     status_extra_info = BasicIssueStatusSerializer(source="status", required=False, read_only=True)
     assigned_to_extra_info = UserBasicInfoSerializer(source="assigned_to", required=False, read_only=True)
 
     class Meta:
         model = models.Issue
         read_only_fields = ('id', 'ref', 'created_date', 'modified_date')
+        exclude = ('version_changes', 'total_voters')
 
     def get_comment(self, obj):
         # NOTE: This method and field is necessary to historical comments work
         return ""
 
     def get_generated_user_stories(self, obj):
-        return obj.generated_user_stories.values("id", "ref", "subject")
+        # Use the prefetched user stories if they were attached to the queryset
+        return [{"id": us.id, "ref": us.ref, "subject": us.subject}
+                for us in obj.generated_user_stories.all()]
 
     def get_blocked_note_html(self, obj):
         return mdrender(obj.project, obj.blocked_note)
@@ -59,8 +76,12 @@ class IssueSerializer(WatchersValidator, serializers.ModelSerializer):
         return mdrender(obj.project, obj.description)
 
     def get_votes_number(self, obj):
-        # The "votes_count" attribute is attached in the get_queryset of the viewset.
-        return getattr(obj, "votes_count", 0)
+        return obj.total_voters
+
+    def get_is_voter(self, obj):
+        if "request" in self.context:
+            return is_voter(self.context["request"].user, obj)
+        return False
 
 
 class IssueNeighborsSerializer(NeighborsSerializerMixin, IssueSerializer):
@@ -14,10 +14,16 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import io
-import csv
+from django.utils import timezone
 
 from taiga.base.utils import db, text
+from taiga.base.utils.csv import CSV_CHUNK_SIZE, get_etag, stream_csv, write_csv
+from taiga.base.utils.db import get_last_modification
+from taiga.base.utils.iterators import iter_queryset
+from taiga.projects.attachments.utils import attach_attachments_count_to_queryset
+from taiga.projects.custom_attributes.models import IssueCustomAttributesValues
+from taiga.projects.services.bulk_create import create_items_in_bulk
+from taiga.projects.services.filters import invalidate_issues_filters_data
 
 from . import models
 
@@ -48,6 +54,33 @@ def create_issues_in_bulk(bulk_data, callback=None, precall=None, **additional_f
     return issues
 
 
+def bulk_create_issues(bulk_data, *, project, owner, **additional_fields):
+    """Create issues from `bulk_data` with a fixed number of queries.
+
+    Unlike `create_issues_in_bulk`, the issues are not saved one by one,
+    so no `pre_save`/`post_save` signals are sent for them (see
+    `taiga.projects.services.bulk_create`).
+
+    :param bulk_data: List of issues in bulk format.
+    :param project: Project of the issues.
+    :param owner: Owner of the issues.
+    :param additional_fields: Additional fields when instantiating each issue.
+
+    :return: Tuple with the list of created `Issue` instances and the
+             list of their history entries.
+    """
+    issues = get_issues_from_bulk(bulk_data, project=project, owner=owner, **additional_fields)
+    for issue in issues:
+        if issue.status_id and issue.status.is_closed:
+            issue.finished_date = timezone.now()
+
+    history_entries = create_items_in_bulk(issues, project=project, user=owner,
+                                           values_model=IssueCustomAttributesValues,
+                                           container_field="issue")
+    invalidate_issues_filters_data(project.id)
+    return issues, history_entries
+
+
 def update_issues_order_in_bulk(bulk_data):
     """Update the order of some issues.
 
@@ -63,18 +96,22 @@ def update_issues_order_in_bulk(bulk_data):
     db.update_in_bulk_with_ids(issue_ids, new_order_values, model=models.Issue)
 
 
-def issues_to_csv(project, queryset):
-    csv_data = io.StringIO()
+def _get_issues_csv_fieldnames(custom_attrs):
     fieldnames = ["ref", "subject", "description", "milestone", "owner",
                   "owner_full_name", "assigned_to", "assigned_to_full_name",
                   "status", "severity", "priority", "type", "is_closed",
                   "attachments", "external_reference", "tags"]
-    for custom_attr in project.issuecustomattributes.all():
+    for custom_attr in custom_attrs:
         fieldnames.append(custom_attr.name)
+    return fieldnames
+
 
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
-    for issue in queryset:
+def _get_issues_csv_rows(queryset, custom_attrs):
+    queryset = queryset.select_related("milestone", "owner", "assigned_to", "status",
+                                       "severity", "priority", "type", "custom_attributes_values")
+    queryset = attach_attachments_count_to_queryset(queryset)
+
+    for issue in iter_queryset(queryset, itersize=CSV_CHUNK_SIZE):
         issue_data = {
             "ref": issue.ref,
             "subject": issue.subject,
@@ -89,15 +126,41 @@ def issues_to_csv(project, queryset):
             "priority": issue.priority.name,
             "type": issue.type.name,
             "is_closed": issue.is_closed,
-            "attachments": issue.attachments.count(),
+            "attachments": issue.attachments_count,
             "external_reference": issue.external_reference,
             "tags": ",".join(issue.tags or []),
         }
 
-        for custom_attr in project.issuecustomattributes.all():
+        for custom_attr in custom_attrs:
             value = issue.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
             issue_data[custom_attr.name] = value
 
-        writer.writerow(issue_data)
+        yield issue_data
+
+
+def issues_to_csv(project, queryset):
+    custom_attrs = list(project.issuecustomattributes.all())
+    fieldnames = _get_issues_csv_fieldnames(custom_attrs)
+    return write_csv(fieldnames, _get_issues_csv_rows(queryset, custom_attrs))
+
 
-    return csv_data
+def issues_to_csv_stream(project, queryset):
+    """
+    Generator of the csv lines of the issues, with the related data fetched
+    in chunks.
+    """
+    custom_attrs = list(project.issuecustomattributes.all())
+    fieldnames = _get_issues_csv_fieldnames(custom_attrs)
+    yield from stream_csv(fieldnames, _get_issues_csv_rows(queryset, custom_attrs))
+
+
+def issues_csv_etag(project, queryset):
+    """
+    ETag of the issues csv, from the last modification of the issues and the
+    project data included in it.
+    """
+    return get_etag(project.id, project.modified_date,
+                    get_last_modification(queryset, "custom_attributes_values__version"),
+                    get_last_modification(project.issuecustomattributes.all()),
+                    get_last_modification(project.milestones.all()),
+                    get_last_modification(project.attachments.all()))
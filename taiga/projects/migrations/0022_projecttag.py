@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0021_auto_20150504_1524'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectTag',
+            fields=[
+                ('id', models.AutoField(serialize=False, primary_key=True, verbose_name='ID', auto_created=True)),
+                ('name', models.TextField(verbose_name='name')),
+                ('userstories_count', models.IntegerField(default=0, verbose_name='user stories count')),
+                ('tasks_count', models.IntegerField(default=0, verbose_name='tasks count')),
+                ('issues_count', models.IntegerField(default=0, verbose_name='issues count')),
+                ('project', models.ForeignKey(to='projects.Project', related_name='tags_index', verbose_name='project')),
+            ],
+            options={
+                'verbose_name': 'project tag',
+                'verbose_name_plural': 'project tags',
+                'ordering': ['project', 'name'],
+            },
+            bases=(models.Model,),
+        ),
+        migrations.AlterUniqueTogether(
+            name='projecttag',
+            unique_together=set([('project', 'name')]),
+        ),
+
+        # Function: Update the project tags index after a change in a tagged table.
+        #           The name of the counter column is received as the first argument.
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION "update_project_tags_index"()
+                               RETURNS trigger
+                                    AS $update_project_tags_index$
+                               DECLARE
+                                       counter text;
+                                 BEGIN
+                                       counter := quote_ident(TG_ARGV[0]::text);
+
+                                       IF TG_OP = 'UPDATE' THEN
+                                           IF OLD.project_id = NEW.project_id AND
+                                              OLD.tags IS NOT DISTINCT FROM NEW.tags THEN
+                                               RETURN NULL;
+                                           END IF;
+                                       END IF;
+
+                                       IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.tags IS NOT NULL THEN
+                                           EXECUTE 'UPDATE projects_projecttag
+                                                       SET ' || counter || ' = ' || counter || ' - 1
+                                                     WHERE project_id = $1 AND name = ANY($2)'
+                                             USING OLD.project_id, OLD.tags;
+
+                                           DELETE FROM projects_projecttag
+                                                 WHERE project_id = OLD.project_id
+                                                   AND userstories_count <= 0
+                                                   AND tasks_count <= 0
+                                                   AND issues_count <= 0;
+                                       END IF;
+
+                                       IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.tags IS NOT NULL THEN
+                                           INSERT INTO projects_projecttag (project_id, name, userstories_count,
+                                                                            tasks_count, issues_count)
+                                                SELECT DISTINCT NEW.project_id, t.name, 0, 0, 0
+                                                  FROM unnest(NEW.tags) AS t(name)
+                                                 WHERE t.name IS NOT NULL
+                                                   AND NOT EXISTS (SELECT 1 FROM projects_projecttag
+                                                                    WHERE project_id = NEW.project_id
+                                                                      AND name = t.name);
+
+                                           EXECUTE 'UPDATE projects_projecttag
+                                                       SET ' || counter || ' = ' || counter || ' + 1
+                                                     WHERE project_id = $1 AND name = ANY($2)'
+                                             USING NEW.project_id, NEW.tags;
+                                       END IF;
+
+                                       RETURN NULL;
+                                   END; $update_project_tags_index$
+                              LANGUAGE plpgsql;
+            """,
+            reverse_sql="""DROP FUNCTION IF EXISTS "update_project_tags_index"()
+                                           CASCADE;"""
+        ),
+    ]
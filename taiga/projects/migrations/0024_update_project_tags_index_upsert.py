@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0023_project_total_voters'),
+    ]
+
+    operations = [
+        # Function: Update the project tags index after a change in a tagged table.
+        #           The name of the counter column is received as the first argument.
+        #           The tags are upserted one by one (retrying on unique violations)
+        #           because concurrent saves can add or remove the same tag.
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION "update_project_tags_index"()
+                               RETURNS trigger
+                                    AS $update_project_tags_index$
+                               DECLARE
+                                       counter text;
+                                       tag text;
+                                       updated integer;
+                                 BEGIN
+                                       counter := quote_ident(TG_ARGV[0]::text);
+
+                                       IF TG_OP = 'UPDATE' THEN
+                                           IF OLD.project_id = NEW.project_id AND
+                                              OLD.tags IS NOT DISTINCT FROM NEW.tags THEN
+                                               RETURN NULL;
+                                           END IF;
+                                       END IF;
+
+                                       IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.tags IS NOT NULL THEN
+                                           EXECUTE 'UPDATE projects_projecttag
+                                                       SET ' || counter || ' = ' || counter || ' - 1
+                                                     WHERE project_id = $1 AND name = ANY($2)'
+                                             USING OLD.project_id, OLD.tags;
+
+                                           DELETE FROM projects_projecttag
+                                                 WHERE project_id = OLD.project_id
+                                                   AND userstories_count <= 0
+                                                   AND tasks_count <= 0
+                                                   AND issues_count <= 0;
+                                       END IF;
+
+                                       IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.tags IS NOT NULL THEN
+                                           FOR tag IN SELECT DISTINCT t.name
+                                                        FROM unnest(NEW.tags) AS t(name)
+                                                       WHERE t.name IS NOT NULL LOOP
+                                               LOOP
+                                                   EXECUTE 'UPDATE projects_projecttag
+                                                               SET ' || counter || ' = ' || counter || ' + 1
+                                                             WHERE project_id = $1 AND name = $2'
+                                                     USING NEW.project_id, tag;
+                                                   GET DIAGNOSTICS updated = ROW_COUNT;
+                                                   EXIT WHEN updated > 0;
+
+                                                   BEGIN
+                                                       INSERT INTO projects_projecttag (project_id, name, userstories_count,
+                                                                                        tasks_count, issues_count)
+                                                            VALUES (NEW.project_id, tag, 0, 0, 0);
+                                                   EXCEPTION WHEN unique_violation THEN
+                                                       -- Inserted by a concurrent save, increment it
+                                                   END;
+                                               END LOOP;
+                                           END LOOP;
+                                       END IF;
+
+                                       RETURN NULL;
+                                   END; $update_project_tags_index$
+                              LANGUAGE plpgsql;
+            """
+        ),
+    ]
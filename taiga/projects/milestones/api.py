@@ -27,8 +27,7 @@ from taiga.projects.history.mixins import HistoryResourceMixin
 from . import serializers
 from . import models
 from . import permissions
-
-import datetime
+from . import services
 
 
 class MilestoneViewSet(HistoryResourceMixin, WatchedResourceMixin, ModelCrudViewSet):
@@ -77,19 +76,17 @@ class MilestoneViewSet(HistoryResourceMixin, WatchedResourceMixin, ModelCrudView
             'iocaine_doses': milestone.tasks.filter(is_iocaine=True).count(),
             'days': []
         }
-        current_date = milestone.estimated_start
         sumTotalPoints = sum(total_points.values())
         optimal_points = sumTotalPoints
         milestone_days = (milestone.estimated_finish - milestone.estimated_start).days
         optimal_points_per_day = sumTotalPoints / milestone_days if milestone_days else 0
-        while current_date <= milestone.estimated_finish:
+        for current_date, closed_points in services.get_closed_points_by_date_series(milestone):
             milestone_stats['days'].append({
                 'day': current_date,
                 'name': current_date.day,
-                'open_points':  sumTotalPoints - sum(milestone.closed_points_by_date(current_date).values()),
+                'open_points':  sumTotalPoints - sum(closed_points.values()),
                 'optimal_points': optimal_points,
             })
-            current_date = current_date + datetime.timedelta(days=1)
             optimal_points -= optimal_points_per_day
 
         return response.Ok(milestone_stats)
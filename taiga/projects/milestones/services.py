@@ -14,10 +14,26 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import closing
+
+from django.db import connection
 from django.utils import timezone
 
+from taiga.base.utils.dicts import dict_sum
+
 from . import models
 
+import datetime
+
+
+def attach_closed_milestones_count_to_project_queryset(queryset, as_field="closed_milestones_count"):
+    """
+    Attach the number of closed milestones to each project of the queryset.
+    """
+    sql = ("SELECT count(*) FROM milestones_milestone "
+           "WHERE milestones_milestone.project_id = projects_project.id "
+           "AND milestones_milestone.closed")
+    return queryset.extra(select={as_field: sql})
 
 
 def calculate_milestone_is_closed(milestone):
@@ -26,6 +42,39 @@ def calculate_milestone_is_closed(milestone):
             all([user_story.is_closed for user_story in milestone.user_stories.all()]))
 
 
+def update_milestones_is_closed(milestone_ids):
+    """
+    Recalculate, in one query, the `closed` flag of the milestones (with the
+    same rules of `calculate_milestone_is_closed`) and update the ones that
+    changed.
+
+    :return: List of (id, project_id, closed) of the updated milestones.
+    """
+    if not milestone_ids:
+        return []
+
+    sql = """
+    UPDATE milestones_milestone
+       SET closed = calculated.closed
+      FROM (SELECT m.id,
+                   EXISTS (SELECT 1 FROM userstories_userstory us
+                            WHERE us.milestone_id = m.id)
+                   AND NOT EXISTS (SELECT 1 FROM userstories_userstory us
+                                    WHERE us.milestone_id = m.id AND NOT us.is_closed)
+                   AND NOT EXISTS (SELECT 1 FROM tasks_task t
+                                     JOIN projects_taskstatus ts ON ts.id = t.status_id
+                                    WHERE t.milestone_id = m.id AND NOT ts.is_closed) AS closed
+              FROM milestones_milestone m
+             WHERE m.id = ANY(%s)) AS calculated
+     WHERE milestones_milestone.id = calculated.id
+       AND milestones_milestone.closed IS DISTINCT FROM calculated.closed
+ RETURNING milestones_milestone.id, milestones_milestone.project_id, milestones_milestone.closed
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [list(milestone_ids)])
+        return cursor.fetchall()
+
+
 def close_milestone(milestone):
     if not milestone.closed:
         milestone.closed = True
@@ -36,3 +85,51 @@ def open_milestone(milestone):
     if milestone.closed:
         milestone.closed = False
         milestone.save(update_fields=["closed",])
+
+
+def _get_closed_points_per_finish_day(milestone):
+    extra_sql = """
+    select (us.finish_date at time zone %s)::date as finish_day, rp.role_id,
+           sum(coalesce(p.value, 0))
+        from userstories_userstory as us
+        inner join userstories_rolepoints as rp on rp.user_story_id = us.id
+        left outer join projects_points as p on p.id = rp.points_id
+        where us.milestone_id = %s and us.is_closed = true
+              and us.finish_date is not null
+              and (us.finish_date at time zone %s)::date <= %s
+        group by finish_day, rp.role_id
+        order by finish_day;
+    """
+
+    tz_name = timezone.get_current_timezone_name()
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(extra_sql, [tz_name, milestone.id, tz_name, milestone.estimated_finish])
+        rows = cursor.fetchall()
+
+    return rows
+
+
+def get_closed_points_by_date_series(milestone):
+    """
+    Given a milestone, return a list of ``(date, closed_points)`` tuples,
+    one per day from its estimated start to its estimated finish, where
+    ``closed_points`` is a dict of role id -> points closed until that day.
+
+    The whole series is computed with one query; it's equivalent to
+    calling ``milestone.closed_points_by_date(date)`` for every day.
+    """
+    points_per_day = {}
+    for finish_day, role_id, points in _get_closed_points_per_finish_day(milestone):
+        # User stories closed before the sprint started count from its first day
+        day = max(finish_day, milestone.estimated_start)
+        points_per_day[day] = dict_sum(points_per_day.get(day, {}), {role_id: points})
+
+    series = []
+    closed_points = {}
+    current_date = milestone.estimated_start
+    while current_date <= milestone.estimated_finish:
+        closed_points = dict_sum(closed_points, points_per_day.get(current_date, {}))
+        series.append((current_date, closed_points))
+        current_date = current_date + datetime.timedelta(days=1)
+
+    return series
@@ -17,14 +17,20 @@
 import itertools
 import uuid
 
+from contextlib import closing
+
 
 from django.core.exceptions import ValidationError
+from django.db import connection
 from django.db import models
+from django.db import transaction
+from django.db import IntegrityError
 from django.db.models import signals
 from django.apps import apps
 from django.conf import settings
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes import generic
 from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
 
@@ -35,8 +41,8 @@ from taiga.permissions.permissions import ANON_PERMISSIONS, MEMBERS_PERMISSIONS
 from taiga.base.tags import TaggedMixin
 from taiga.base.utils.slug import slugify_uniquely
 from taiga.base.utils.dicts import dict_sum
-from taiga.base.utils.sequence import arithmetic_progression
 from taiga.base.utils.slug import slugify_uniquely_for_queryset
+from taiga.projects.votes.mixins import VotedModelMixin
 
 from . import choices
 
@@ -118,7 +124,7 @@ class ProjectDefaults(models.Model):
         abstract = True
 
 
-class Project(ProjectDefaults, TaggedMixin, models.Model):
+class Project(ProjectDefaults, TaggedMixin, VotedModelMixin, models.Model):
     name = models.CharField(max_length=250, null=False, blank=False,
                             verbose_name=_("name"))
     slug = models.SlugField(max_length=250, unique=True, null=False, blank=True,
@@ -178,6 +184,7 @@ class Project(ProjectDefaults, TaggedMixin, models.Model):
                                        db_index=True)
 
     tags_colors = TextArrayField(dimension=2, null=False, blank=True, verbose_name=_("tags colors"), default=[])
+    object_votes = generic.GenericRelation("votes.Vote")
     _importing = None
 
     class Meta:
@@ -198,20 +205,28 @@ class Project(ProjectDefaults, TaggedMixin, models.Model):
         if not self._importing or not self.modified_date:
             self.modified_date = timezone.now()
 
-        if not self.slug:
-            base_name = "{}-{}".format(self.owner.username, self.name)
-            base_slug = slugify_uniquely(base_name, self.__class__)
-            slug = base_slug
-            for i in arithmetic_progression():
-                if not type(self).objects.filter(slug=slug).exists() or i > 100:
-                    break
-                slug = "{}-{}".format(base_slug, i)
-            self.slug = slug
-
         if not self.videoconferences:
             self.videoconferences_salt = None
 
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+        else:
+            self._save_with_new_slug(*args, **kwargs)
+
+    def _save_with_new_slug(self, *args, **kwargs):
+        # Concurrent creations can pick the same free slug; instead of
+        # locking, the loser of the race takes the next one and retries.
+        base_name = "{}-{}".format(self.owner.username, self.name)
+        for attempt in range(settings.PROJECT_SLUG_ALLOCATION_ATTEMPTS, 0, -1):
+            self.slug = slugify_uniquely(base_name, self.__class__)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if attempt == 1 or not type(self).objects.filter(slug=self.slug).exists():
+                    self.slug = ""
+                    raise
 
     def get_roles(self):
         return self.roles.all()
@@ -221,20 +236,7 @@ class Project(ProjectDefaults, TaggedMixin, models.Model):
         members = self.memberships.values_list("user", flat=True)
         return user_model.objects.filter(id__in=list(members))
 
-    def update_role_points(self, user_stories=None):
-        RolePoints = apps.get_model("userstories", "RolePoints")
-        Role = apps.get_model("users", "Role")
-
-        # Get all available roles on this project
-        roles = self.get_roles().filter(computable=True)
-        if roles.count() == 0:
-            return
-
-        # Iter over all project user stories and create
-        # role point instance for new created roles.
-        if user_stories is None:
-            user_stories = self.user_stories.all()
-
+    def get_null_points(self):
         # Get point instance that represent a null/undefined
         # The current model allows duplicate values. Because
         # of it, we should get all poins with None as value
@@ -243,20 +245,50 @@ class Project(ProjectDefaults, TaggedMixin, models.Model):
         # unexpected errors.
         none_points = list(self.points.filter(value=None))
         if none_points:
-            null_points_value = none_points[0]
-        else:
-            name = slugify_uniquely_for_queryset("?", self.points.all(), slugfield="name")
-            null_points_value = Points.objects.create(name=name, value=None, project=self)
+            return none_points[0]
 
-        for us in user_stories:
-            usroles = Role.objects.filter(role_points__in=us.role_points.all()).distinct()
-            new_roles = roles.exclude(id__in=usroles)
-            new_rolepoints = [RolePoints(role=role, user_story=us, points=null_points_value)
-                              for role in new_roles]
-            RolePoints.objects.bulk_create(new_rolepoints)
+        name = slugify_uniquely_for_queryset("?", self.points.all(), slugfield="name")
+        return Points.objects.create(name=name, value=None, project=self)
+
+    def update_role_points(self, user_stories=None):
+        RolePoints = apps.get_model("userstories", "RolePoints")
+        UserStory = apps.get_model("userstories", "UserStory")
+        Role = apps.get_model("users", "Role")
+
+        # Get all available roles on this project
+        roles = self.get_roles().filter(computable=True)
+        if not roles.exists():
+            return
+
+        # Create the role points of the user stories (all of them or
+        # only the given ones) without one for a computable role, in
+        # a single statement.
+        sql = """
+        INSERT INTO {rolepoints} (user_story_id, role_id, points_id)
+             SELECT us.id, role.id, %s
+               FROM {userstory} us
+         INNER JOIN {role} role ON role.project_id = us.project_id
+              WHERE us.project_id = %s
+                AND role.computable
+                {only_user_stories}
+                AND NOT EXISTS (SELECT 1
+                                  FROM {rolepoints} rp
+                                 WHERE rp.user_story_id = us.id
+                                   AND rp.role_id = role.id);
+        """
+        params = [self.get_null_points().id, self.id]
+        only_user_stories = ""
+        if user_stories is not None:
+            only_user_stories = "AND us.id = ANY(%s)"
+            params.append([us.id for us in user_stories])
+
+        sql = sql.format(rolepoints=RolePoints._meta.db_table, userstory=UserStory._meta.db_table,
+                         role=Role._meta.db_table, only_user_stories=only_user_stories)
+        with closing(connection.cursor()) as cursor:
+            cursor.execute(sql, params)
 
         # Now remove rolepoints associated with not existing roles.
-        rp_query = RolePoints.objects.filter(user_story__in=self.user_stories.all())
+        rp_query = RolePoints.objects.filter(user_story__project=self)
         rp_query = rp_query.exclude(role__id__in=roles.values_list("id", flat=True))
         rp_query.delete()
 
@@ -344,6 +376,32 @@ class ProjectModulesConfig(models.Model):
         ordering = ["project"]
 
 
+class ProjectTag(models.Model):
+    # This model is an index of the tags used by the user stories,
+    # tasks and issues of a project. Its rows are maintained by
+    # database triggers (see the "update_project_tags_index" function)
+    # so it's never written from python code.
+
+    project = models.ForeignKey("Project", null=False, blank=False,
+                                related_name="tags_index", verbose_name=_("project"))
+    name = models.TextField(null=False, blank=False, verbose_name=_("name"))
+    userstories_count = models.IntegerField(default=0, null=False, blank=False,
+                                            verbose_name=_("user stories count"))
+    tasks_count = models.IntegerField(default=0, null=False, blank=False,
+                                      verbose_name=_("tasks count"))
+    issues_count = models.IntegerField(default=0, null=False, blank=False,
+                                       verbose_name=_("issues count"))
+
+    class Meta:
+        verbose_name = "project tag"
+        verbose_name_plural = "project tags"
+        ordering = ["project", "name"]
+        unique_together = ("project", "name")
+
+    def __str__(self):
+        return self.name
+
+
 # User Stories common Models
 class UserStoryStatus(models.Model):
     name = models.CharField(max_length=255, null=False, blank=False,
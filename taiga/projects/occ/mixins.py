@@ -14,11 +14,16 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from contextlib import closing
+
+from django.db import connection
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 
+from django_pgjson.fields import JsonField
+
 from taiga.base import exceptions as exc
-from taiga.base.utils import db
+from taiga.base.utils import json
 from taiga.projects.history.services import get_modified_fields
 
 
@@ -47,42 +52,81 @@ class OCCResourceMixin(object):
 
         return True
 
+    def _increment_version(self, obj, param_version):
+        """
+        Increment the version of the object if it's still `param_version`,
+        with a single (conditional) statement; otherwise lock the object
+        and read its current version.
+
+        :return: (incremented, version, version_changes)
+        """
+        table = obj._meta.db_table
+        sql = """
+            UPDATE {table} SET version = version + 1
+             WHERE id = %s AND version = %s
+         RETURNING version, version_changes
+        """.format(table=table)
+
+        with closing(connection.cursor()) as cursor:
+            cursor.execute(sql, [obj.id, param_version])
+            row = cursor.fetchone()
+            if row is not None:
+                return (True,) + tuple(row)
+
+            cursor.execute("SELECT version, version_changes FROM {table} WHERE id = %s FOR UPDATE".format(table=table),
+                           [obj.id])
+            return (False,) + tuple(cursor.fetchone())
+
+    def _get_modified_fields(self, obj, param_version, current_version, version_changes):
+        # The changes log only covers the versions after its "since" one;
+        # older versions are checked against the history of the object.
+        since = version_changes.get("since", None)
+        if since is not None and param_version >= since:
+            return {field for field, version in version_changes["fields"].items() if version > param_version}
+
+        return set(get_modified_fields(obj, current_version - param_version))
+
     def _validate_and_update_version(self, obj):
-        current_version = None
         if obj.id:
-            current_version = type(obj).objects.model.objects.get(id=obj.id).version
-
             # Extract param version
             param_version = self._extract_param_version()
-            if not self._validate_param_version(param_version, current_version):
+            if not self._validate_param_version(param_version, None):
                 raise exc.WrongArguments({"version": _("The version parameter is not valid")})
 
-            if current_version != param_version:
-                diff_versions = current_version - param_version
+            # Only the fields of the model are recorded in the changes log
+            model_fields = {field.name for field in obj._meta.concrete_fields + obj._meta.many_to_many}
+            modifying_fields = set(self.request.DATA.keys()) & model_fields
+            modifying_fields.discard("version")
 
-                modifying_fields = set(self.request.DATA.keys())
-                if "version" in modifying_fields:
-                    modifying_fields.remove("version")
+            incremented, version, version_changes = self._increment_version(obj, param_version)
+            if isinstance(version_changes, str):
+                version_changes = json.loads(version_changes)
 
-                modified_fields = set(get_modified_fields(obj, diff_versions))
-                if "version" in modifying_fields:
-                    modified_fields.remove("version")
+            if not incremented:
+                if not self._validate_param_version(param_version, version):
+                    raise exc.WrongArguments({"version": _("The version parameter is not valid")})
 
-                both_modified = modifying_fields & modified_fields
+                modified_fields = self._get_modified_fields(obj, param_version, version, version_changes)
+                modified_fields.discard("version")
 
-                if both_modified:
+                if modifying_fields & modified_fields:
                     raise exc.WrongArguments({"version": _("The version doesn't match with the current one")})
 
-            obj.version = models.F('version') + 1
+                version += 1
 
-    def pre_save(self, obj):
-        self._validate_and_update_version(obj)
-        super().pre_save(obj)
+            changed_fields = version_changes.get("fields", {})
+            changed_fields.update((field, version) for field in modifying_fields)
+            version_changes = {"since": version_changes.get("since", version - 1),
+                               "fields": changed_fields}
+
+            obj.version = version
+            obj.version_changes = version_changes
 
-    def post_save(self, obj, created=False):
-        super().post_save(obj, created)
-        if not created:
-            obj.version = db.reload_attribute(obj, 'version')
+    def post_conditions_on_save(self, obj):
+        # The version is incremented in the database, so it's done once the
+        # object has passed every check that can reject the request
+        super().post_conditions_on_save(obj)
+        self._validate_and_update_version(obj)
 
 
 class OCCModelMixin(models.Model):
@@ -91,6 +135,9 @@ class OCCModelMixin(models.Model):
     with concurrency control system.
     """
     version = models.IntegerField(null=False, blank=False, default=1, verbose_name=_("version"))
+    # The version in which every field was changed, for the versions after "since":
+    # {"since": <version>, "fields": {<field name>: <version>}}
+    version_changes = JsonField(null=False, blank=True, default={}, verbose_name=_("version changes"))
 
     class Meta:
         abstract = True
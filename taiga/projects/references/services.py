@@ -25,3 +25,15 @@ def get_instance_by_ref(project_id, obj_ref):
         instance = None
 
     return instance
+
+
+def get_instances_by_refs(project_id, obj_refs):
+    """
+    Get the references of a project for a list of refs with their
+    content objects prefetched. Returns a dict of ref -> Reference.
+    """
+    model_cls = apps.get_model("references", "Reference")
+    qs = (model_cls.objects.filter(project_id=project_id, ref__in=set(obj_refs))
+                           .select_related("content_type")
+                           .prefetch_related("content_object"))
+    return {instance.ref: instance for instance in qs}
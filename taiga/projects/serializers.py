@@ -32,6 +32,11 @@ from taiga.users.validators import RoleExistsValidator
 
 from taiga.permissions.service import get_user_project_permissions
 from taiga.permissions.service import is_project_owner
+from taiga.permissions.service import attach_user_memberships_to_project_queryset
+from taiga.permissions.service import attach_is_owner_to_project_queryset
+from taiga.projects.milestones.services import attach_closed_milestones_count_to_project_queryset
+from taiga.projects.votes.services import is_voter
+from taiga.projects.votes.utils import attach_user_votes_to_queryset
 
 from . import models
 from . import services
@@ -297,25 +302,55 @@ class MembersBulkSerializer(ProjectExistsValidator, serializers.Serializer):
 ## Projects
 ######################################################
 
+def _attach_user_memberships(queryset, context):
+    if "request" not in context:
+        return queryset
+    return attach_user_memberships_to_project_queryset(context["request"].user, queryset)
+
+
+def _attach_is_owner(queryset, context):
+    if "request" not in context:
+        return queryset
+    return attach_is_owner_to_project_queryset(context["request"].user, queryset)
+
+
+def _attach_closed_milestones_count(queryset, context):
+    return attach_closed_milestones_count_to_project_queryset(queryset)
+
+
+def _attach_user_votes(queryset, context):
+    if "request" not in context:
+        return queryset
+    return attach_user_votes_to_queryset(context["request"].user, queryset)
+
+
 class ProjectSerializer(serializers.ModelSerializer):
     tags = TagsField(default=[], required=False)
     anon_permissions = PgArrayField(required=False)
     public_permissions = PgArrayField(required=False)
     stars = serializers.SerializerMethodField("get_stars_number")
-    my_permissions = serializers.SerializerMethodField("get_my_permissions")
-    i_am_owner = serializers.SerializerMethodField("get_i_am_owner")
+    is_starred = serializers.AnnotatedField("get_is_starred", _attach_user_votes)
+    my_permissions = serializers.AnnotatedField("get_my_permissions", _attach_user_memberships)
+    i_am_owner = serializers.AnnotatedField("get_i_am_owner", _attach_is_owner, attr="i_am_owner")
     tags_colors = TagsColorsField(required=False)
-    total_closed_milestones = serializers.SerializerMethodField("get_total_closed_milestones")
+    total_closed_milestones = serializers.AnnotatedField("get_total_closed_milestones",
+                                                         _attach_closed_milestones_count,
+                                                         attr="closed_milestones_count")
 
     class Meta:
         model = models.Project
         read_only_fields = ("created_date", "modified_date", "owner")
         exclude = ("last_us_ref", "last_task_ref", "last_issue_ref",
-                   "issues_csv_uuid", "tasks_csv_uuid", "userstories_csv_uuid")
+                   "issues_csv_uuid", "tasks_csv_uuid", "userstories_csv_uuid",
+                   "total_voters")
 
     def get_stars_number(self, obj):
-        # The "stars_count" attribute is attached in the get_queryset of the viewset.
-        return getattr(obj, "stars_count", 0)
+        return obj.total_voters
+
+    def get_is_starred(self, obj):
+        if "request" in self.context:
+            return is_voter(self.context["request"].user, obj)
+        return False
 
     def get_my_permissions(self, obj):
         if "request" in self.context:
@@ -380,7 +415,7 @@ class ProjectDetailAdminSerializer(ProjectDetailSerializer):
     class Meta:
         model = models.Project
         read_only_fields = ("created_date", "modified_date", "owner")
-        exclude = ("last_us_ref", "last_task_ref", "last_issue_ref")
+        exclude = ("last_us_ref", "last_task_ref", "last_issue_ref", "total_voters")
 
 
 ######################################################
@@ -0,0 +1,129 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Creation of user stories, tasks and issues in bulk.
+
+Saving the new instances one by one runs the `pre_save`/`post_save`
+signal handlers and the history and notification hooks of the resources
+for each one of them. Here the same work is done once for the whole
+batch: the refs are allocated in one block, the instances and their
+related rows are inserted with `bulk_create` and the history entries,
+the timeline entries and the change events are stored and emitted
+together.
+
+No `pre_save`/`post_save` signals are sent for the new instances.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from taiga.base.utils import db
+from taiga.events import events
+from taiga.events import middleware as mw
+from taiga.projects.history.services import take_snapshots_of_new_objects_in_bulk
+from taiga.projects.references import models as refs
+from taiga.projects.references import sequences as seq
+
+from .tags_colors import update_project_tags_colors
+
+
+def _prepare_instances(instances):
+    now = timezone.now()
+    for instance in instances:
+        instance.modified_date = now
+
+        # Same as the tags_normalization and blocked_pre_save handlers
+        instance.tags = list(map(str.lower, instance.tags or []))
+        if not instance.is_blocked:
+            instance.blocked_note = ""
+
+
+def _allocate_refs(project, instances):
+    sequence_name = refs.make_sequence_name(project)
+    for instance, ref in zip(instances, seq.next_values(sequence_name, len(instances))):
+        instance.ref = ref
+
+
+def _store_references(project, instances):
+    content_type = ContentType.objects.get_for_model(instances[0].__class__)
+    refs.Reference.objects.bulk_create([
+        refs.Reference(content_type=content_type, object_id=instance.pk,
+                       ref=instance.ref, project=project)
+        for instance in instances
+    ])
+
+
+def _store_custom_attributes_values(instances, values_model, container_field):
+    values_model.objects.bulk_create([
+        values_model(**{container_field: instance, "attributes_values": {}})
+        for instance in instances
+    ])
+
+
+def _update_project_tags_colors(project, instances):
+    tags = []
+    for instance in instances:
+        tags.extend(tag for tag in instance.tags if tag not in tags)
+
+    if tags:
+        update_project_tags_colors(project, tags)
+        project.save()
+
+
+def _emit_create_events(project, instances):
+    content_type = db.get_typename_for_model_class(instances[0].__class__)
+    ids = [instance.id for instance in instances]
+    sessionid = mw.get_current_session_id()
+
+    emit_event = lambda: events.emit_event_for_ids(ids, content_type, project.id,
+                                                   type="create", sessionid=sessionid)
+    connection.on_commit(emit_event)
+
+
+@transaction.atomic
+def create_items_in_bulk(instances, *, project, user, values_model, container_field,
+                         post_insert=None):
+    """Insert a list of new user stories, tasks or issues of a project.
+
+    :param instances: List of unsaved instances of the same model.
+    :param project: Project of the instances.
+    :param user: User that creates the instances (used for the history).
+    :param values_model: Model of the custom attributes values of the instances.
+    :param container_field: Field of `values_model` that references the instance.
+    :param post_insert: Callable that receives the list of instances after
+                        the insertion and before the history snapshots.
+
+    :return: List of the "create" history entries of the instances.
+    """
+    if not instances:
+        return []
+
+    _prepare_instances(instances)
+    _allocate_refs(project, instances)
+    db.bulk_create_with_ids(instances[0].__class__, instances)
+    _store_references(project, instances)
+    _store_custom_attributes_values(instances, values_model, container_field)
+
+    if post_insert is not None:
+        post_insert(instances)
+
+    _update_project_tags_colors(project, instances)
+    history_entries = take_snapshots_of_new_objects_in_bulk(instances, user=user)
+    _emit_create_events(project, instances)
+    return history_entries
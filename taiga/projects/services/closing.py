@@ -0,0 +1,128 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+Set-based recalculation of the `is_closed` flag of user stories and the
+`closed` flag of milestones.
+
+The signal handlers of tasks and user stories register the affected ids
+with `recalculate_is_closed`. Inside a `deferred_is_closed_recalculation`
+block (used by bulk operations) the ids are collected and recalculated
+together at the end of the block, otherwise they are recalculated at once.
+"""
+
+import threading
+
+from contextlib import contextmanager
+from itertools import groupby
+
+from django.db import connection
+
+from taiga.events import events
+from taiga.events import middleware as mw
+
+_local = threading.local()
+
+
+@contextmanager
+def deferred_is_closed_recalculation():
+    if getattr(_local, "pending", None) is not None:
+        # Nested blocks are recalculated by the outer one
+        yield
+        return
+
+    _local.pending = (set(), set())
+    try:
+        yield
+        user_story_ids, milestone_ids = _local.pending
+    finally:
+        _local.pending = None
+
+    _recalculate_is_closed(user_story_ids, milestone_ids)
+
+
+def recalculate_is_closed(user_story_ids=(), milestone_ids=(), refresh=()):
+    """
+    Recalculate the closed state of the user stories and milestones (and of
+    the milestones of the updated user stories).
+
+    `refresh` is a list of user story or milestone instances to update in
+    place when the recalculation isn't deferred.
+    """
+    user_story_ids = set(filter(None, user_story_ids))
+    milestone_ids = set(filter(None, milestone_ids))
+
+    pending = getattr(_local, "pending", None)
+    if pending is not None:
+        pending[0].update(user_story_ids)
+        pending[1].update(milestone_ids)
+        return
+
+    _recalculate_is_closed(user_story_ids, milestone_ids, refresh)
+
+
+def _recalculate_is_closed(user_story_ids, milestone_ids, refresh=()):
+    from taiga.projects.userstories import services as us_services
+    from taiga.projects.milestones import services as milestone_services
+
+    updated_user_stories = us_services.update_userstories_is_closed(user_story_ids)
+    milestone_ids = set(milestone_ids)
+    milestone_ids.update(milestone_id for (id, project_id, milestone_id, is_closed, finish_date)
+                         in updated_user_stories if milestone_id)
+    updated_milestones = milestone_services.update_milestones_is_closed(milestone_ids)
+
+    user_stories_values = {id: {"is_closed": is_closed, "finish_date": finish_date}
+                           for (id, project_id, milestone_id, is_closed, finish_date) in updated_user_stories}
+    milestones_values = {id: {"closed": closed} for (id, project_id, closed) in updated_milestones}
+    for instance in refresh:
+        if instance is None:
+            continue
+        if instance._meta.model_name == "userstory":
+            values = user_stories_values.get(instance.id, {})
+        else:
+            values = milestones_values.get(instance.id, {})
+        for attr, value in values.items():
+            setattr(instance, attr, value)
+
+    _invalidate_assigned_users_profile_data([row[0] for row in updated_user_stories])
+    _emit_change_events("userstories.userstory", [(row[0], row[1]) for row in updated_user_stories])
+    _emit_change_events("milestones.milestone", [(row[0], row[1]) for row in updated_milestones])
+
+
+def _invalidate_assigned_users_profile_data(user_story_ids):
+    # The stats of the users count their closed user stories
+    if not user_story_ids:
+        return
+
+    from taiga.projects.userstories.models import UserStory
+    from taiga.users.services import invalidate_profile_data
+
+    invalidate_profile_data(UserStory.objects.filter(id__in=user_story_ids)
+                                             .values_list("assigned_to_id", flat=True))
+
+
+def _emit_change_events(content_type, ids_and_project_ids):
+    if not ids_and_project_ids:
+        return
+
+    sessionid = mw.get_current_session_id()
+    ids_and_project_ids = sorted(ids_and_project_ids, key=lambda x: x[1])
+    for project_id, rows in groupby(ids_and_project_ids, key=lambda x: x[1]):
+        ids = [id for (id, _) in rows]
+        emit_event = lambda ids=ids, project_id=project_id: events.emit_event_for_ids(
+            ids, content_type, project_id, sessionid=sessionid)
+        connection.on_commit(emit_event)
@@ -15,7 +15,16 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from contextlib import closing
+from django.conf import settings
+from django.core.cache import cache
 from django.db import connection
+from django.utils.translation import ugettext as _
+
+from taiga.base import exceptions as exc
+from taiga.base.utils import json
+
+import hashlib
+import uuid
 
 
 def _get_project_tags(project):
@@ -27,134 +36,159 @@ def _get_project_tags(project):
 
 
 def _get_stories_tags(project):
-    result = set()
-    for tags in project.user_stories.values_list("tags", flat=True):
-        if tags:
-            result.update(tags)
-    return result
+    return set(project.tags_index.filter(userstories_count__gt=0).values_list("name", flat=True))
 
 
 def _get_tasks_tags(project):
-    result = set()
-    for tags in project.tasks.values_list("tags", flat=True):
-        if tags:
-            result.update(tags)
-    return result
+    return set(project.tags_index.filter(tasks_count__gt=0).values_list("name", flat=True))
 
 
 def _get_issues_tags(project):
-    result = set()
-    for tags in project.issues.values_list("tags", flat=True):
-        if tags:
-            result.update(tags)
-    return result
+    return set(project.tags_index.filter(issues_count__gt=0).values_list("name", flat=True))
 
 
-def _get_issues_tags_with_count(project):
-    extra_sql = ("select unnest(tags) as tagname, count(unnest(tags)) "
-                 "from issues_issue where project_id = %s "
-                 "group by unnest(tags) "
-                 "order by tagname asc")
+def _get_project_items_tags(project):
+    return set(project.tags_index.values_list("name", flat=True))
 
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
 
-    return rows
+# Issues filters data
 
+ISSUES_FILTERS_DATA_FIELDS = {
+    "status": "status_id",
+    "severity": "severity_id",
+    "priority": "priority_id",
+    "owner": "owner_id",
+    "assigned_to": "assigned_to_id",
+    "type": "type_id",
+}
 
-def _get_issues_statuses(project):
-    extra_sql = ("select status_id, count(status_id) from issues_issue "
-                 "where project_id = %s group by status_id;")
 
-    extra_sql = """
-    select id, (select count(*) from issues_issue
-                    where project_id = m.project_id and status_id = m.id)
-        from projects_issuestatus as m
-        where project_id = %s order by m.order;
-    """
+def _prepare_issues_filters_id(value):
+    # As the ORM does with the issues list filters, the booleans
+    # are the ids 1 and 0.
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    raise exc.BadRequest(_("Invalid filter value"))
 
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
 
-    return rows
+def _get_issues_filters_where(filters):
+    where = []
+    params = []
 
+    for name, values in sorted(filters.items()):
+        if name == "tags":
+            where.append("tags @> %s::text[]")
+            params.append(list(values))
+            continue
 
-def _get_issues_priorities(project):
-    extra_sql = """
-    select id, (select count(*) from issues_issue
-                where project_id = m.project_id and priority_id = m.id)
-        from projects_priority as m
-        where project_id = %s order by m.order;
-    """
+        column = ISSUES_FILTERS_DATA_FIELDS.get(name, None)
+        if column is None:
+            continue
 
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
+        not_null_values = [_prepare_issues_filters_id(v) for v in values if v is not None]
+        conditions = []
+        if not_null_values:
+            conditions.append("{0} = any(%s)".format(column))
+            params.append(not_null_values)
+        if None in values:
+            conditions.append("{0} is null".format(column))
 
-    return rows
+        if conditions:
+            where.append("({0})".format(" or ".join(conditions)))
 
-def _get_issues_types(project):
-    extra_sql = """
-    select id, (select count(*) from issues_issue
-                where project_id = m.project_id and type_id = m.id)
-        from projects_issuetype as m
-        where project_id = %s order by m.order;
-    """
+    return "".join(" and {0}".format(condition) for condition in where), params
 
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
 
-    return rows
+def _get_issues_filters_data_rows(project, filters):
+    """
+    Compute the counters of every issues filter facet in
+    only one query over the (filtered) issues of the project.
 
+    Each returned row has the form (facet, id, tagname, count).
+    """
+    where, where_params = _get_issues_filters_where(filters)
 
-def _get_issues_severities(project):
     extra_sql = """
-    select id, (select count(*) from issues_issue
-                where project_id = m.project_id and severity_id = m.id)
+    with filtered_issues as (
+        select status_id, priority_id, type_id, severity_id, assigned_to_id, owner_id, tags
+            from issues_issue
+            where project_id = %s {where}
+    )
+    select 'types', m.id, null, m.order, coalesce(c.count, 0)
+        from projects_issuetype as m
+        left outer join (select type_id, count(*) as count from filtered_issues
+                            group by type_id) as c on c.type_id = m.id
+        where m.project_id = %s
+    union all
+    select 'statuses', m.id, null, m.order, coalesce(c.count, 0)
+        from projects_issuestatus as m
+        left outer join (select status_id, count(*) as count from filtered_issues
+                            group by status_id) as c on c.status_id = m.id
+        where m.project_id = %s
+    union all
+    select 'priorities', m.id, null, m.order, coalesce(c.count, 0)
+        from projects_priority as m
+        left outer join (select priority_id, count(*) as count from filtered_issues
+                            group by priority_id) as c on c.priority_id = m.id
+        where m.project_id = %s
+    union all
+    select 'severities', m.id, null, m.order, coalesce(c.count, 0)
         from projects_severity as m
-        where project_id = %s order by m.order;
-    """
+        left outer join (select severity_id, count(*) as count from filtered_issues
+                            group by severity_id) as c on c.severity_id = m.id
+        where m.project_id = %s
+    union all
+    select 'assigned_to', null, null, -1, count(*)
+        from filtered_issues
+        where assigned_to_id is null
+    union all
+    select 'assigned_to', pm.user_id, null, pm.user_id, coalesce(c.count, 0)
+        from projects_membership as pm
+        left outer join (select assigned_to_id, count(*) as count from filtered_issues
+                            group by assigned_to_id) as c on c.assigned_to_id = pm.user_id
+        where pm.project_id = %s and pm.user_id is not null
+    union all
+    select 'owners', pm.user_id, null, pm.user_id, coalesce(c.count, 0)
+        from projects_membership as pm
+        left outer join (select owner_id, count(*) as count from filtered_issues
+                            group by owner_id) as c on c.owner_id = pm.user_id
+        where pm.project_id = %s and pm.user_id is not null
+    union all
+    select 'tags', null, t.tagname, 0, count(*)
+        from (select unnest(tags) as tagname from filtered_issues) as t
+        group by t.tagname
+    order by 1, 4, 3;
+    """.format(where=where)
+
+    params = [project.id] + where_params + [project.id] * 6
 
     with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
+        cursor.execute(extra_sql, params)
         rows = cursor.fetchall()
 
     return rows
 
 
-def _get_issues_assigned_to(project):
-    extra_sql = """
-    select null, (select count(*) from issues_issue
-                        where project_id = %s and assigned_to_id is null)
-    UNION select user_id, (select count(*) from issues_issue
-                        where project_id = pm.project_id and assigned_to_id = pm.user_id)
-        from projects_membership as pm
-        where project_id = %s and pm.user_id is not null;
-    """
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id, project.id])
-        rows = cursor.fetchall()
+def _get_issues_filters_data_cache_key(project, filters):
+    version_key = "issues_filters_data_version:{0}".format(project.id)
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(version_key, version, None)
 
-    return rows
+    signature = json.dumps(sorted((name, sorted(values, key=str)) for name, values in filters.items()))
+    signature = hashlib.sha1(signature.encode("utf-8")).hexdigest()
+    return "issues_filters_data:{0}:{1}:{2}".format(project.id, version, signature)
 
 
-def _get_issues_owners(project):
-    extra_sql = """
-    select user_id, (select count(*) from issues_issue
-                        where project_id = pm.project_id and owner_id = pm.user_id)
-        from projects_membership as pm
-        where project_id = %s and pm.user_id is not null;
+def invalidate_issues_filters_data(project_id):
     """
-
-    with closing(connection.cursor()) as cursor:
-        cursor.execute(extra_sql, [project.id])
-        rows = cursor.fetchall()
-
-    return rows
+    Discard every cached filters data of a project, whatever
+    filters were applied when they were computed.
+    """
+    cache.delete("issues_filters_data_version:{0}".format(project_id))
 
 
 # Public api
@@ -166,27 +200,43 @@ def get_all_tags(project):
     """
     result = set()
     result.update(_get_project_tags(project))
-    result.update(_get_issues_tags(project))
-    result.update(_get_stories_tags(project))
-    result.update(_get_tasks_tags(project))
+    result.update(_get_project_items_tags(project))
     return sorted(result)
 
 
-def get_issues_filters_data(project):
+def get_issues_filters_data(project, filters=None):
     """
     Given a project, return a simple data structure
     of all possible filters for issues.
+
+    If `filters` (a dict of filter name -> list of values
+    as used by the issues list) is given, the counters are
+    computed only over the issues that match them.
     """
+    filters = filters or {}
+
+    cache_key = _get_issues_filters_data_cache_key(project, filters)
+    data = cache.get(cache_key)
+    if data is not None:
+        return data
 
     data = {
-        "types": _get_issues_types(project),
-        "statuses": _get_issues_statuses(project),
-        "priorities": _get_issues_priorities(project),
-        "severities": _get_issues_severities(project),
-        "assigned_to": _get_issues_assigned_to(project),
-        "created_by": _get_issues_owners(project),
-        "owners": _get_issues_owners(project),
-        "tags": _get_issues_tags_with_count(project),
+        "types": [],
+        "statuses": [],
+        "priorities": [],
+        "severities": [],
+        "assigned_to": [],
+        "owners": [],
+        "tags": [],
     }
 
+    for facet, id, tagname, order, count in _get_issues_filters_data_rows(project, filters):
+        if facet == "tags":
+            data[facet].append((tagname, count))
+        else:
+            data[facet].append((id, count))
+
+    data["created_by"] = data["owners"]
+
+    cache.set(cache_key, data, settings.ISSUES_FILTERS_DATA_CACHE_TIMEOUT)
     return data
@@ -39,22 +39,26 @@ def remove_unused_tags(project):
     project.tags_colors = list(filter(lambda x: x[0] in current_tags, project.tags_colors))
 
 
-def update_project_tags_colors_handler(instance):
-    if instance.tags is None:
-        instance.tags = []
+def update_project_tags_colors(project, tags):
+    if not isinstance(project.tags_colors, list):
+        project.tags_colors = []
 
-    if not isinstance(instance.project.tags_colors, list):
-        instance.project.tags_colors = []
-
-    for tag in instance.tags:
-        defined_tags = map(lambda x: x[0], instance.project.tags_colors)
+    for tag in tags:
+        defined_tags = map(lambda x: x[0], project.tags_colors)
         if tag not in defined_tags:
-            used_colors = map(lambda x: x[1], instance.project.tags_colors)
+            used_colors = map(lambda x: x[1], project.tags_colors)
             new_color = _get_new_color(tag, settings.TAGS_PREDEFINED_COLORS,
                                        exclude=used_colors)
-            instance.project.tags_colors.append([tag, new_color])
-        
-    remove_unused_tags(instance.project)
+            project.tags_colors.append([tag, new_color])
+
+    remove_unused_tags(project)
+
+
+def update_project_tags_colors_handler(instance):
+    if instance.tags is None:
+        instance.tags = []
+
+    update_project_tags_colors(instance.project, instance.tags)
 
     if not isinstance(instance, Project):
         instance.project.save()
@@ -18,7 +18,9 @@ from django.apps import apps
 from django.conf import settings
 
 from taiga.projects.services.tags_colors import update_project_tags_colors_handler, remove_unused_tags
+from taiga.projects.services.filters import invalidate_issues_filters_data
 from taiga.projects.notifications.services import create_notify_policy_if_not_exists
+from taiga.users.services import invalidate_project_members_profile_data
 
 
 ####################################
@@ -40,6 +42,25 @@ def update_project_tags_when_delete_taggable_item(sender, instance, **kwargs):
     remove_unused_tags(instance.project)
     instance.project.save()
 
+
+## ISSUES FILTERS DATA
+
+def invalidate_issues_filters_data_cache(sender, instance, **kwargs):
+    invalidate_issues_filters_data(instance.project_id)
+
+
+## USERS PROFILE DATA
+
+def invalidate_profile_data_cache_of_members(sender, instance, **kwargs):
+    invalidate_project_members_profile_data(instance.project_id, [instance.user_id])
+
+
+def invalidate_profile_data_cache_of_project_members(sender, instance, created, **kwargs):
+    if created:
+        return
+    invalidate_project_members_profile_data(instance.id)
+
+
 def membership_post_delete(sender, instance, using, **kwargs):
     instance.project.update_role_points()
 
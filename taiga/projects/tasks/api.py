@@ -14,15 +14,16 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from django.conf import settings
 from django.utils.translation import ugettext as _
 
 from taiga.base.api.utils import get_object_or_404
+from taiga.base.utils.csv import streaming_csv_response
 from taiga.base import filters, response
 from taiga.base import exceptions as exc
 from taiga.base.decorators import list_route
 from taiga.base.api import ModelCrudViewSet
 from taiga.projects.models import Project
-from django.http import HttpResponse
 
 from taiga.projects.notifications.mixins import WatchedResourceMixin
 from taiga.projects.history.mixins import HistoryResourceMixin
@@ -39,6 +40,7 @@ class TaskViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin,
     model = models.Task
     serializer_class = serializers.TaskNeighborsSerializer
     list_serializer_class = serializers.TaskSerializer
+    compiled_list_serializer = True
     permission_classes = (permissions.TaskPermission,)
     filter_backends = (filters.CanViewTasksFilterBackend,)
     filter_fields = ["user_story", "milestone", "project", "assigned_to",
@@ -81,10 +83,9 @@ class TaskViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin,
 
         project = get_object_or_404(Project, tasks_csv_uuid=uuid)
         queryset = project.tasks.all().order_by('ref')
-        data = services.tasks_to_csv(project, queryset)
-        csv_response = HttpResponse(data.getvalue(), content_type='application/csv; charset=utf-8')
-        csv_response['Content-Disposition'] = 'attachment; filename="tasks.csv"'
-        return csv_response
+        etag = services.tasks_csv_etag(project, queryset) if settings.CSV_USE_ETAGS else None
+        lines = services.tasks_to_csv_stream(project, queryset)
+        return streaming_csv_response(request, "tasks.csv", lines, etag=etag)
 
     @list_route(methods=["POST"])
     def bulk_create(self, request, **kwargs):
@@ -93,10 +94,12 @@ class TaskViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMixin,
             data = serializer.data
             project = Project.objects.get(id=data["project_id"])
             self.check_permissions(request, 'bulk_create', project)
-            tasks = services.create_tasks_in_bulk(
+            tasks, history_entries = services.bulk_create_tasks(
                 data["bulk_tasks"], milestone_id=data["sprint_id"], user_story_id=data["us_id"],
                 status_id=data.get("status_id") or project.default_task_status_id,
-                project=project, owner=request.user, callback=self.post_save, precall=self.pre_save)
+                project=project, owner=request.user)
+            for task, history in zip(tasks, history_entries):
+                self.send_notifications(task, history)
             tasks_serialized = self.serializer_class(tasks, many=True)
 
             return response.Ok(tasks_serialized.data)
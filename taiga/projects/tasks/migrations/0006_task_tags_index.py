@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_auto_20150114_0954'),
+        ('projects', '0022_projecttag'),
+    ]
+
+    operations = [
+        # Index: Speed up the tags filters ("tags @> ARRAY[...]")
+        migrations.RunSQL(
+            """
+            CREATE INDEX "tasks_task_tags_gin" ON tasks_task USING gin (tags);
+            """,
+            reverse_sql="""DROP INDEX IF EXISTS "tasks_task_tags_gin";"""
+        ),
+
+        # Data: Fill the project tags index with the tags of the current tasks
+        migrations.RunSQL(
+            """
+            INSERT INTO projects_projecttag (project_id, name, userstories_count, tasks_count, issues_count)
+                 SELECT DISTINCT t.project_id, t.name, 0, 0, 0
+                   FROM (SELECT project_id, unnest(tags) AS name FROM tasks_task) AS t
+                  WHERE t.name IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM projects_projecttag AS pt
+                                     WHERE pt.project_id = t.project_id AND pt.name = t.name);
+
+                 UPDATE projects_projecttag AS pt
+                    SET tasks_count = c.count
+                   FROM (SELECT t.project_id, t.name, count(DISTINCT t.id) AS count
+                           FROM (SELECT id, project_id, unnest(tags) AS name FROM tasks_task) AS t
+                       GROUP BY t.project_id, t.name) AS c
+                  WHERE pt.project_id = c.project_id AND pt.name = c.name;
+            """,
+            reverse_sql="""UPDATE projects_projecttag SET tasks_count = 0;"""
+        ),
+
+        # Trigger: Update the project tags index after any change of the tasks tags
+        migrations.RunSQL(
+            """
+            CREATE TRIGGER "update_project_tags_index_after_change_tasks_task"
+             AFTER INSERT OR UPDATE OR DELETE ON tasks_task
+               FOR EACH ROW
+           EXECUTE PROCEDURE update_project_tags_index('tasks_count');
+            """,
+            reverse_sql="""DROP TRIGGER IF EXISTS "update_project_tags_index_after_change_tasks_task"
+                                               ON tasks_task
+                                          CASCADE;"""
+        ),
+    ]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django_pgjson.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_tags_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='version_changes',
+            field=django_pgjson.fields.JsonField(verbose_name='version changes', blank=True, default={}),
+            preserve_default=True,
+        ),
+    ]
@@ -46,6 +46,7 @@ class TaskSerializer(WatchersValidator, serializers.ModelSerializer):
     class Meta:
         model = models.Task
         read_only_fields = ('id', 'ref', 'created_date', 'modified_date')
+        exclude = ('version_changes',)
 
     def get_comment(self, obj):
         return ""
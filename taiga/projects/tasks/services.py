@@ -14,11 +14,15 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import io
-import csv
-
 from taiga.base.utils import db, text
+from taiga.base.utils.csv import CSV_CHUNK_SIZE, get_etag, stream_csv, write_csv
+from taiga.base.utils.db import get_last_modification
+from taiga.base.utils.iterators import iter_queryset
+from taiga.projects.attachments.utils import attach_attachments_count_to_queryset
+from taiga.projects.custom_attributes.models import TaskCustomAttributesValues
 from taiga.projects.history.services import take_snapshot
+from taiga.projects.services.bulk_create import create_items_in_bulk
+from taiga.projects.services.closing import deferred_is_closed_recalculation, recalculate_is_closed
 from taiga.events import events
 
 from . import models
@@ -46,10 +50,39 @@ def create_tasks_in_bulk(bulk_data, callback=None, precall=None, **additional_fi
     :return: List of created `Task` instances.
     """
     tasks = get_tasks_from_bulk(bulk_data, **additional_fields)
-    db.save_in_bulk(tasks, callback, precall)
+    with deferred_is_closed_recalculation():
+        db.save_in_bulk(tasks, callback, precall)
     return tasks
 
 
+def bulk_create_tasks(bulk_data, *, project, owner, **additional_fields):
+    """Create tasks from `bulk_data` with a fixed number of queries.
+
+    Unlike `create_tasks_in_bulk`, the tasks are not saved one by one,
+    so no `pre_save`/`post_save` signals are sent for them (see
+    `taiga.projects.services.bulk_create`).
+
+    :param bulk_data: List of tasks in bulk format.
+    :param project: Project of the tasks.
+    :param owner: Owner of the tasks.
+    :param additional_fields: Additional fields when instantiating each task.
+
+    :return: Tuple with the list of created `Task` instances and the
+             list of their history entries.
+    """
+    tasks = get_tasks_from_bulk(bulk_data, project=project, owner=owner, **additional_fields)
+
+    def post_insert(tasks):
+        recalculate_is_closed(user_story_ids=[task.user_story_id for task in tasks],
+                              milestone_ids=[task.milestone_id for task in tasks])
+
+    history_entries = create_items_in_bulk(tasks, project=project, user=owner,
+                                           values_model=TaskCustomAttributesValues,
+                                           container_field="task",
+                                           post_insert=post_insert)
+    return tasks, history_entries
+
+
 def update_tasks_order_in_bulk(bulk_data:list, field:str, project:object):
     """
     Update the order of some tasks.
@@ -61,13 +94,13 @@ def update_tasks_order_in_bulk(bulk_data:list, field:str, project:object):
     new_order_values = []
     for task_data in bulk_data:
         task_ids.append(task_data["task_id"])
-        new_order_values.append({field: task_data["order"]})
+        new_order_values.append((task_data["task_id"], task_data["order"]))
 
     events.emit_event_for_ids(ids=task_ids,
                               content_type="tasks.task",
                               projectid=project.pk)
 
-    db.update_in_bulk_with_ids(task_ids, new_order_values, model=models.Task)
+    db.update_field_in_bulk(models.Task, field, new_order_values, project_id=project.pk)
 
 
 def snapshot_tasks_in_bulk(bulk_data, user):
@@ -80,18 +113,22 @@ def snapshot_tasks_in_bulk(bulk_data, user):
             pass
 
 
-def tasks_to_csv(project, queryset):
-    csv_data = io.StringIO()
+def _get_tasks_csv_fieldnames(custom_attrs):
     fieldnames = ["ref", "subject", "description", "user_story", "milestone", "owner",
                   "owner_full_name", "assigned_to", "assigned_to_full_name",
                   "status", "is_iocaine", "is_closed", "us_order",
                   "taskboard_order", "attachments", "external_reference", "tags"]
-    for custom_attr in project.taskcustomattributes.all():
+    for custom_attr in custom_attrs:
         fieldnames.append(custom_attr.name)
+    return fieldnames
 
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
-    for task in queryset:
+
+def _get_tasks_csv_rows(queryset, custom_attrs):
+    queryset = queryset.select_related("user_story", "milestone", "owner", "assigned_to",
+                                       "status", "custom_attributes_values")
+    queryset = attach_attachments_count_to_queryset(queryset)
+
+    for task in iter_queryset(queryset, itersize=CSV_CHUNK_SIZE):
         task_data = {
             "ref": task.ref,
             "subject": task.subject,
@@ -107,14 +144,41 @@ def tasks_to_csv(project, queryset):
             "is_closed": task.status.is_closed,
             "us_order": task.us_order,
             "taskboard_order": task.taskboard_order,
-            "attachments": task.attachments.count(),
+            "attachments": task.attachments_count,
             "external_reference": task.external_reference,
             "tags": ",".join(task.tags or []),
         }
-        for custom_attr in project.taskcustomattributes.all():
+        for custom_attr in custom_attrs:
             value = task.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
             task_data[custom_attr.name] = value
 
-        writer.writerow(task_data)
+        yield task_data
+
+
+def tasks_to_csv(project, queryset):
+    custom_attrs = list(project.taskcustomattributes.all())
+    fieldnames = _get_tasks_csv_fieldnames(custom_attrs)
+    return write_csv(fieldnames, _get_tasks_csv_rows(queryset, custom_attrs))
+
 
-    return csv_data
+def tasks_to_csv_stream(project, queryset):
+    """
+    Generator of the csv lines of the tasks, with the related data fetched
+    in chunks.
+    """
+    custom_attrs = list(project.taskcustomattributes.all())
+    fieldnames = _get_tasks_csv_fieldnames(custom_attrs)
+    yield from stream_csv(fieldnames, _get_tasks_csv_rows(queryset, custom_attrs))
+
+
+def tasks_csv_etag(project, queryset):
+    """
+    ETag of the tasks csv, from the last modification of the tasks and the
+    project data included in it.
+    """
+    return get_etag(project.id, project.modified_date,
+                    get_last_modification(queryset, "custom_attributes_values__version"),
+                    get_last_modification(project.taskcustomattributes.all()),
+                    get_last_modification(project.user_stories.all()),
+                    get_last_modification(project.milestones.all()),
+                    get_last_modification(project.attachments.all()))
@@ -14,9 +14,6 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from contextlib import suppress
-from django.core.exceptions import ObjectDoesNotExist
-
 ####################################
 # Signals for cached prev task
 ####################################
@@ -25,7 +22,8 @@ from django.core.exceptions import ObjectDoesNotExist
 def cached_prev_task(sender, instance, **kwargs):
     instance.prev = None
     if instance.id:
-        instance.prev = sender.objects.get(id=instance.id)
+        # Only the relations used by the post_save handlers are needed
+        instance.prev = sender.objects.only("user_story", "milestone").get(id=instance.id)
 
 
 ####################################
@@ -33,62 +31,19 @@ def cached_prev_task(sender, instance, **kwargs):
 ####################################
 
 def try_to_close_or_open_us_and_milestone_when_create_or_edit_task(sender, instance, created, **kwargs):
-    _try_to_close_or_open_us_when_create_or_edit_task(instance)
-    _try_to_close_or_open_milestone_when_create_or_edit_task(instance)
-
-def try_to_close_or_open_us_and_milestone_when_delete_task(sender, instance, **kwargs):
-    _try_to_close_or_open_us_when_delete_task(instance)
-    _try_to_close_milestone_when_delete_task(instance)
-
-
-# US
-def _try_to_close_or_open_us_when_create_or_edit_task(instance):
-    from taiga.projects.userstories import services as us_service
-
-    if instance.user_story_id:
-        if us_service.calculate_userstory_is_closed(instance.user_story):
-            us_service.close_userstory(instance.user_story)
-        else:
-            us_service.open_userstory(instance.user_story)
-
-    if instance.prev and instance.prev.user_story_id and instance.prev.user_story_id != instance.user_story_id:
-        if us_service.calculate_userstory_is_closed(instance.prev.user_story):
-            us_service.close_userstory(instance.prev.user_story)
-        else:
-            us_service.open_userstory(instance.prev.user_story)
+    from taiga.projects.services.closing import recalculate_is_closed
 
+    user_story_ids = [instance.user_story_id]
+    milestone_ids = [instance.milestone_id]
+    if instance.prev:
+        user_story_ids.append(instance.prev.user_story_id)
+        milestone_ids.append(instance.prev.milestone_id)
 
-def _try_to_close_or_open_us_when_delete_task(instance):
-    from taiga.projects.userstories import services as us_service
+    recalculate_is_closed(user_story_ids=user_story_ids, milestone_ids=milestone_ids)
 
-    with suppress(ObjectDoesNotExist):
-        if instance.user_story_id:
-            if us_service.calculate_userstory_is_closed(instance.user_story):
-                us_service.close_userstory(instance.user_story)
-            else:
-                us_service.open_userstory(instance.user_story)
 
+def try_to_close_or_open_us_and_milestone_when_delete_task(sender, instance, **kwargs):
+    from taiga.projects.services.closing import recalculate_is_closed
 
-# Milestone
-def _try_to_close_or_open_milestone_when_create_or_edit_task(instance):
-    from taiga.projects.milestones import services as milestone_service
-
-    if instance.milestone_id:
-        if milestone_service.calculate_milestone_is_closed(instance.milestone):
-            milestone_service.close_milestone(instance.milestone)
-        else:
-            milestone_service.open_milestone(instance.milestone)
-
-    if instance.prev and instance.prev.milestone_id and instance.prev.milestone_id != instance.milestone_id:
-        if milestone_service.calculate_milestone_is_closed(instance.prev.milestone):
-            milestone_service.close_milestone(instance.prev.milestone)
-        else:
-            milestone_service.open_milestone(instance.prev.milestone)
-
-
-def _try_to_close_milestone_when_delete_task(instance):
-    from taiga.projects.milestones import services
-
-    with suppress(ObjectDoesNotExist):
-        if instance.milestone_id and services.calculate_milestone_is_closed(instance.milestone):
-            services.close_milestone(instance.milestone)
+    recalculate_is_closed(user_story_ids=[instance.user_story_id],
+                          milestone_ids=[instance.milestone_id])
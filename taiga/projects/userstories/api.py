@@ -17,11 +17,11 @@
 from contextlib import suppress
 
 
+from django.conf import settings
 from django.apps import apps
 from django.db import transaction
 from django.utils.translation import ugettext as _
 from django.core.exceptions import ObjectDoesNotExist
-from django.http import HttpResponse
 
 from taiga.base import filters
 from taiga.base import exceptions as exc
@@ -30,6 +30,7 @@ from taiga.base import status
 from taiga.base.decorators import list_route
 from taiga.base.api import ModelCrudViewSet
 from taiga.base.api.utils import get_object_or_404
+from taiga.base.utils.csv import streaming_csv_response
 
 from taiga.projects.notifications.mixins import WatchedResourceMixin
 from taiga.projects.history.mixins import HistoryResourceMixin
@@ -48,6 +49,7 @@ class UserStoryViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMi
     model = models.UserStory
     serializer_class = serializers.UserStoryNeighborsSerializer
     list_serializer_class = serializers.UserStorySerializer
+    compiled_list_serializer = True
     permission_classes = (permissions.UserStoryPermission,)
 
     filter_backends = (filters.CanViewUsFilterBackend, filters.TagsFilter,
@@ -114,10 +116,9 @@ class UserStoryViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMi
 
         project = get_object_or_404(Project, userstories_csv_uuid=uuid)
         queryset = project.user_stories.all().order_by('ref')
-        data = services.userstories_to_csv(project, queryset)
-        csv_response = HttpResponse(data.getvalue(), content_type='application/csv; charset=utf-8')
-        csv_response['Content-Disposition'] = 'attachment; filename="userstories.csv"'
-        return csv_response
+        etag = services.userstories_csv_etag(project, queryset) if settings.CSV_USE_ETAGS else None
+        lines = services.userstories_to_csv_stream(project, queryset)
+        return streaming_csv_response(request, "userstories.csv", lines, etag=etag)
 
     @list_route(methods=["POST"])
     def bulk_create(self, request, **kwargs):
@@ -126,10 +127,11 @@ class UserStoryViewSet(OCCResourceMixin, HistoryResourceMixin, WatchedResourceMi
             data = serializer.data
             project = Project.objects.get(id=data["project_id"])
             self.check_permissions(request, 'bulk_create', project)
-            user_stories = services.create_userstories_in_bulk(
+            user_stories, history_entries = services.bulk_create_userstories(
                 data["bulk_stories"], project=project, owner=request.user,
-                status_id=data.get("status_id") or project.default_us_status_id,
-                callback=self.post_save, precall=self.pre_save)
+                status_id=data.get("status_id") or project.default_us_status_id)
+            for user_story, history in zip(user_stories, history_entries):
+                self.send_notifications(user_story, history)
             user_stories_serialized = self.serializer_class(user_stories, many=True)
             return response.Ok(user_stories_serialized.data)
         return response.BadRequest(serializer.errors)
@@ -46,6 +46,14 @@ class UserStoriesAppConfig(AppConfig):
         signals.post_delete.connect(handlers.try_to_close_milestone_when_delete_us,
                                     sender=apps.get_model("userstories", "UserStory"))
 
+        # Users stats
+        signals.post_save.connect(handlers.invalidate_assigned_users_profile_data_when_edit_us,
+                                  sender=apps.get_model("userstories", "UserStory"),
+                                  dispatch_uid="invalidate_assigned_users_profile_data_when_edit_us")
+        signals.post_delete.connect(handlers.invalidate_assigned_user_profile_data_when_delete_us,
+                                    sender=apps.get_model("userstories", "UserStory"),
+                                    dispatch_uid="invalidate_assigned_user_profile_data_when_delete_us")
+
         # Tags
         signals.pre_save.connect(generic_handlers.tags_normalization,
                                  sender=apps.get_model("userstories", "UserStory"))
@@ -42,15 +42,23 @@ class RolePointsField(serializers.WritableField):
         return json.loads(obj)
 
 
+def _attach_milestone(queryset, context):
+    return queryset.select_related("milestone")
+
+
+def _attach_origin_issue(queryset, context):
+    return queryset.select_related("generated_from_issue")
+
+
 class UserStorySerializer(WatchersValidator, serializers.ModelSerializer):
     tags = TagsField(default=[], required=False)
     external_reference = PgArrayField(required=False)
     points = RolePointsField(source="role_points", required=False)
     total_points = serializers.SerializerMethodField("get_total_points")
     comment = serializers.SerializerMethodField("get_comment")
-    milestone_slug = serializers.SerializerMethodField("get_milestone_slug")
-    milestone_name = serializers.SerializerMethodField("get_milestone_name")
-    origin_issue = serializers.SerializerMethodField("get_origin_issue")
+    milestone_slug = serializers.AnnotatedField("get_milestone_slug", _attach_milestone)
+    milestone_name = serializers.AnnotatedField("get_milestone_name", _attach_milestone)
+    origin_issue = serializers.AnnotatedField("get_origin_issue", _attach_origin_issue)
     blocked_note_html = serializers.SerializerMethodField("get_blocked_note_html")
     description_html = serializers.SerializerMethodField("get_description_html")
     status_extra_info = UserStoryStatusSerializer(source="status", required=False, read_only=True)
@@ -60,6 +68,7 @@ class UserStorySerializer(WatchersValidator, serializers.ModelSerializer):
         model = models.UserStory
         depth = 0
         read_only_fields = ('created_date', 'modified_date')
+        exclude = ('version_changes',)
 
     def get_total_points(self, obj):
         return obj.get_total_points()
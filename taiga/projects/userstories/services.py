@@ -14,13 +14,20 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import csv
-import io
+from contextlib import closing
 
+from django.db import connection
 from django.utils import timezone
 
 from taiga.base.utils import db, text
+from taiga.base.utils.csv import CSV_CHUNK_SIZE, get_etag, stream_csv, write_csv
+from taiga.base.utils.db import get_last_modification
+from taiga.base.utils.iterators import iter_queryset
+from taiga.projects.attachments.utils import attach_attachments_count_to_queryset
+from taiga.projects.custom_attributes.models import UserStoryCustomAttributesValues
 from taiga.projects.history.services import take_snapshot
+from taiga.projects.services.bulk_create import create_items_in_bulk
+from taiga.projects.services.closing import deferred_is_closed_recalculation, recalculate_is_closed
 from taiga.events import events
 
 from . import models
@@ -48,10 +55,41 @@ def create_userstories_in_bulk(bulk_data, callback=None, precall=None, **additio
     :return: List of created `Task` instances.
     """
     userstories = get_userstories_from_bulk(bulk_data, **additional_fields)
-    db.save_in_bulk(userstories, callback, precall)
+    with deferred_is_closed_recalculation():
+        db.save_in_bulk(userstories, callback, precall)
     return userstories
 
 
+def bulk_create_userstories(bulk_data, *, project, owner, **additional_fields):
+    """Create user stories from `bulk_data` with a fixed number of queries.
+
+    Unlike `create_userstories_in_bulk`, the user stories are not saved
+    one by one, so no `pre_save`/`post_save` signals are sent for them
+    (see `taiga.projects.services.bulk_create`).
+
+    :param bulk_data: List of user stories in bulk format.
+    :param project: Project of the user stories.
+    :param owner: Owner of the user stories.
+    :param additional_fields: Additional fields when instantiating each user story.
+
+    :return: Tuple with the list of created `UserStory` instances and the
+             list of their history entries.
+    """
+    userstories = get_userstories_from_bulk(bulk_data, project=project, owner=owner, **additional_fields)
+
+    def post_insert(userstories):
+        project.update_role_points(user_stories=userstories)
+        recalculate_is_closed(user_story_ids=[us.id for us in userstories],
+                              milestone_ids=[us.milestone_id for us in userstories],
+                              refresh=userstories)
+
+    history_entries = create_items_in_bulk(userstories, project=project, user=owner,
+                                           values_model=UserStoryCustomAttributesValues,
+                                           container_field="user_story",
+                                           post_insert=post_insert)
+    return userstories, history_entries
+
+
 def update_userstories_order_in_bulk(bulk_data:list, field:str, project:object):
     """
     Update the order of some user stories.
@@ -63,13 +101,13 @@ def update_userstories_order_in_bulk(bulk_data:list, field:str, project:object):
     new_order_values = []
     for us_data in bulk_data:
         user_story_ids.append(us_data["us_id"])
-        new_order_values.append({field: us_data["order"]})
+        new_order_values.append((us_data["us_id"], us_data["order"]))
 
     events.emit_event_for_ids(ids=user_story_ids,
                               content_type="userstories.userstory",
                               projectid=project.pk)
 
-    db.update_in_bulk_with_ids(user_story_ids, new_order_values, model=models.UserStory)
+    db.update_field_in_bulk(models.UserStory, field, new_order_values, project_id=project.pk)
 
 
 def snapshot_userstories_in_bulk(bulk_data, user):
@@ -95,6 +133,44 @@ def calculate_userstory_is_closed(user_story):
     return False
 
 
+def update_userstories_is_closed(user_story_ids, now=None):
+    """
+    Recalculate, in one query, the `is_closed` of the user stories (with the
+    same rules of `calculate_userstory_is_closed`) and update the ones that
+    changed.
+
+    :return: List of (id, project_id, milestone_id, is_closed, finish_date)
+             of the updated user stories.
+    """
+    if not user_story_ids:
+        return []
+
+    sql = """
+    UPDATE userstories_userstory
+       SET is_closed = calculated.is_closed,
+           finish_date = CASE WHEN calculated.is_closed THEN %s ELSE NULL END
+      FROM (SELECT us.id,
+                   CASE WHEN us.status_id IS NULL THEN FALSE
+                        WHEN count(t.id) = 0 THEN coalesce(bool_and(uss.is_closed), FALSE)
+                        ELSE bool_and(coalesce(ts.is_closed, FALSE))
+                   END AS is_closed
+              FROM userstories_userstory us
+         LEFT JOIN projects_userstorystatus uss ON uss.id = us.status_id
+         LEFT JOIN tasks_task t ON t.user_story_id = us.id
+         LEFT JOIN projects_taskstatus ts ON ts.id = t.status_id
+             WHERE us.id = ANY(%s)
+          GROUP BY us.id) AS calculated
+     WHERE userstories_userstory.id = calculated.id
+       AND userstories_userstory.is_closed IS DISTINCT FROM calculated.is_closed
+ RETURNING userstories_userstory.id, userstories_userstory.project_id,
+           userstories_userstory.milestone_id, userstories_userstory.is_closed,
+           userstories_userstory.finish_date
+    """
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, [now or timezone.now(), list(user_story_ids)])
+        return cursor.fetchall()
+
+
 def close_userstory(us):
     if not us.is_closed:
         us.is_closed = True
@@ -109,12 +185,15 @@ def open_userstory(us):
         us.save(update_fields=["is_closed", "finish_date"])
 
 
-def userstories_to_csv(project,queryset):
-    csv_data = io.StringIO()
+def _get_userstories_csv_roles(project):
+    return list(project.roles.filter(computable=True).order_by('name'))
+
+
+def _get_userstories_csv_fieldnames(roles, custom_attrs):
     fieldnames = ["ref", "subject", "description", "milestone", "owner",
                   "owner_full_name", "assigned_to", "assigned_to_full_name",
                   "status", "is_closed"]
-    for role in project.roles.filter(computable=True).order_by('name'):
+    for role in roles:
         fieldnames.append("{}-points".format(role.slug))
     fieldnames.append("total-points")
 
@@ -124,12 +203,19 @@ def userstories_to_csv(project,queryset):
                    "generated_from_issue", "external_reference", "tasks",
                    "tags"]
 
-    for custom_attr in project.userstorycustomattributes.all():
+    for custom_attr in custom_attrs:
         fieldnames.append(custom_attr.name)
 
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
-    for us in queryset:
+    return fieldnames
+
+
+def _get_userstories_csv_rows(queryset, roles, custom_attrs):
+    queryset = queryset.select_related("milestone", "owner", "assigned_to", "status",
+                                       "generated_from_issue", "custom_attributes_values")
+    queryset = queryset.prefetch_related("role_points__points", "tasks")
+    queryset = attach_attachments_count_to_queryset(queryset)
+
+    for us in iter_queryset(queryset, itersize=CSV_CHUNK_SIZE):
         row = {
             "ref": us.ref,
             "subject": us.subject,
@@ -149,24 +235,51 @@ def userstories_to_csv(project,queryset):
             "finish_date": us.finish_date,
             "client_requirement": us.client_requirement,
             "team_requirement": us.team_requirement,
-            "attachments": us.attachments.count(),
+            "attachments": us.attachments_count,
             "generated_from_issue": us.generated_from_issue.ref if us.generated_from_issue else None,
             "external_reference": us.external_reference,
             "tasks": ",".join([str(task.ref) for task in us.tasks.all()]),
             "tags": ",".join(us.tags or []),
         }
 
-        for role in us.project.roles.filter(computable=True).order_by('name'):
-            if us.role_points.filter(role_id=role.id).count() == 1:
-                row["{}-points".format(role.slug)] = us.role_points.get(role_id=role.id).points.value
-            else:
-                row["{}-points".format(role.slug)] = 0
+        points_by_role = {rp.role_id: rp.points.value for rp in us.role_points.all()}
+        for role in roles:
+            row["{}-points".format(role.slug)] = points_by_role.get(role.id, 0)
         row['total-points'] = us.get_total_points()
 
-        for custom_attr in project.userstorycustomattributes.all():
+        for custom_attr in custom_attrs:
             value = us.custom_attributes_values.attributes_values.get(str(custom_attr.id), None)
             row[custom_attr.name] = value
 
-        writer.writerow(row)
+        yield row
+
+
+def userstories_to_csv(project, queryset):
+    roles = _get_userstories_csv_roles(project)
+    custom_attrs = list(project.userstorycustomattributes.all())
+    fieldnames = _get_userstories_csv_fieldnames(roles, custom_attrs)
+    return write_csv(fieldnames, _get_userstories_csv_rows(queryset, roles, custom_attrs))
 
-    return csv_data
+
+def userstories_to_csv_stream(project, queryset):
+    """
+    Generator of the csv lines of the user stories, with the related data
+    fetched in chunks.
+    """
+    roles = _get_userstories_csv_roles(project)
+    custom_attrs = list(project.userstorycustomattributes.all())
+    fieldnames = _get_userstories_csv_fieldnames(roles, custom_attrs)
+    yield from stream_csv(fieldnames, _get_userstories_csv_rows(queryset, roles, custom_attrs))
+
+
+def userstories_csv_etag(project, queryset):
+    """
+    ETag of the user stories csv, from the last modification of the user
+    stories and the project data included in it.
+    """
+    return get_etag(project.id, project.modified_date,
+                    get_last_modification(queryset, "custom_attributes_values__version"),
+                    get_last_modification(project.userstorycustomattributes.all()),
+                    get_last_modification(project.tasks.all()),
+                    get_last_modification(project.milestones.all()),
+                    get_last_modification(project.attachments.all()))
@@ -14,9 +14,6 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from contextlib import suppress
-from django.core.exceptions import ObjectDoesNotExist
-
 ####################################
 # Signals for cached prev US
 ####################################
@@ -25,7 +22,8 @@ from django.core.exceptions import ObjectDoesNotExist
 def cached_prev_us(sender, instance, **kwargs):
     instance.prev = None
     if instance.id:
-        instance.prev = sender.objects.get(id=instance.id)
+        # Only the fields used by the post_save handlers are needed
+        instance.prev = sender.objects.only("milestone", "assigned_to", "is_closed").get(id=instance.id)
 
 
 ####################################
@@ -56,55 +54,40 @@ def try_to_close_or_open_us_and_milestone_when_create_or_edit_us(sender, instanc
     if instance._importing:
         return
 
-    _try_to_close_or_open_us_when_create_or_edit_us(instance)
-    _try_to_close_or_open_milestone_when_create_or_edit_us(instance)
-
-def try_to_close_milestone_when_delete_us(sender, instance, **kwargs):
-    if instance._importing:
-        return
-
-    _try_to_close_milestone_when_delete_us(instance)
+    from taiga.projects.services.closing import recalculate_is_closed
 
+    milestone_ids = [instance.milestone_id]
+    if instance.prev:
+        milestone_ids.append(instance.prev.milestone_id)
 
-# US
-def _try_to_close_or_open_us_when_create_or_edit_us(instance):
-    if instance._importing:
-        return
+    recalculate_is_closed(user_story_ids=[instance.id], milestone_ids=milestone_ids,
+                          refresh=[instance])
 
-    from . import services as us_service
 
-    if us_service.calculate_userstory_is_closed(instance):
-        us_service.close_userstory(instance)
-    else:
-        us_service.open_userstory(instance)
-
-
-# Milestone
-def _try_to_close_or_open_milestone_when_create_or_edit_us(instance):
+def try_to_close_milestone_when_delete_us(sender, instance, **kwargs):
     if instance._importing:
         return
 
-    from taiga.projects.milestones import services as milestone_service
+    from taiga.projects.services.closing import recalculate_is_closed
 
-    if instance.milestone_id:
-        if milestone_service.calculate_milestone_is_closed(instance.milestone):
-            milestone_service.close_milestone(instance.milestone)
-        else:
-            milestone_service.open_milestone(instance.milestone)
+    recalculate_is_closed(milestone_ids=[instance.milestone_id])
 
-    if instance.prev and instance.prev.milestone_id and instance.prev.milestone_id != instance.milestone_id:
-        if milestone_service.calculate_milestone_is_closed(instance.prev.milestone):
-            milestone_service.close_milestone(instance.prev.milestone)
-        else:
-            milestone_service.open_milestone(instance.prev.milestone)
 
+####################################
+# Signals for users stats
+####################################
 
-def _try_to_close_milestone_when_delete_us(instance):
-    if instance._importing:
+def invalidate_assigned_users_profile_data_when_edit_us(sender, instance, created, **kwargs):
+    # Changes of is_closed are handled when it's recalculated
+    if created or not instance.prev or instance.prev.assigned_to_id == instance.assigned_to_id:
         return
 
-    from taiga.projects.milestones import services as milestone_service
+    if instance.is_closed:
+        from taiga.users.services import invalidate_profile_data
+        invalidate_profile_data([instance.prev.assigned_to_id, instance.assigned_to_id])
+
 
-    with suppress(ObjectDoesNotExist):
-        if instance.milestone_id and milestone_service.calculate_milestone_is_closed(instance.milestone):
-                milestone_service.close_milestone(instance.milestone)
+def invalidate_assigned_user_profile_data_when_delete_us(sender, instance, **kwargs):
+    if instance.is_closed:
+        from taiga.users.services import invalidate_profile_data
+        invalidate_profile_data([instance.assigned_to_id])
@@ -0,0 +1,38 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# Copyright (C) 2014 Anler Hernández <hello@anler.me>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class VotedModelMixin(models.Model):
+    """
+    Generic model mixin that keeps the number of votes of the objects
+    in their own table, so they can be listed and sorted by it.
+
+    The counter is changed only by the votes services, atomically with
+    the votes, so it's never written by the regular saves of the object.
+    """
+    total_voters = models.PositiveIntegerField(null=False, blank=False, default=0, db_index=True,
+                                               verbose_name=_("count voters"))
+
+    class Meta:
+        abstract = True
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        values = [value for value in values if value[0].attname != "total_voters"]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
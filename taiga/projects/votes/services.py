@@ -15,12 +15,50 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from django.db.models import F
+from contextlib import closing
+
+from django.db import connection
+from django.db import IntegrityError
 from django.db.transaction import atomic
 from django.apps import apps
 from django.contrib.auth import get_user_model
 
+from .mixins import VotedModelMixin
 from .models import Votes, Vote
+from .utils import _get_user_votes_attr
+
+
+def _execute_vote_statement(sql, params):
+    """Execute a vote statement and return the number of votes it added or removed.
+
+    A statement can collide with a concurrent one over the unique rows of the
+    vote or of the counter; once the other transaction is committed the
+    statement is run again and sees them.
+    """
+    with closing(connection.cursor()) as cursor:
+        try:
+            with atomic():
+                cursor.execute(sql, params)
+        except IntegrityError:
+            with atomic():
+                cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+
+def _get_total_voters_sql(obj, operator, vote_cte):
+    """Get the CTE that updates the `total_voters` counter of the object along with the vote,
+    if its model keeps it (see :class:`~taiga.projects.votes.mixins.VotedModelMixin`).
+    """
+    if not isinstance(obj, VotedModelMixin):
+        return ""
+
+    return """
+             updated_object AS (
+                UPDATE {table} SET total_voters = total_voters {operator} 1
+                 WHERE id = %(object_id)s
+                   AND EXISTS (SELECT 1 FROM {vote_cte})
+             RETURNING id
+             ),""".format(table=obj._meta.db_table, operator=operator, vote_cte=vote_cte)
 
 
 def add_vote(obj, user):
@@ -29,20 +67,42 @@ def add_vote(obj, user):
     If the user has already voted the object nothing happends, so this function can be considered
     idempotent.
 
+    The vote is inserted and the votes counters of the object incremented with one statement.
+
     :param obj: Any Django model instance.
     :param user: User adding the vote. :class:`~taiga.users.models.User` instance.
+
+    :return: `True` if the vote has been added, `False` if the user had already voted.
     """
     obj_type = apps.get_model("contenttypes", "ContentType").objects.get_for_model(obj)
-    with atomic():
-        vote, created = Vote.objects.get_or_create(content_type=obj_type, object_id=obj.id, user=user)
-
-        if not created:
-            return
-
-        votes, _ = Votes.objects.get_or_create(content_type=obj_type, object_id=obj.id)
-        votes.count = F('count') + 1
-        votes.save()
-    return vote
+    sql = """
+        WITH new_vote AS (
+                INSERT INTO votes_vote (content_type_id, object_id, user_id)
+                     SELECT %(type_id)s, %(object_id)s, %(user_id)s
+                      WHERE NOT EXISTS (SELECT 1 FROM votes_vote
+                                         WHERE content_type_id = %(type_id)s
+                                           AND object_id = %(object_id)s
+                                           AND user_id = %(user_id)s)
+                  RETURNING id
+             ),{total_voters_sql}
+             updated_votes AS (
+                UPDATE votes_votes SET count = count + 1
+                 WHERE content_type_id = %(type_id)s
+                   AND object_id = %(object_id)s
+                   AND EXISTS (SELECT 1 FROM new_vote)
+             RETURNING id
+             ),
+             new_votes AS (
+                INSERT INTO votes_votes (content_type_id, object_id, count)
+                     SELECT %(type_id)s, %(object_id)s, 1
+                      WHERE EXISTS (SELECT 1 FROM new_vote)
+                        AND NOT EXISTS (SELECT 1 FROM updated_votes)
+                  RETURNING id
+             )
+      SELECT count(*) FROM new_vote
+    """.format(total_voters_sql=_get_total_voters_sql(obj, "+", "new_vote"))
+    params = {"type_id": obj_type.id, "object_id": obj.id, "user_id": user.id}
+    return _execute_vote_statement(sql, params) > 0
 
 
 def remove_vote(obj, user):
@@ -51,20 +111,33 @@ def remove_vote(obj, user):
     If the user has not voted the object nothing happens so this function can be considered
     idempotent.
 
+    The vote is deleted and the votes counters of the object decremented with one statement.
+
     :param obj: Any Django model instance.
     :param user: User removing her vote. :class:`~taiga.users.models.User` instance.
+
+    :return: `True` if the vote has been removed, `False` if the user hadn't voted.
     """
     obj_type = apps.get_model("contenttypes", "ContentType").objects.get_for_model(obj)
-    with atomic():
-        qs = Vote.objects.filter(content_type=obj_type, object_id=obj.id, user=user)
-        if not qs.exists():
-            return
-
-        qs.delete()
-
-        votes, _ = Votes.objects.get_or_create(content_type=obj_type, object_id=obj.id)
-        votes.count = F('count') - 1
-        votes.save()
+    sql = """
+        WITH deleted_vote AS (
+                DELETE FROM votes_vote
+                      WHERE content_type_id = %(type_id)s
+                        AND object_id = %(object_id)s
+                        AND user_id = %(user_id)s
+                  RETURNING id
+             ),{total_voters_sql}
+             updated_votes AS (
+                UPDATE votes_votes SET count = count - 1
+                 WHERE content_type_id = %(type_id)s
+                   AND object_id = %(object_id)s
+                   AND EXISTS (SELECT 1 FROM deleted_vote)
+             RETURNING id
+             )
+      SELECT count(*) FROM deleted_vote
+    """.format(total_voters_sql=_get_total_voters_sql(obj, "-", "deleted_vote"))
+    params = {"type_id": obj_type.id, "object_id": obj.id, "user_id": user.id}
+    return _execute_vote_statement(sql, params) > 0
 
 
 def get_voters(obj):
@@ -113,3 +186,44 @@ def get_voted(user_or_id, model):
 
     return model.objects.extra(where=conditions, tables=('votes_vote',),
                                params=(obj_type.id, user_id))
+
+
+def get_voted_in_bulk(user_or_id, model, object_ids):
+    """Get which of the objects have been voted by an user, with one query.
+
+    :param user_or_id: :class:`~taiga.users.models.User` instance or id.
+    :param model: Django model class of the objects.
+    :param object_ids: Ids of the objects.
+
+    :return: Set with the ids of the objects voted by the user.
+    """
+    obj_type = apps.get_model("contenttypes", "ContentType").objects.get_for_model(model)
+
+    if isinstance(user_or_id, get_user_model()):
+        user_id = user_or_id.id
+    else:
+        user_id = user_or_id
+
+    return set(Vote.objects.filter(content_type=obj_type, object_id__in=object_ids, user_id=user_id)
+                           .values_list("object_id", flat=True))
+
+
+def is_voter(user, obj):
+    """Check if an user has voted an object.
+
+    The votes prefetched with :func:`~taiga.projects.votes.utils.attach_user_votes_to_queryset`
+    are used if they are attached to the object.
+
+    :param user: :class:`~taiga.users.models.User` instance.
+    :param obj: Any Django model instance.
+
+    :return: `True` if the user has voted the object.
+    """
+    if user.is_anonymous():
+        return False
+
+    votes = getattr(obj, _get_user_votes_attr(user), None)
+    if votes is not None:
+        return len(votes) > 0
+
+    return obj.id in get_voted_in_bulk(user, type(obj), [obj.id])
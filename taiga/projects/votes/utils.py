@@ -16,26 +16,27 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from django.apps import apps
+from django.db.models import Prefetch
 
 
-def attach_votescount_to_queryset(queryset, as_field="votes_count"):
-    """Attach votes count to each object of the queryset.
+def _get_user_votes_attr(user):
+    return "_user_{}_votes".format(user.id)
 
-    Because of laziness of vote objects creation, this makes much simpler and more efficient to
-    access to voted-object number of votes.
 
-    (The other way was to do it in the serializer with some try/except blocks and additional
-    queries)
+def attach_user_votes_to_queryset(user, queryset):
+    """Prefetch the votes of the user on the objects of the queryset.
 
-    :param queryset: A Django queryset object.
-    :param as_field: Attach the votes-count as an attribute with this name.
+    The votes of all the objects are looked up with one query, instead of one per object,
+    and are used by :func:`~taiga.projects.votes.services.is_voter`.
 
-    :return: Queryset object with the additional `as_field` field.
+    :param user: :class:`~taiga.users.models.User` instance.
+    :param queryset: A Django queryset object of a model with an `object_votes` generic relation.
+
+    :return: Queryset object with the votes of the user prefetched.
     """
-    model = queryset.model
-    type = apps.get_model("contenttypes", "ContentType").objects.get_for_model(model)
-    sql = ("SELECT coalesce(votes_votes.count, 0) FROM votes_votes "
-           "WHERE votes_votes.content_type_id = {type_id} AND votes_votes.object_id = {tbl}.id")
-    sql = sql.format(type_id=type.id, tbl=model._meta.db_table)
-    qs = queryset.extra(select={as_field: sql})
-    return qs
+    if user.is_anonymous():
+        return queryset
+
+    votes = apps.get_model("votes", "Vote").objects.filter(user=user)
+    return queryset.prefetch_related(Prefetch("object_votes", queryset=votes,
+                                              to_attr=_get_user_votes_attr(user)))
@@ -30,6 +30,7 @@ class WikiPageSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.WikiPage
         read_only_fields = ('modified_date', 'created_date')
+        exclude = ('version_changes',)
 
     def get_html(self, obj):
         return mdrender(obj.project, obj.content)
@@ -20,6 +20,7 @@ from django.db.models import signals
 
 from . import signals as handlers
 from taiga.projects.history.models import HistoryEntry
+from taiga.projects.history.signals import history_entries_created_in_bulk
 
 
 class TimelineAppConfig(AppConfig):
@@ -28,6 +29,8 @@ class TimelineAppConfig(AppConfig):
 
     def ready(self):
         signals.post_save.connect(handlers.on_new_history_entry, sender=HistoryEntry, dispatch_uid="timeline")
+        history_entries_created_in_bulk.connect(handlers.on_new_history_entries_in_bulk, sender=HistoryEntry,
+                                                dispatch_uid="timeline_in_bulk")
         signals.pre_save.connect(handlers.create_membership_push_to_timeline,
                                                  sender=apps.get_model("projects", "Membership"))
         signals.post_delete.connect(handlers.delete_membership_push_to_timeline,
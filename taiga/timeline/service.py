@@ -50,14 +50,14 @@ def build_project_namespace(project:object):
     return "{0}:{1}".format("project", project.id)
 
 
-def _add_to_object_timeline(obj:object, instance:object, event_type:str, namespace:str="default", extra_data:dict={}):
+def _build_timeline_entry(obj:object, instance:object, event_type:str, namespace:str="default", extra_data:dict={}):
     assert isinstance(obj, Model), "obj must be a instance of Model"
     assert isinstance(instance, Model), "instance must be a instance of Model"
     from .models import Timeline
     event_type_key = _get_impl_key_from_model(instance.__class__, event_type)
     impl = _timeline_impl_map.get(event_type_key, None)
 
-    Timeline.objects.create(
+    return Timeline(
         content_object=obj,
         namespace=namespace,
         event_type=event_type_key,
@@ -67,6 +67,10 @@ def _add_to_object_timeline(obj:object, instance:object, event_type:str, namespa
     )
 
 
+def _add_to_object_timeline(obj:object, instance:object, event_type:str, namespace:str="default", extra_data:dict={}):
+    _build_timeline_entry(obj, instance, event_type, namespace, extra_data).save()
+
+
 def _add_to_objects_timeline(objects, instance:object, event_type:str, namespace:str="default", extra_data:dict={}):
     for obj in objects:
         _add_to_object_timeline(obj, instance, event_type, namespace, extra_data)
@@ -82,6 +86,29 @@ def push_to_timeline(objects, instance:object, event_type:str, namespace:str="de
         raise Exception("Invalid objects parameter")
 
 
+@app.task
+def push_to_timeline_in_bulk(pushes:list):
+    """
+    Store the timeline entries of a list of pushes with one insert.
+
+    Each push is a tuple with the `push_to_timeline` arguments:
+    (objects, instance, event_type, namespace, extra_data).
+    """
+    from .models import Timeline
+
+    entries = []
+    for objects, instance, event_type, namespace, extra_data in pushes:
+        if isinstance(objects, Model):
+            objects = [objects]
+        elif not isinstance(objects, (QuerySet, list)):
+            raise Exception("Invalid objects parameter")
+
+        for obj in objects:
+            entries.append(_build_timeline_entry(obj, instance, event_type, namespace, extra_data))
+
+    Timeline.objects.bulk_create(entries)
+
+
 def get_timeline(obj, namespace=None):
     assert isinstance(obj, Model), "obj must be a instance of Model"
     from .models import Timeline
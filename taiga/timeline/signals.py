@@ -14,13 +14,15 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections import defaultdict
+
 from django.conf import settings
 
 from taiga.projects.history import services as history_services
 from taiga.projects.models import Project
 from taiga.users.models import User
 from taiga.projects.history.choices import HistoryType
-from taiga.timeline.service import (push_to_timeline, build_user_namespace,
+from taiga.timeline.service import (push_to_timeline, push_to_timeline_in_bulk, build_user_namespace,
     build_project_namespace, extract_user_info)
 
 # TODO: Add events to followers timeline when followers are implemented.
@@ -33,6 +35,18 @@ def _push_to_timeline(*args, **kwargs):
         push_to_timeline(*args, **kwargs)
 
 
+def _push_to_timeline_in_bulk(pushes):
+    if settings.CELERY_ENABLED:
+        push_to_timeline_in_bulk.delay(pushes)
+    else:
+        push_to_timeline_in_bulk(pushes)
+
+
+def _get_team(project):
+    team_members_ids = project.memberships.filter(user__isnull=False).values_list("id", flat=True)
+    return User.objects.filter(id__in=team_members_ids)
+
+
 def _push_to_timelines(project, user, obj, event_type, extra_data={}):
     # Project timeline
     _push_to_timeline(project, obj, event_type,
@@ -57,9 +71,7 @@ def _push_to_timelines(project, user, obj, event_type, extra_data={}):
         related_people |= watchers
 
     # Team
-    team_members_ids = project.memberships.filter(user__isnull=False).values_list("id", flat=True)
-    team = User.objects.filter(id__in=team_members_ids)
-    related_people |= team
+    related_people |= _get_team(project)
 
     related_people = related_people.distinct()
 
@@ -70,6 +82,24 @@ def _push_to_timelines(project, user, obj, event_type, extra_data={}):
     #Related people: team members
 
 
+def _get_event_type(history_entry):
+    if history_entry.type == HistoryType.create:
+        return "create"
+    elif history_entry.type == HistoryType.change:
+        return "change"
+    elif history_entry.type == HistoryType.delete:
+        return "delete"
+
+
+def _get_extra_data(history_entry, user):
+    return {
+        "values_diff": history_entry.values_diff,
+        "user": extract_user_info(user),
+        "comment": history_entry.comment,
+        "comment_html": history_entry.comment_html,
+    }
+
+
 def on_new_history_entry(sender, instance, created, **kwargs):
     if instance._importing:
         return
@@ -82,25 +112,81 @@ def on_new_history_entry(sender, instance, created, **kwargs):
     obj = model.objects.get(pk=pk)
     project = obj.project
 
-    if instance.type == HistoryType.create:
-        event_type = "create"
-    elif instance.type == HistoryType.change:
-        event_type = "change"
-    elif instance.type == HistoryType.delete:
-        event_type = "delete"
-
+    event_type = _get_event_type(instance)
     user = User.objects.get(id=instance.user["pk"])
-
-    extra_data = {
-        "values_diff": instance.values_diff,
-        "user": extract_user_info(user),
-        "comment": instance.comment,
-        "comment_html": instance.comment_html,
-    }
+    extra_data = _get_extra_data(instance, user)
 
     _push_to_timelines(project, user, obj, event_type, extra_data=extra_data)
 
 
+def _get_watchers_ids_in_bulk(objects):
+    """
+    Get the ids of the watchers of the objects, with one query per model,
+    as a dict of (model, object id) -> set of user ids.
+    """
+    objects_ids = defaultdict(set)
+    for obj in objects:
+        if hasattr(obj, "watchers"):
+            objects_ids[type(obj)].add(obj.id)
+
+    watchers_ids = defaultdict(set)
+    for model, ids in objects_ids.items():
+        field = model._meta.get_field("watchers")
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        rows = field.rel.through.objects.filter(**{source + "__in": ids}).values_list(source, target)
+        for object_id, user_id in rows:
+            watchers_ids[(model, object_id)].add(user_id)
+    return watchers_ids
+
+
+def on_new_history_entries_in_bulk(sender, entries, objects, **kwargs):
+    """
+    Same as `on_new_history_entry` for a batch of entries, but the
+    users (authors, assigned and watchers), the teams and the watchers
+    relations are fetched once and all the timeline entries are stored
+    together.
+    """
+    watchers_ids = _get_watchers_ids_in_bulk(objects)
+
+    users_ids = {entry.user["pk"] for entry in entries}
+    users_ids.update(getattr(obj, "assigned_to_id", None) for obj in objects)
+    users_ids.discard(None)
+    for ids in watchers_ids.values():
+        users_ids.update(ids)
+
+    users = User.objects.in_bulk(users_ids)
+    teams = {}
+
+    pushes = []
+    for entry, obj in zip(entries, objects):
+        if entry._importing or entry.is_hidden:
+            continue
+
+        project = obj.project
+        if project.id not in teams:
+            teams[project.id] = list(_get_team(project))
+
+        user = users[entry.user["pk"]]
+        event_type = _get_event_type(entry)
+        extra_data = _get_extra_data(entry, user)
+
+        related_people = {member.id: member for member in teams[project.id]}
+        assigned_to_id = getattr(obj, "assigned_to_id", None)
+        if assigned_to_id and assigned_to_id != user.id:
+            related_people[assigned_to_id] = users[assigned_to_id]
+        for watcher_id in watchers_ids[(type(obj), obj.id)]:
+            if watcher_id != user.id:
+                related_people[watcher_id] = users[watcher_id]
+
+        namespace = build_user_namespace(user)
+        pushes.append((project, obj, event_type, build_project_namespace(project), extra_data))
+        pushes.append((user, obj, event_type, namespace, extra_data))
+        pushes.append((list(related_people.values()), obj, event_type, namespace, extra_data))
+
+    if pushes:
+        _push_to_timeline_in_bulk(pushes)
+
+
 def create_membership_push_to_timeline(sender, instance, **kwargs):
     # Creating new membership with associated user
     if not instance.pk and instance.user:
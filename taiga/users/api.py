@@ -46,6 +46,7 @@ from . import serializers
 from . import permissions
 from . import filters as user_filters
 from . import services
+from . import tasks
 from .signals import user_cancel_account as user_cancel_account_signal
 
 
@@ -209,6 +210,15 @@ class UsersViewSet(ModelCrudViewSet):
 
         request.user.photo = avatar
         request.user.save(update_fields=["photo"])
+
+        # Generate the thumbnails out of the request and serve the
+        # uploaded image meanwhile
+        if settings.CELERY_ENABLED:
+            services.set_pending_photo_urls(request.user)
+            tasks.generate_photo_urls.delay(request.user.id, request.user.photo.name)
+        else:
+            services.generate_photo_urls(request.user)
+
         user_data = self.admin_serializer_class(request.user).data
 
         return response.Ok(user_data)
@@ -22,7 +22,5 @@ from . import services
 class ContactsFilterBackend(PermissionBasedFilterBackend):
     def filter_queryset(self, user, request, queryset, view):
         qs = queryset.filter(is_active=True)
-        project_ids = services.get_visible_project_ids(user, request.user)
-        qs = qs.filter(memberships__project_id__in=project_ids)
-        qs = qs.exclude(id=user.id)
-        return qs.distinct()
+        contact_ids = services.get_contact_ids_for_user(user, request.user)
+        return qs.filter(id__in=contact_ids)
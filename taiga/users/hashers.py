@@ -0,0 +1,37 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher with a configurable work factor.
+
+    The number of iterations is taken from `PASSWORD_HASHER_ITERATIONS`
+    (use the `benchmark_password_hasher` command to choose it). Passwords
+    hashed with a different number of iterations are still valid, and
+    they are hashed again on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_HASHER_ITERATIONS", hashers.PBKDF2PasswordHasher.iterations)
+
+    def must_update(self, encoded):
+        algorithm, iterations, salt, hash = encoded.split("$", 3)
+        return int(iterations) != self.iterations
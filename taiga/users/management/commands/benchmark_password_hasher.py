@@ -0,0 +1,55 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import timeit
+
+from optparse import make_option
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    option_list = BaseCommand.option_list + (
+        make_option('--target', '-t', default=250, type='int', dest='target',
+            help='Target time, in milliseconds, of a password check.'),
+        make_option('--number', '-n', default=5, type='int', dest='number',
+            help='Number of hashes of every measure.'),
+    )
+
+    help = 'Measure the password hasher and suggest a PASSWORD_HASHER_ITERATIONS value'
+
+    def _measure(self, hasher, iterations, number):
+        salt = hasher.salt()
+        elapsed = timeit.timeit(lambda: hasher.encode("password", salt, iterations=iterations),
+                                number=number)
+        return elapsed * 1000 / number
+
+    def handle(self, *args, **options):
+        target = options.get('target')
+        number = options.get('number')
+        hasher = get_hasher()
+
+        current = settings.PASSWORD_HASHER_ITERATIONS
+        current_ms = self._measure(hasher, current, number)
+        print("Hasher: {} - {} hashes per measure".format(hasher.algorithm, number))
+        print("  current: {:>8} iterations {:>10.2f}ms".format(current, current_ms))
+
+        # The cost of the hasher grows linearly with the number of iterations
+        suggested = max(1000, int(current * target / current_ms) // 1000 * 1000)
+        suggested_ms = self._measure(hasher, suggested, number)
+        print("  suggested: {:>6} iterations {:>10.2f}ms (target {}ms)".format(suggested, suggested_ms, target))
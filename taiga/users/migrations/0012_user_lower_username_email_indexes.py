@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_user_theme'),
+    ]
+
+    operations = [
+        # Index: Speed up the login lookups ("lower(username) = lower(...)")
+        migrations.RunSQL(
+            """
+            CREATE INDEX "users_user_lower_username" ON users_user (lower(username));
+            """,
+            reverse_sql="""DROP INDEX IF EXISTS "users_user_lower_username";"""
+        ),
+
+        # Index: Speed up the login lookups ("lower(email) = lower(...)")
+        migrations.RunSQL(
+            """
+            CREATE INDEX "users_user_lower_email" ON users_user (lower(email));
+            """,
+            reverse_sql="""DROP INDEX IF EXISTS "users_user_lower_email";"""
+        ),
+    ]
@@ -235,3 +235,26 @@ def role_post_save(sender, instance, created, **kwargs):
         return
 
     instance.project.update_role_points()
+
+
+# On Role object is changed or deleted, the permissions of the
+# members of its project may change, so discard their cached
+# contacts and stats.
+@receiver(models.signals.post_save, sender=Role,
+          dispatch_uid="role_post_save_invalidate_profile_data")
+@receiver(models.signals.post_delete, sender=Role,
+          dispatch_uid="role_post_delete_invalidate_profile_data")
+def invalidate_members_profile_data(sender, instance, **kwargs):
+    from taiga.users.services import invalidate_project_members_profile_data
+    invalidate_project_members_profile_data(instance.project_id)
+
+
+# On User object is changed or deleted, discard its
+# cached authentication tokens.
+@receiver(models.signals.post_save, sender=User,
+          dispatch_uid="user_post_save_invalidate_tokens")
+@receiver(models.signals.post_delete, sender=User,
+          dispatch_uid="user_post_delete_invalidate_tokens")
+def invalidate_user_tokens(sender, instance, **kwargs):
+    from taiga.auth.tokens import invalidate_user_tokens
+    invalidate_user_tokens(instance.pk)
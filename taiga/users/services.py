@@ -18,7 +18,13 @@
 This model contains a domain logic for users application.
 """
 
+from contextlib import closing
+import uuid
+
 from django.apps import apps
+from django.contrib.auth.hashers import get_hasher, identify_hasher
+from django.core.cache import cache
+from django.db import connection
 from django.db.models import Q
 from django.conf import settings
 from django.utils.translation import ugettext as _
@@ -32,25 +38,52 @@ from taiga.base.utils.urls import get_absolute_url
 from .gravatar import get_gravatar_url
 
 
+def _get_user_by_username_or_email(username:str):
+    # Backed by the lower(username) and lower(email) indexes. An exact
+    # match takes precedence over a case insensitive one; if there is
+    # no exact match and many users differ only in case, it's ambiguous.
+    user_model = apps.get_model("users", "User")
+    qs = user_model.objects.extra(
+        where=["lower(users_user.username) = lower(%s) OR lower(users_user.email) = lower(%s)"],
+        params=[username, username],
+        select={"exact_match": "users_user.username = %s OR users_user.email = %s"},
+        select_params=[username, username],
+        order_by=["-exact_match", "id"])
+
+    users = list(qs[:2])
+    if not users or (len(users) > 1 and not users[0].exact_match):
+        return None
+    return users[0]
+
+
+def _rehash_password_if_needed(user, password:str):
+    hasher = identify_hasher(user.password)
+    preferred_hasher = get_hasher()
+    if hasher.algorithm != preferred_hasher.algorithm or preferred_hasher.must_update(user.password):
+        user.set_password(password)
+        user.save(update_fields=["password"])
+
+
 def get_and_validate_user(*, username:str, password:str) -> bool:
     """
     Check if user with username/email exists and specified
     password matchs well with existing user password.
 
+    The username/email is compared case insensitively and the
+    password is hashed again if its hasher or work factor are
+    not the current ones.
+
     if user is valid,  user is returned else, corresponding
     exception is raised.
     """
-
-    user_model = apps.get_model("users", "User")
-    qs = user_model.objects.filter(Q(username=username) |
-                                   Q(email=username))
-    if len(qs) == 0:
+    user = _get_user_by_username_or_email(username)
+    if user is None:
         raise exc.WrongArguments(_("Username or password does not matches user."))
 
-    user = qs[0]
     if not user.check_password(password):
         raise exc.WrongArguments(_("Username or password does not matches user."))
 
+    _rehash_password_if_needed(user, password)
     return user
 
 
@@ -63,13 +96,6 @@ def get_photo_url(photo):
         return None
 
 
-def get_photo_or_gravatar_url(user):
-    """Get the user's photo/gravatar url."""
-    if user:
-        return get_photo_url(user.photo) if user.photo else get_gravatar_url(user.email)
-    return ""
-
-
 def get_big_photo_url(photo):
     """Get a big photo absolute url and the photo automatically cropped."""
     try:
@@ -79,15 +105,69 @@ def get_big_photo_url(photo):
         return None
 
 
+def _get_photo_urls_cache_key(user):
+    return "user_photo_urls:{0}".format(user.id)
+
+
+def _set_photo_urls(user, photo_url, big_photo_url, timeout):
+    # The photo and the email are stored with the urls so an entry is
+    # ignored, without any invalidation, once they are changed.
+    photo_urls = {
+        "photo": user.photo.name if user.photo else "",
+        "email": user.email,
+        "photo_url": photo_url,
+        "big_photo_url": big_photo_url,
+    }
+    cache.set(_get_photo_urls_cache_key(user), photo_urls, timeout)
+    return photo_urls
+
+
+def generate_photo_urls(user):
+    """
+    Resolve (generating the thumbnails of the photo if they don't
+    exist yet) and cache the photo/gravatar urls of a user.
+    """
+    if user.photo:
+        photo_url = get_photo_url(user.photo)
+        big_photo_url = get_big_photo_url(user.photo)
+    else:
+        photo_url = get_gravatar_url(user.email)
+        big_photo_url = get_gravatar_url(user.email, size=settings.DEFAULT_BIG_AVATAR_SIZE)
+
+    return _set_photo_urls(user, photo_url, big_photo_url, settings.USER_PHOTO_URLS_CACHE_TIMEOUT)
+
+
+def set_pending_photo_urls(user):
+    """
+    Serve the uploaded photo itself until its thumbnails are generated
+    (the entry expires soon in case it never happens).
+    """
+    photo_url = get_absolute_url(user.photo.url)
+    return _set_photo_urls(user, photo_url, photo_url, settings.USER_PENDING_PHOTO_URLS_CACHE_TIMEOUT)
+
+
+def _get_photo_urls(user):
+    photo_urls = cache.get(_get_photo_urls_cache_key(user))
+    if (photo_urls is None or
+            photo_urls["photo"] != (user.photo.name if user.photo else "") or
+            photo_urls["email"] != user.email):
+        photo_urls = generate_photo_urls(user)
+    return photo_urls
+
+
+def get_photo_or_gravatar_url(user):
+    """Get the user's photo/gravatar url."""
+    if user:
+        return _get_photo_urls(user)["photo_url"]
+    return ""
+
+
 def get_big_photo_or_gravatar_url(user):
     """Get the user's big photo/gravatar url."""
     if not user:
         return ""
 
-    if user.photo:
-        return get_big_photo_url(user.photo)
-    else:
-        return get_gravatar_url(user.email, size=settings.DEFAULT_BIG_AVATAR_SIZE)
+    return _get_photo_urls(user)["big_photo_url"]
 
 
 def get_visible_project_ids(from_user, by_user):
@@ -114,30 +194,105 @@ def get_visible_project_ids(from_user, by_user):
     return project_ids
 
 
-def get_stats_for_user(from_user, by_user):
-    """Get the user stats"""
+def _get_profile_data_cache_version(user):
+    if not user.is_authenticated():
+        return "anon"
+
+    version_key = "user_profile_data_version:{0}".format(user.id)
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(version_key, version, None)
+    return "{0}:{1}".format(user.id, version)
+
+
+def _get_profile_data_cache_key(name, from_user, by_user):
+    # The data depends on the memberships of both users, so the key
+    # changes whenever any of them is invalidated.
+    return "user_profile_data:{0}:{1}:{2}".format(name,
+                                                  _get_profile_data_cache_version(from_user),
+                                                  _get_profile_data_cache_version(by_user))
+
+
+def invalidate_profile_data(user_ids):
+    """
+    Discard the cached contacts and stats of the users, and the ones
+    computed for other users when they were the viewers.
+    """
+    cache.delete_many(["user_profile_data_version:{0}".format(user_id)
+                       for user_id in set(user_ids) if user_id is not None])
+
+
+def invalidate_project_members_profile_data(project_id, extra_user_ids=()):
+    Membership = apps.get_model("projects", "Membership")
+    user_ids = list(Membership.objects.filter(project_id=project_id).values_list("user_id", flat=True))
+    invalidate_profile_data(user_ids + list(extra_user_ids))
+
+
+def get_contact_ids_for_user(from_user, by_user):
+    """Get the ids of the users sharing a project with one user visible by another"""
+    cache_key = _get_profile_data_cache_key("contacts", from_user, by_user)
+    contact_ids = cache.get(cache_key)
+    if contact_ids is not None:
+        return contact_ids
+
+    Membership = apps.get_model("projects", "Membership")
     project_ids = get_visible_project_ids(from_user, by_user)
+    contact_ids = list(Membership.objects.filter(project_id__in=project_ids, user__isnull=False)
+                                         .exclude(user_id=from_user.id)
+                                         .values_list("user_id", flat=True)
+                                         .distinct())
+
+    cache.set(cache_key, contact_ids, settings.USER_PROFILE_DATA_CACHE_TIMEOUT)
+    return contact_ids
+
+
+def _get_stats_for_user_row(from_user, by_user):
+    Membership = apps.get_model("projects", "Membership")
+    Role = apps.get_model("users", "Role")
+    UserStory = apps.get_model("userstories", "UserStory")
 
-    total_num_projects = len(project_ids)
+    visible_sql, params = get_visible_project_ids(from_user, by_user).query.sql_with_params()
+    sql = """
+        WITH visible AS ({visible_sql})
+        SELECT (SELECT count(*) FROM visible),
+               ARRAY(SELECT DISTINCT roles.name
+                       FROM {membership_table} memberships
+                 INNER JOIN {role_table} roles ON roles.id = memberships.role_id
+                      WHERE memberships.user_id = %s
+                        AND memberships.project_id IN (SELECT * FROM visible)),
+               (SELECT count(DISTINCT memberships.user_id)
+                  FROM {membership_table} memberships
+                 WHERE memberships.user_id <> %s
+                   AND memberships.project_id IN (SELECT * FROM visible)),
+               (SELECT count(*)
+                  FROM {userstory_table} userstories
+                 WHERE userstories.is_closed
+                   AND userstories.assigned_to_id = %s
+                   AND userstories.project_id IN (SELECT * FROM visible))
+    """.format(visible_sql=visible_sql,
+               membership_table=Membership._meta.db_table,
+               role_table=Role._meta.db_table,
+               userstory_table=UserStory._meta.db_table)
 
-    roles = [_(r) for r in from_user.memberships.filter(project__id__in=project_ids).values_list("role__name", flat=True)]
-    roles = list(set(roles))
+    with closing(connection.cursor()) as cursor:
+        cursor.execute(sql, list(params) + [from_user.id, from_user.id, from_user.id])
+        return cursor.fetchone()
 
-    User = apps.get_model('users', 'User')
-    total_num_contacts = User.objects.filter(memberships__project__id__in=project_ids)\
-        .exclude(id=from_user.id)\
-        .distinct()\
-        .count()
 
-    UserStory = apps.get_model('userstories', 'UserStory')
-    total_num_closed_userstories = UserStory.objects.filter(
-        is_closed=True,
-        project__id__in=project_ids,
-        assigned_to=from_user).count()
+def get_stats_for_user(from_user, by_user):
+    """Get the user stats"""
+    cache_key = _get_profile_data_cache_key("stats", from_user, by_user)
+    row = cache.get(cache_key)
+    if row is None:
+        row = _get_stats_for_user_row(from_user, by_user)
+        cache.set(cache_key, row, settings.USER_PROFILE_DATA_CACHE_TIMEOUT)
+
+    total_num_projects, roles, total_num_contacts, total_num_closed_userstories = row
 
     project_stats = {
         'total_num_projects': total_num_projects,
-        'roles': roles,
+        'roles': list(set(_(r) for r in roles)),
         'total_num_contacts': total_num_contacts,
         'total_num_closed_userstories': total_num_closed_userstories,
     }
@@ -19,14 +19,18 @@ from django.db.models import signals
 
 from . import signal_handlers as handlers
 from taiga.projects.history.models import HistoryEntry
+from taiga.projects.history.signals import history_entries_created_in_bulk
 
 
 def connect_webhooks_signals():
     signals.post_save.connect(handlers.on_new_history_entry, sender=HistoryEntry, dispatch_uid="webhooks")
+    history_entries_created_in_bulk.connect(handlers.on_new_history_entries_in_bulk, sender=HistoryEntry,
+                                            dispatch_uid="webhooks_in_bulk")
 
 
 def disconnect_webhooks_signals():
     signals.post_save.disconnect(dispatch_uid="webhooks")
+    history_entries_created_in_bulk.disconnect(dispatch_uid="webhooks_in_bulk")
 
 
 class WebhooksAppConfig(AppConfig):
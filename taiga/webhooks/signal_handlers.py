@@ -33,6 +33,26 @@ def _get_project_webhooks(project):
     return webhooks
 
 
+def _send_webhooks(webhooks, history_entry, obj):
+    if history_entry.type == HistoryType.create:
+        task = tasks.create_webhook
+        extra_args = []
+    elif history_entry.type == HistoryType.change:
+        task = tasks.change_webhook
+        extra_args = [history_entry]
+    elif history_entry.type == HistoryType.delete:
+        task = tasks.delete_webhook
+        extra_args = []
+
+    for webhook in webhooks:
+        args = [webhook["id"], webhook["url"], webhook["key"], obj] + extra_args
+
+        if settings.CELERY_ENABLED:
+            task.delay(*args)
+        else:
+            task(*args)
+
+
 def on_new_history_entry(sender, instance, created, **kwargs):
     if not settings.WEBHOOKS_ENABLED:
         return None
@@ -45,21 +65,19 @@ def on_new_history_entry(sender, instance, created, **kwargs):
     obj = model.objects.get(pk=pk)
 
     webhooks = _get_project_webhooks(obj.project)
+    _send_webhooks(webhooks, instance, obj)
 
-    if instance.type == HistoryType.create:
-        task = tasks.create_webhook
-        extra_args = []
-    elif instance.type == HistoryType.change:
-        task = tasks.change_webhook
-        extra_args = [instance]
-    elif instance.type == HistoryType.delete:
-        task = tasks.delete_webhook
-        extra_args = []
 
-    for webhook in webhooks:
-        args = [webhook["id"], webhook["url"], webhook["key"], obj] + extra_args
+def on_new_history_entries_in_bulk(sender, entries, objects, **kwargs):
+    if not settings.WEBHOOKS_ENABLED:
+        return None
 
-        if settings.CELERY_ENABLED:
-            task.delay(*args)
-        else:
-            task(*args)
+    projects_webhooks = {}
+    for entry, obj in zip(entries, objects):
+        if entry.is_hidden:
+            continue
+
+        if obj.project_id not in projects_webhooks:
+            projects_webhooks[obj.project_id] = _get_project_webhooks(obj.project)
+
+        _send_webhooks(projects_webhooks[obj.project_id], entry, obj)
@@ -1,7 +1,16 @@
+import datetime
+import hashlib
+import io
 import pytest
 
 from django.core.urlresolvers import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from taiga.base.utils import json
+from taiga.projects.attachments.models import Attachment, AttachmentUpload
+from taiga.projects.attachments import services
 
 from .. import factories as f
 
@@ -45,3 +54,137 @@ def test_create_attachment_on_wrong_project(client):
     client.login(issue1.owner)
     response = client.post(url, data)
     assert response.status_code == 400
+
+
+def test_create_attachment_with_a_chunked_upload(client):
+    us = f.UserStoryFactory.create()
+    f.MembershipFactory(project=us.project, user=us.owner, is_owner=True)
+    content = b"first chunk, second chunk"
+
+    client.login(us.owner)
+
+    url = reverse("userstory-attachments-start-upload")
+    data = {"project": us.project_id,
+            "object_id": us.pk,
+            "name": "test.txt",
+            "size": len(content),
+            "sha256": hashlib.sha256(content).hexdigest()}
+    response = client.post(url, json.dumps(data), content_type="application/json")
+    assert response.status_code == 201
+    upload_id = json.loads(response.content.decode("utf-8"))["id"]
+
+    url = reverse("userstory-attachments-upload-chunk")
+    response = client.post("{}?upload={}&offset=0".format(url, upload_id), content[:12],
+                           content_type="application/octet-stream")
+    assert response.status_code == 200
+    assert json.loads(response.content.decode("utf-8"))["received_size"] == 12
+
+    # A chunk sent again (e.g. after a network error) is rejected with the received size
+    response = client.post("{}?upload={}&offset=0".format(url, upload_id), content[:12],
+                           content_type="application/octet-stream")
+    assert response.status_code == 409
+    assert json.loads(response.content.decode("utf-8"))["received_size"] == 12
+
+    response = client.post("{}?upload={}&offset=12".format(url, upload_id), content[12:],
+                           content_type="application/octet-stream")
+    assert response.status_code == 200
+    assert Attachment.objects.count() == 0
+
+    url = reverse("userstory-attachments-complete-upload")
+    response = client.post("{}?upload={}".format(url, upload_id))
+    assert response.status_code == 201
+
+    attachment = Attachment.objects.get(id=json.loads(response.content.decode("utf-8"))["id"])
+    assert attachment.name == "test.txt"
+    assert attachment.size == len(content)
+    assert attachment.attached_file.read() == content
+    assert not AttachmentUpload.objects.filter(id=upload_id).exists()
+
+
+def test_chunked_upload_out_of_a_test_transaction(client, transactional_db):
+    # The uploads are locked while they're used, the routes must open their transaction
+    us = f.UserStoryFactory.create()
+    f.MembershipFactory(project=us.project, user=us.owner, is_owner=True)
+    content = b"the only chunk"
+
+    client.login(us.owner)
+
+    url = reverse("userstory-attachments-start-upload")
+    data = {"project": us.project_id, "object_id": us.pk, "name": "test.txt", "size": len(content)}
+    response = client.post(url, json.dumps(data), content_type="application/json")
+    assert response.status_code == 201
+    upload_id = json.loads(response.content.decode("utf-8"))["id"]
+
+    url = reverse("userstory-attachments-upload-status")
+    response = client.get("{}?upload={}".format(url, upload_id))
+    assert response.status_code == 200
+
+    url = reverse("userstory-attachments-upload-chunk")
+    response = client.post("{}?upload={}&offset=0".format(url, upload_id), content,
+                           content_type="application/octet-stream")
+    assert response.status_code == 200
+
+    url = reverse("userstory-attachments-complete-upload")
+    response = client.post("{}?upload={}".format(url, upload_id))
+    assert response.status_code == 201
+
+
+def test_start_chunked_upload_without_size(client):
+    us = f.UserStoryFactory.create()
+    f.MembershipFactory(project=us.project, user=us.owner, is_owner=True)
+
+    client.login(us.owner)
+
+    url = reverse("userstory-attachments-start-upload")
+    for size in (0, -1):
+        data = {"project": us.project_id, "object_id": us.pk, "name": "test.txt", "size": size}
+        response = client.post(url, json.dumps(data), content_type="application/json")
+        assert response.status_code == 400
+        assert "size" in json.loads(response.content.decode("utf-8"))
+
+    assert AttachmentUpload.objects.count() == 0
+
+
+def test_purge_expired_uploads():
+    us = f.UserStoryFactory.create()
+    expired_upload = AttachmentUpload.objects.create(project=us.project, content_object=us, owner=us.owner,
+                                                     name="expired.txt", size=10)
+    services.store_upload_chunk(expired_upload, io.BytesIO(b"chunk"), 5)
+    chunk_path = expired_upload.get_chunk_path(0)
+    AttachmentUpload.objects.filter(id=expired_upload.id).update(
+        modified_date=timezone.now() - datetime.timedelta(days=2))
+    upload = AttachmentUpload.objects.create(project=us.project, content_object=us, owner=us.owner,
+                                             name="test.txt", size=10)
+
+    assert services.purge_expired_uploads(60 * 60 * 24) == 1
+    assert list(AttachmentUpload.objects.all()) == [upload]
+    assert not default_storage.exists(chunk_path)
+
+
+def test_attachments_with_the_same_content_share_the_file():
+    attachment1 = f.UserStoryAttachmentFactory.create()
+    attachment2 = f.IssueAttachmentFactory.create()
+    attachment3 = f.IssueAttachmentFactory.create(attached_file__data=b"Other contents")
+
+    assert attachment1.sha256 == hashlib.sha256(b"File contents").hexdigest()
+    assert attachment1.attached_file.name == attachment2.attached_file.name
+    assert attachment1.attached_file.name != attachment3.attached_file.name
+
+    assert attachment1.is_attached_file_referenced()
+    attachment2.delete()
+    assert not attachment1.is_attached_file_referenced()
+    assert attachment1.attached_file.storage.exists(attachment1.attached_file.name)
+
+
+def test_the_file_is_deleted_with_its_last_attachment(transactional_db):
+    # The files are deleted when the deletion is committed
+    attachment1 = f.UserStoryAttachmentFactory.create()
+    attachment2 = f.IssueAttachmentFactory.create()
+    storage, name = attachment1.attached_file.storage, attachment1.attached_file.name
+    assert attachment2.attached_file.name == name
+
+    attachment1.delete()
+    assert storage.exists(name)
+
+    attachment2.delete()
+    assert not storage.exists(name)
@@ -19,6 +19,12 @@ import pytest
 
 from django.core.urlresolvers import reverse
 from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from taiga.base import exceptions as exc
+from taiga.users import services as users_services
+from taiga.users.models import User
 
 from .. import factories
 
@@ -106,3 +112,55 @@ def test_respond_400_if_username_or_email_is_duplicate(client, settings, registe
     register_form["email"] = "ff@dd.com"
     response = client.post(reverse("auth-register"), register_form)
     assert response.status_code == 400
+
+
+def _create_user_with_password(password, **kwargs):
+    user = factories.UserFactory.create(**kwargs)
+    user.set_password(password)
+    user.save()
+    return user
+
+
+def test_login_is_case_insensitive(client):
+    user = _create_user_with_password("password", username="LoginUser", email="Login.User@Email.com")
+
+    for username in ["loginuser", "login.user@email.com"]:
+        data = {"type": "normal", "username": username, "password": "password"}
+        response = client.post(reverse("auth-list"), data)
+        assert response.status_code == 200, response.data
+        assert response.data["id"] == user.id
+
+
+def test_login_rehashes_the_password_with_the_current_work_factor(client, settings):
+    settings.PASSWORD_HASHER_ITERATIONS = 1000
+    user = _create_user_with_password("password")
+
+    settings.PASSWORD_HASHER_ITERATIONS = 2000
+    data = {"type": "normal", "username": user.username, "password": "password"}
+    response = client.post(reverse("auth-list"), data)
+
+    assert response.status_code == 200, response.data
+    user = User.objects.get(id=user.id)
+    assert user.password.split("$")[1] == "2000"
+    assert user.check_password("password")
+
+
+def test_login_user_is_looked_up_with_one_query():
+    # The timing of the password checks is measured by the
+    # benchmark_password_hasher command
+    user = _create_user_with_password("password")
+
+    with CaptureQueriesContext(connection) as queries:
+        users_services.get_and_validate_user(username=user.username.upper(), password="password")
+    assert len(queries) == 1
+
+
+def test_login_with_a_username_of_many_users_differing_in_case():
+    user1 = _create_user_with_password("password", username="Foo")
+    user2 = _create_user_with_password("password", username="foo")
+
+    assert users_services.get_and_validate_user(username="Foo", password="password") == user1
+    assert users_services.get_and_validate_user(username="foo", password="password") == user2
+
+    with pytest.raises(exc.WrongArguments):
+        users_services.get_and_validate_user(username="FOO", password="password")
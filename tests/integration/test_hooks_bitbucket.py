@@ -109,6 +109,26 @@ def test_push_event_detected(client):
     assert response.status_code == 204
 
 
+def test_push_event_with_several_commits_processing(client):
+    creation_status = f.TaskStatusFactory()
+    project = creation_status.project
+    new_task_status = f.TaskStatusFactory(project=project)
+    new_us_status = f.UserStoryStatusFactory(project=project)
+    task = f.TaskFactory.create(status=creation_status, project=project, owner=project.owner)
+    user_story = f.UserStoryFactory.create(project=project, owner=project.owner)
+    payload = [
+        '{"commits": [{"message": "test TG-%s #%s ok"}, {"message": "no references"}]}' % (task.ref,
+                                                                                            new_task_status.slug),
+        '{"commits": [{"message": "test TG-%s #%s ok"}]}' % (user_story.ref, new_us_status.slug),
+    ]
+
+    ev_hook = event_hooks.PushEventHook(project, payload)
+    ev_hook.process_event()
+
+    assert Task.objects.get(id=task.id).status_id == new_task_status.id
+    assert UserStory.objects.get(id=user_story.id).status_id == new_us_status.id
+
+
 def test_push_event_issue_processing(client):
     creation_status = f.IssueStatusFactory()
     role = f.RoleFactory(project=creation_status.project, permissions=["view_issues"])
@@ -73,6 +73,49 @@ def test_push_event_detected(client):
     assert response.status_code == 204
 
 
+def test_push_event_queued_in_async_mode(client, settings):
+    settings.CELERY_ENABLED = True
+    settings.HOOKS_ASYNC_PROCESSING = True
+    project = f.ProjectFactory()
+    url = reverse("github-hook-list")
+    url = "%s?project=%s" % (url, project.id)
+    data = {"commits": [
+        {"message": "test message"},
+    ]}
+
+    with mock.patch.object(GitHubViewSet, "_validate_signature", return_value=True), \
+            mock.patch("taiga.hooks.tasks.process_event") as process_event_task_mock:
+        response = client.post(url, json.dumps(data),
+                               HTTP_X_GITHUB_EVENT="push",
+                               content_type="application/json")
+
+        process_event_task_mock.delay.assert_called_once_with(project.id,
+                                                              "taiga.hooks.github.event_hooks.PushEventHook",
+                                                              data)
+
+    assert response.status_code == 202
+
+
+def test_push_event_with_several_commits_processing(client):
+    creation_status = f.TaskStatusFactory()
+    project = creation_status.project
+    new_task_status = f.TaskStatusFactory(project=project)
+    new_us_status = f.UserStoryStatusFactory(project=project)
+    task = f.TaskFactory.create(status=creation_status, project=project, owner=project.owner)
+    user_story = f.UserStoryFactory.create(project=project, owner=project.owner)
+    payload = {"commits": [
+        {"message": "test TG-%s #%s ok" % (task.ref, new_task_status.slug)},
+        {"message": "no references"},
+        {"message": "test TG-%s #%s ok" % (user_story.ref, new_us_status.slug)},
+    ]}
+
+    ev_hook = event_hooks.PushEventHook(project, payload)
+    ev_hook.process_event()
+
+    assert Task.objects.get(id=task.id).status_id == new_task_status.id
+    assert UserStory.objects.get(id=user_story.id).status_id == new_us_status.id
+
+
 def test_push_event_issue_processing(client):
     creation_status = f.IssueStatusFactory()
     role = f.RoleFactory(project=creation_status.project, permissions=["view_issues"])
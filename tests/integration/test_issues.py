@@ -3,10 +3,13 @@ import csv
 
 from unittest import mock
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.urlresolvers import reverse
 
 from taiga.projects.issues import services, models
+from taiga.projects.services.filters import get_issues_filters_data
 from taiga.base.utils import json
+from taiga.timeline.service import get_timeline, build_project_namespace
 
 from .. import factories as f
 
@@ -61,6 +64,22 @@ def test_api_create_issues_in_bulk(client):
     assert response.status_code == 200, response.data
 
 
+def test_api_create_issues_in_bulk_pushes_to_the_timelines(client):
+    project = f.create_project()
+    f.MembershipFactory(project=project, user=project.owner, is_owner=True)
+    url = reverse("issues-bulk-create")
+    data = {"bulk_issues": "Issue #1\nIssue #2\n",
+            "project_id": project.id}
+
+    client.login(project.owner)
+    response = client.json.post(url, json.dumps(data))
+
+    assert response.status_code == 200, response.data
+    issue_type = ContentType.objects.get_for_model(models.Issue)
+    project_timeline = get_timeline(project, build_project_namespace(project))
+    assert project_timeline.filter(data_content_type=issue_type, event_type="issues.issue.create").count() == 2
+
+
 def test_api_filter_by_subject(client):
     user = f.UserFactory(is_superuser=True)
     f.create_issue(owner=user)
@@ -198,3 +217,45 @@ def test_custom_fields_csv_generation():
     assert row[16] == attr.name
     row = next(reader)
     assert row[16] == "val1"
+
+
+def test_get_issues_filters_data_with_applied_filters():
+    project = f.ProjectFactory.create()
+    status1 = f.IssueStatusFactory.create(project=project, order=1)
+    status2 = f.IssueStatusFactory.create(project=project, order=2)
+    f.IssueFactory.create(project=project, status=status1, tags=["a", "b"])
+    f.IssueFactory.create(project=project, status=status1, tags=["a"])
+    f.IssueFactory.create(project=project, status=status2, tags=["b"])
+
+    data = get_issues_filters_data(project)
+    assert list(data["statuses"]) == [(status1.id, 2), (status2.id, 1)]
+    assert list(data["tags"]) == [("a", 2), ("b", 2)]
+
+    data = get_issues_filters_data(project, {"tags": ["b"]})
+    assert list(data["statuses"]) == [(status1.id, 1), (status2.id, 1)]
+    assert list(data["tags"]) == [("a", 1), ("b", 2)]
+
+    data = get_issues_filters_data(project, {"status": [status2.id]})
+    assert list(data["statuses"]) == [(status1.id, 0), (status2.id, 1)]
+    assert list(data["tags"]) == [("b", 1)]
+
+    f.IssueFactory.create(project=project, status=status2, tags=["c"])
+    data = get_issues_filters_data(project, {"status": [status2.id]})
+    assert list(data["statuses"]) == [(status1.id, 0), (status2.id, 2)]
+    assert list(data["tags"]) == [("b", 1), ("c", 1)]
+
+
+def test_api_get_issues_filters_data_with_boolean_filters(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user, is_owner=True)
+    url = reverse("projects-issue-filters-data", kwargs={"pk": project.pk})
+
+    client.login(user)
+
+    # As in the issues list, the booleans are handled as the ids 1 and 0
+    response = client.get(url + "?status=true,null&owner=false")
+    assert response.status_code == 200
+
+    response = client.get(url + "?status=foo")
+    assert response.status_code == 400
@@ -17,6 +17,9 @@
 
 import pytest
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 from taiga.mdrender.service import render, render_and_extract
 
 from unittest.mock import MagicMock
@@ -42,6 +45,19 @@ def test_proccessor_invalid_user_mention():
     assert result == '<p><strong>@notvaliduser</strong></p>'
 
 
+def test_proccessor_user_mentions_are_resolved_with_one_query():
+    factories.UserFactory(username="user1", full_name="test name 1")
+    factories.UserFactory(username="user2", full_name="test name 2")
+
+    with CaptureQueriesContext(connection) as captured:
+        result = render(dummy_project, "@user1 @user2 @user1 @notvaliduser")
+
+    assert len(captured.captured_queries) == 1
+    assert 'title="test name 1">@user1</a>' in result
+    assert 'title="test name 2">@user2</a>' in result
+    assert "@notvaliduser" in result
+
+
 def test_render_and_extract_mentions():
     user = factories.UserFactory(username="user1", full_name="test")
     (_, extracted) = render_and_extract(dummy_project, "**@user1**")
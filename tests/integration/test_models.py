@@ -31,3 +31,19 @@ def test_project_update_role_points():
     project.update_role_points()
 
     assert user_story.role_points.filter(role=not_related_role, points=null_points).count() == 1
+
+
+def test_project_update_role_points_of_some_user_stories():
+    project = f.ProjectFactory.create()
+    role = f.RoleFactory.create(project=project, computable=True)
+    not_computable_role = f.RoleFactory.create(project=project, computable=False)
+    null_points = f.PointsFactory.create(project=project, value=None)
+    user_story = f.UserStoryFactory(project=project)
+    other_user_story = f.UserStoryFactory(project=project)
+    user_story.role_points.add(f.RolePointsFactory(role=not_computable_role, points=null_points))
+
+    project.update_role_points(user_stories=[user_story])
+
+    assert user_story.role_points.filter(role=role, points=null_points).count() == 1
+    assert user_story.role_points.filter(role=not_computable_role).count() == 0
+    assert other_user_story.role_points.count() == 0
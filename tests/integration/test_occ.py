@@ -356,3 +356,79 @@ def test_invalid_save_without_version_parameter(client):
         data = {"subject": "test 1"}
         response = client.patch(url, json.dumps(data), content_type="application/json")
         assert response.status_code == 400
+
+
+def test_concurrent_save_conflicts_are_resolved_without_the_history(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user, is_owner=True)
+    client.login(user)
+
+    mock_path = "taiga.projects.userstories.api.UserStoryViewSet.pre_conditions_on_save"
+    with patch(mock_path), \
+            patch("taiga.projects.occ.mixins.get_modified_fields") as get_modified_fields_mock:
+        url = reverse("userstories-list")
+        data = {"subject": "test",
+                "project": project.id,
+                "status": f.UserStoryStatusFactory.create(project=project).id}
+        response = client.json.post(url, json.dumps(data))
+        assert response.status_code == 201
+
+        userstory_id = json.loads(response.content)["id"]
+        url = reverse("userstories-detail", args=(userstory_id,))
+        data = {"version": 1, "subject": "test 1"}
+        response = client.patch(url, json.dumps(data), content_type="application/json")
+        assert response.status_code == 200
+        assert json.loads(response.content)["version"] == 2
+
+        data = {"version": 1, "description": "test 2"}
+        response = client.patch(url, json.dumps(data), content_type="application/json")
+        assert response.status_code == 200
+        assert json.loads(response.content)["version"] == 3
+
+        data = {"version": 2, "subject": "test 3"}
+        response = client.patch(url, json.dumps(data), content_type="application/json")
+        assert response.status_code == 200
+
+        data = {"version": 3, "subject": "test 4"}
+        response = client.patch(url, json.dumps(data), content_type="application/json")
+        assert response.status_code == 400
+
+        assert get_modified_fields_mock.call_count == 0
+
+
+def test_only_the_model_fields_are_recorded_in_the_changes_log(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user, is_owner=True)
+    userstory = f.UserStoryFactory.create(project=project, owner=user)
+    client.login(user)
+
+    mock_path = "taiga.projects.userstories.api.UserStoryViewSet.pre_conditions_on_save"
+    with patch(mock_path):
+        url = reverse("userstories-detail", args=(userstory.id,))
+        data = {"version": userstory.version, "subject": "test 1", "junk": "value"}
+        response = client.patch(url, json.dumps(data), content_type="application/json")
+        assert response.status_code == 200
+
+    userstory = userstory.__class__.objects.get(id=userstory.id)
+    assert set(userstory.version_changes["fields"].keys()) == {"subject"}
+
+
+def test_rejected_save_does_not_increment_the_version(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user, is_owner=True)
+    issue = f.IssueFactory.create(project=project, owner=user,
+                                  status=f.IssueStatusFactory.create(project=project))
+    foreign_status = f.IssueStatusFactory.create()
+    client.login(user)
+
+    url = reverse("issues-detail", args=(issue.id,))
+    data = {"version": issue.version, "status": foreign_status.id}
+    response = client.patch(url, json.dumps(data), content_type="application/json")
+    assert response.status_code == 403
+
+    rejected_issue = issue.__class__.objects.get(id=issue.id)
+    assert rejected_issue.version == issue.version
+    assert rejected_issue.version_changes == issue.version_changes
@@ -1,9 +1,15 @@
+from unittest import mock
+
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from taiga.base.utils import json
 from taiga.projects.services import stats as stats_services
+from taiga.projects.services.filters import get_all_tags
 from taiga.projects.history.services import take_snapshot
 from taiga.permissions.permissions import ANON_PERMISSIONS
 from taiga.projects.models import Project
+from taiga.projects.serializers import ProjectSerializer
 
 from .. import factories as f
 
@@ -350,3 +356,51 @@ def test_projects_user_order(client):
     response_content = json.loads(response.content.decode("utf-8"))
     assert response.status_code == 200
     assert(response_content[0]["id"] == project_2.id)
+
+
+def test_project_tags_index():
+    project = f.create_project()
+    us = f.UserStoryFactory.create(project=project, tags=["a", "b"])
+    task = f.TaskFactory.create(project=project, tags=["b", "c"])
+    issue = f.IssueFactory.create(project=project, tags=["c"])
+
+    index = {t.name: (t.userstories_count, t.tasks_count, t.issues_count)
+             for t in project.tags_index.all()}
+    assert index == {"a": (1, 0, 0), "b": (1, 1, 0), "c": (0, 1, 1)}
+    assert get_all_tags(project) == ["a", "b", "c"]
+
+    us.tags = ["b"]
+    us.save()
+    issue.delete()
+
+    index = {t.name: (t.userstories_count, t.tasks_count, t.issues_count)
+             for t in project.tags_index.all()}
+    assert index == {"b": (1, 1, 0), "c": (0, 1, 0)}
+    assert get_all_tags(project) == ["b", "c"]
+
+
+def test_project_serializer_annotated_fields():
+    user = f.UserFactory.create()
+    projects = [f.ProjectFactory.create(owner=user) for i in range(3)]
+    f.MembershipFactory.create(project=projects[0], user=user, is_owner=True)
+    f.MembershipFactory.create(project=projects[1], user=user, is_owner=False)
+    f.MilestoneFactory.create(project=projects[0], closed=True)
+    f.MilestoneFactory.create(project=projects[0], closed=False)
+
+    context = {"request": mock.Mock(user=user)}
+    queryset = Project.objects.filter(id__in=[p.id for p in projects]).order_by("id")
+    expected = ProjectSerializer(queryset, many=True, context=context).data
+
+    annotated_queryset = ProjectSerializer.annotate_queryset(queryset, context)
+    with CaptureQueriesContext(connection) as queries:
+        data = ProjectSerializer(annotated_queryset, many=True, context=context).data
+
+    fields = ("my_permissions", "i_am_owner", "total_closed_milestones")
+    assert [[p[k] for k in fields] for p in data] == [[p[k] for k in fields] for p in expected]
+    assert data[0]["i_am_owner"] is True
+    assert data[1]["i_am_owner"] is False
+    assert data[0]["total_closed_milestones"] == 1
+
+    queries_sql = " ".join(q["sql"] for q in queries.captured_queries)
+    assert queries_sql.count('FROM "projects_membership"') == 1
+    assert 'FROM "milestones_milestone"' not in queries_sql
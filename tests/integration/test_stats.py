@@ -1,4 +1,9 @@
 import pytest
+import datetime
+
+from django.utils import timezone
+
+from taiga.projects.milestones.services import get_closed_points_by_date_series
 
 from .. import factories as f
 from tests.utils import disconnect_signals, reconnect_signals
@@ -104,3 +109,25 @@ def test_project_assigned_points(client, data):
     data.user_story4.milestone = data.milestone
     data.user_story4.save()
     assert data.project.assigned_points == {data.role1.pk: 14, data.role2.pk: 1}
+
+
+def test_milestone_closed_points_by_date_series(client, data):
+    data.role_points1.role = data.role2
+    data.role_points1.save()
+    start = data.milestone.estimated_start
+    for us, days in [(data.user_story1, 0), (data.user_story2, 2), (data.user_story3, 2)]:
+        us.milestone = data.milestone
+        us.is_closed = True
+        us.finish_date = timezone.make_aware(
+            datetime.datetime.combine(start + datetime.timedelta(days=days), datetime.time(12, 0)),
+            timezone.get_current_timezone())
+        us.save()
+
+    series = get_closed_points_by_date_series(data.milestone)
+
+    assert len(series) == 8
+    assert [day for day, points in series] == [start + datetime.timedelta(days=x) for x in range(8)]
+    for day, points in series:
+        assert points == data.milestone.closed_points_by_date(day)
+    assert series[0][1] == {data.role2.pk: 1}
+    assert series[-1][1] == {data.role1.pk: 6, data.role2.pk: 1}
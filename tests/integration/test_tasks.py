@@ -3,10 +3,12 @@ import csv
 
 from unittest import mock
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.urlresolvers import reverse
 
 from taiga.base.utils import json
-from taiga.projects.tasks import services
+from taiga.projects.tasks import services, models
+from taiga.timeline.service import get_timeline, build_project_namespace
 
 from .. import factories as f
 
@@ -68,6 +70,26 @@ def test_api_create_in_bulk_with_status(client):
     assert response.data[0]["status"] == us.project.default_task_status.id
 
 
+def test_api_create_in_bulk_pushes_to_the_timelines(client):
+    us = f.create_userstory()
+    f.MembershipFactory.create(project=us.project, user=us.owner, is_owner=True)
+    url = reverse("tasks-bulk-create")
+    data = {
+        "bulk_tasks": "Task #1\nTask #2",
+        "us_id": us.id,
+        "project_id": us.project.id,
+        "sprint_id": us.milestone.id,
+    }
+
+    client.login(us.owner)
+    response = client.json.post(url, json.dumps(data))
+
+    assert response.status_code == 200, response.data
+    task_type = ContentType.objects.get_for_model(models.Task)
+    project_timeline = get_timeline(us.project, build_project_namespace(us.project))
+    assert project_timeline.filter(data_content_type=task_type, event_type="tasks.task.create").count() == 2
+
+
 def test_api_create_invalid_task(client):
     # Associated to a milestone and a user story.
     # But the User Story is not associated with the milestone
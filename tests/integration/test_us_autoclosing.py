@@ -18,6 +18,8 @@
 
 import pytest
 
+from taiga.projects.milestones.models import Milestone
+from taiga.projects.services.closing import deferred_is_closed_recalculation
 from taiga.projects.userstories.models import UserStory
 from taiga.projects.tasks.models import Task
 
@@ -272,3 +274,22 @@ def test_task_create(data):
     f.TaskFactory(user_story=data.user_story1, status=data.task_open_status)
     data.user_story1 = UserStory.objects.get(pk=data.user_story1.pk)
     assert data.user_story1.is_closed is False
+
+
+def test_deferred_is_closed_recalculation(data):
+    milestone = f.MilestoneFactory.create()
+    data.user_story1.milestone = milestone
+    data.user_story1.save()
+
+    with deferred_is_closed_recalculation():
+        for task in (data.task1, data.task2, data.task3):
+            task.status = data.task_closed_status
+            task.save()
+
+        assert UserStory.objects.get(pk=data.user_story1.pk).is_closed is False
+        assert Milestone.objects.get(pk=milestone.pk).closed is False
+
+    user_story1 = UserStory.objects.get(pk=data.user_story1.pk)
+    assert user_story1.is_closed is True
+    assert user_story1.finish_date is not None
+    assert Milestone.objects.get(pk=milestone.pk).closed is True
@@ -1,12 +1,16 @@
 import pytest
 from tempfile import NamedTemporaryFile
+from unittest import mock
 
 from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from .. import factories as f
 
 from taiga.base.utils import json
 from taiga.users import models
+from taiga.users import services
 from taiga.auth.tokens import get_token_for_user
 from taiga.permissions.permissions import MEMBERS_PERMISSIONS, ANON_PERMISSIONS, USER_PERMISSIONS
 
@@ -179,6 +183,39 @@ def test_change_avatar(client):
         assert response.status_code == 200
 
 
+def test_change_avatar_queues_the_thumbnails_generation(client, settings):
+    settings.CELERY_ENABLED = True
+    url = reverse('users-change-avatar')
+
+    user = f.UserFactory()
+    client.login(user)
+
+    with NamedTemporaryFile() as avatar, \
+            mock.patch("taiga.users.tasks.generate_photo_urls") as generate_photo_urls_mock:
+        avatar.write(DUMMY_BMP_DATA)
+        avatar.seek(0)
+        response = client.post(url, {'avatar': avatar})
+
+    assert response.status_code == 200
+    user = models.User.objects.get(id=user.id)
+    generate_photo_urls_mock.delay.assert_called_once_with(user.id, user.photo.name)
+    response_content = json.loads(response.content.decode("utf-8"))
+    assert response_content["photo"] == services.get_absolute_url(user.photo.url)
+
+
+def test_photo_urls_are_cached_until_the_email_changes():
+    user = f.UserFactory(email="user@example.com")
+
+    with mock.patch("taiga.users.services.get_gravatar_url", return_value="gravatar-url") as get_gravatar_url_mock:
+        assert services.get_photo_or_gravatar_url(user) == "gravatar-url"
+        assert services.get_big_photo_or_gravatar_url(user) == "gravatar-url"
+        assert get_gravatar_url_mock.call_count == 2
+
+        user.email = "other-user@example.com"
+        services.get_photo_or_gravatar_url(user)
+        assert get_gravatar_url_mock.call_count == 4
+
+
 def test_list_contacts_private_projects(client):
     project = f.ProjectFactory.create()
     user_1 = f.UserFactory.create()
@@ -237,3 +274,32 @@ def test_list_contacts_public_projects(client):
     response_content = json.loads(response.content.decode("utf-8"))
     assert len(response_content) == 1
     assert response_content[0]["id"] == user_2.id
+
+
+def test_stats_are_cached_and_invalidated_on_membership_changes(client):
+    project = f.ProjectFactory.create()
+    user_1 = f.UserFactory.create()
+    user_2 = f.UserFactory.create()
+    role = f.RoleFactory(project=project, permissions=["view_project"])
+    f.MembershipFactory.create(project=project, user=user_1, role=role)
+
+    client.login(user_1)
+    url = reverse('users-stats', kwargs={"pk": user_1.pk})
+
+    response = client.get(url, content_type="application/json")
+    assert response.status_code == 200
+    response_content = json.loads(response.content.decode("utf-8"))
+    assert response_content["total_num_projects"] == 1
+    assert response_content["total_num_contacts"] == 0
+    assert response_content["roles"] == [role.name]
+
+    with CaptureQueriesContext(connection) as captured:
+        client.get(url, content_type="application/json")
+    stats_queries = [query for query in captured.captured_queries if "visible" in query["sql"]]
+    assert len(stats_queries) == 0
+
+    f.MembershipFactory.create(project=project, user=user_2, role=role)
+
+    response = client.get(url, content_type="application/json")
+    response_content = json.loads(response.content.decode("utf-8"))
+    assert response_content["total_num_contacts"] == 1
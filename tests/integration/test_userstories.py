@@ -6,6 +6,7 @@ from unittest import mock
 from django.core.urlresolvers import reverse
 
 from taiga.base.utils import json
+from taiga.projects.history.models import HistoryEntry
 from taiga.projects.userstories import services, models
 
 from .. import factories as f
@@ -39,10 +40,20 @@ def test_update_userstories_order_in_bulk():
 
     with mock.patch("taiga.projects.userstories.services.db") as db:
         services.update_userstories_order_in_bulk(data, "backlog_order", project)
-        db.update_in_bulk_with_ids.assert_called_once_with([1, 2],
-                                                           [{"backlog_order": 1},
-                                                            {"backlog_order": 2}],
-                                                           model=models.UserStory)
+        db.update_field_in_bulk.assert_called_once_with(models.UserStory, "backlog_order",
+                                                        [(1, 1), (2, 2)], project_id=1)
+
+
+def test_update_userstories_order_in_bulk_is_scoped_by_project():
+    project = f.create_project()
+    us1 = f.create_userstory(project=project, backlog_order=10)
+    other_us = f.create_userstory(backlog_order=10)
+    data = [{"us_id": us1.id, "order": 1}, {"us_id": other_us.id, "order": 2}]
+
+    services.update_userstories_order_in_bulk(data, "backlog_order", project)
+
+    assert models.UserStory.objects.get(id=us1.id).backlog_order == 1
+    assert models.UserStory.objects.get(id=other_us.id).backlog_order == 10
 
 
 def test_api_delete_userstory(client):
@@ -90,6 +101,29 @@ def test_api_create_in_bulk_with_status(client):
     assert response.data[0]["status"] == project.default_us_status.id
 
 
+def test_api_create_in_bulk_stores_related_data(client):
+    project = f.create_project()
+    role = f.RoleFactory.create(project=project, computable=True)
+    f.MembershipFactory.create(project=project, user=project.owner, role=role, is_owner=True)
+    url = reverse("userstories-bulk-create")
+    data = {
+        "bulk_stories": "Story #1\nStory #2",
+        "project_id": project.id,
+    }
+
+    client.login(project.owner)
+    response = client.json.post(url, json.dumps(data))
+
+    assert response.status_code == 200, response.data
+    user_stories = models.UserStory.objects.filter(project=project).order_by("ref")
+    assert [us.subject for us in user_stories] == ["Story #1", "Story #2"]
+    assert len({us.ref for us in user_stories}) == 2
+    for us in user_stories:
+        assert us.role_points.filter(role=role).count() == 1
+        assert us.custom_attributes_values.attributes_values == {}
+        assert HistoryEntry.objects.filter(key="userstories.userstory:{}".format(us.id)).count() == 1
+
+
 def test_api_update_backlog_order_in_bulk(client):
     project = f.create_project()
     f.MembershipFactory.create(project=project, user=project.owner, is_owner=True)
@@ -214,6 +248,29 @@ def test_archived_filter(client):
     assert len(json.loads(response.content)) == 1
 
 
+def test_compiled_userstory_serializer(client):
+    user = f.UserFactory.create()
+    project = f.ProjectFactory.create(owner=user)
+    f.MembershipFactory.create(project=project, user=user, is_owner=True)
+    milestone = f.MilestoneFactory.create(project=project, owner=user)
+    f.UserStoryFactory.create(project=project, owner=user, assigned_to=user,
+                              milestone=milestone, tags=["a", "b"])
+    f.UserStoryFactory.create(project=project, owner=user)
+
+    queryset = models.UserStory.objects.filter(project=project).order_by("id")
+    compiled_data = UserStorySerializer(queryset, many=True, compiled=True).data
+    assert json.dumps(compiled_data) == json.dumps(UserStorySerializer(queryset, many=True).data)
+
+    with pytest.raises(ValueError):
+        UserStorySerializer(data={}, compiled=True)
+
+    client.login(user)
+    response = client.get(reverse("userstories-list"), {"project": project.id})
+    assert response.status_code == 200
+    response_data = sorted(json.loads(response.content), key=lambda us: us["id"])
+    assert response_data == json.loads(json.dumps(compiled_data))
+
+
 def test_get_total_points(client):
     project = f.ProjectFactory.create()
 
@@ -264,6 +321,29 @@ def test_get_valid_csv(client):
     assert response.status_code == 200
 
 
+def test_get_valid_csv_streaming_and_etag(client, settings):
+    settings.CSV_USE_ETAGS = True
+    url = reverse("userstories-csv")
+    project = f.ProjectFactory.create(userstories_csv_uuid=uuid.uuid4().hex)
+    f.UserStoryFactory.create(project=project)
+    f.UserStoryFactory.create(project=project)
+
+    response = client.get("{}?uuid={}".format(url, project.userstories_csv_uuid))
+    assert response.status_code == 200
+    assert response.streaming
+    content = b"".join(response.streaming_content).decode("utf-8")
+    assert content == services.userstories_to_csv(project, project.user_stories.all().order_by("ref")).getvalue()
+
+    etag = response["ETag"]
+    response = client.get("{}?uuid={}".format(url, project.userstories_csv_uuid), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    f.UserStoryFactory.create(project=project)
+    response = client.get("{}?uuid={}".format(url, project.userstories_csv_uuid), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
 def test_custom_fields_csv_generation():
     project = f.ProjectFactory.create(userstories_csv_uuid=uuid.uuid4().hex)
     attr = f.UserStoryCustomAttributeFactory.create(project=project, name="attr1", description="desc")
@@ -18,6 +18,8 @@
 import pytest
 from django.core.urlresolvers import reverse
 
+from taiga.projects.votes import services as votes_service
+
 from .. import factories as f
 
 pytestmark = pytest.mark.django_db
@@ -77,14 +79,44 @@ def test_get_issue_voter(client):
 
 def test_get_issue_votes(client):
     user = f.UserFactory.create()
-    issue = f.create_issue(owner=user)
+    issue = f.create_issue(owner=user, total_voters=5)
     f.MembershipFactory.create(project=issue.project, user=user, is_owner=True)
     url = reverse("issues-detail", args=(issue.id,))
 
-    f.VotesFactory.create(content_object=issue, count=5)
-
     client.login(user)
     response = client.get(url)
 
     assert response.status_code == 200
     assert response.data['votes'] == 5
+
+
+def test_list_issues_with_the_votes_of_the_user(client):
+    user = f.UserFactory.create()
+    issue1 = f.create_issue(owner=user)
+    issue2 = f.create_issue(owner=user, project=issue1.project)
+    f.MembershipFactory.create(project=issue1.project, user=user, is_owner=True)
+    f.VoteFactory.create(content_object=issue1, user=user)
+    url = reverse("issues-list") + "?project={}".format(issue1.project.id)
+
+    client.login(user)
+    response = client.get(url)
+
+    assert response.status_code == 200
+    is_voter = {issue["id"]: issue["is_voter"] for issue in response.data}
+    assert is_voter == {issue1.id: True, issue2.id: False}
+
+
+def test_list_issues_ordered_by_votes(client):
+    user = f.UserFactory.create()
+    issue1 = f.create_issue(owner=user)
+    issue2 = f.create_issue(owner=user, project=issue1.project)
+    f.MembershipFactory.create(project=issue1.project, user=user, is_owner=True)
+    votes_service.add_vote(issue2, user)
+    votes_service.add_vote(issue2, f.UserFactory.create())
+    url = reverse("issues-list") + "?project={}&order_by=-total_voters".format(issue1.project.id)
+
+    client.login(user)
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert [(issue["id"], issue["votes"]) for issue in response.data] == [(issue2.id, 2), (issue1.id, 0)]
@@ -16,10 +16,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import pytest
+from unittest.mock import patch
 
 from django.contrib.contenttypes.models import ContentType
 
 from taiga.projects.votes import services as votes, models
+from taiga.projects.votes.utils import attach_user_votes_to_queryset
 
 from .. import factories as f
 
@@ -32,14 +34,18 @@ def test_add_vote():
     user = f.UserFactory()
     votes_qs = models.Votes.objects.filter(content_type=project_type, object_id=project.id)
 
-    votes.add_vote(project, user)
+    assert votes.add_vote(project, user)
 
     assert votes_qs.get().count == 1
 
-    votes.add_vote(project, user)  # add_vote must be idempotent
+    assert not votes.add_vote(project, user)  # add_vote must be idempotent
 
     assert votes_qs.get().count == 1
 
+    votes.add_vote(project, f.UserFactory())
+
+    assert votes_qs.get().count == 2
+
 
 def test_remove_vote():
     user = f.UserFactory()
@@ -51,11 +57,11 @@ def test_remove_vote():
 
     assert votes_qs.get().count == 1
 
-    votes.remove_vote(project, user)
+    assert votes.remove_vote(project, user)
 
     assert votes_qs.get().count == 0
 
-    votes.remove_vote(project, user)  # remove_vote must be idempotent
+    assert not votes.remove_vote(project, user)  # remove_vote must be idempotent
 
     assert votes_qs.get().count == 0
 
@@ -84,3 +90,58 @@ def test_get_voted():
     vote = f.VoteFactory(content_type=project_type, object_id=project.id)
 
     assert list(votes.get_voted(vote.user, type(project))) == [project]
+
+
+def test_get_voted_in_bulk():
+    user = f.UserFactory()
+    project1 = f.ProjectFactory()
+    project2 = f.ProjectFactory()
+    project3 = f.ProjectFactory()
+    votes.add_vote(project1, user)
+    votes.add_vote(project3, user)
+    votes.add_vote(project2, f.UserFactory())
+
+    project_ids = [project1.id, project2.id, project3.id]
+    assert votes.get_voted_in_bulk(user, type(project1), project_ids) == {project1.id, project3.id}
+
+
+def test_is_voter_uses_the_attached_votes():
+    user = f.UserFactory()
+    project1 = f.ProjectFactory()
+    project2 = f.ProjectFactory()
+    votes.add_vote(project1, user)
+
+    queryset = type(project1).objects.filter(id__in=[project1.id, project2.id]).order_by("id")
+    projects = list(attach_user_votes_to_queryset(user, queryset))
+
+    with patch("taiga.projects.votes.services.get_voted_in_bulk") as get_voted_in_bulk_mock:
+        assert [votes.is_voter(user, project) for project in projects] == [True, False]
+        assert get_voted_in_bulk_mock.call_count == 0
+
+
+def test_votes_update_the_counter_of_the_voted_object():
+    user = f.UserFactory()
+    issue = f.create_issue()
+
+    votes.add_vote(issue, user)
+    votes.add_vote(issue, user)
+    votes.add_vote(issue, f.UserFactory())
+
+    assert type(issue).objects.get(id=issue.id).total_voters == 2
+
+    votes.remove_vote(issue, user)
+    votes.remove_vote(issue, user)
+
+    assert type(issue).objects.get(id=issue.id).total_voters == 1
+
+
+def test_saving_an_object_keeps_its_counter_of_votes():
+    issue = f.create_issue()
+    votes.add_vote(issue, f.UserFactory())
+
+    issue.subject = "new subject"
+    issue.save()
+
+    issue = type(issue).objects.get(id=issue.id)
+    assert issue.subject == "new subject"
+    assert issue.total_voters == 1
@@ -14,11 +14,15 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
 import pytest
 
 from .. import factories as f
 
-from taiga.export_import.service import project_to_dict
+from taiga.base.utils import json
+from taiga.export_import.renderers import ExportRenderer
+from taiga.export_import.dump_service import dict_to_project
+from taiga.export_import.service import project_to_dict, render_project
 
 pytestmark = pytest.mark.django_db
 
@@ -33,3 +37,44 @@ def test_export_user_story_finish_date(client):
     user_story = f.UserStoryFactory.create(finish_date="2014-10-22")
     finish_date = project_to_dict(user_story.project)["user_stories"][0]["finish_date"]
     assert finish_date == "2014-10-22T00:00:00+0000"
+
+
+def test_render_project_matches_project_to_dict(client):
+    user_story = f.UserStoryFactory.create(finish_date="2014-10-22")
+    f.UserStoryAttachmentFactory.create(project=user_story.project, content_object=user_story,
+                                        attached_file__data=b"x" * 100000)
+    f.IssueFactory.create(project=user_story.project)
+
+    expected = json.loads(ExportRenderer().render(project_to_dict(user_story.project)))
+
+    dump_file = io.BytesIO()
+    render_project(user_story.project, dump_file)
+    assert json.loads(dump_file.getvalue()) == expected
+
+
+def test_bulk_import_project_dump(client):
+    project = f.create_project()
+    f.MembershipFactory.create(project=project, user=project.owner, is_owner=True)
+    user_story = f.UserStoryFactory.create(project=project, status=project.default_us_status,
+                                           tags=["a", "b"])
+    f.TaskFactory.create(project=project, user_story=user_story, milestone=None,
+                         status=project.default_task_status)
+    f.IssueFactory.create(project=project, milestone=None, status=project.default_issue_status,
+                          type=project.default_issue_type, priority=project.default_priority,
+                          severity=project.default_severity)
+
+    dump = json.loads(ExportRenderer().render(project_to_dict(project)))
+    dump["slug"] = "bulk-imported-project"
+    dump["issues"].append(dict(dump["issues"][0], ref=None, subject="Without ref"))
+
+    progress = []
+    new_project = dict_to_project(dump, project.owner.email, bulk=True,
+                                  progress=lambda *args: progress.append(args))
+
+    assert new_project.user_stories.count() == 1
+    assert new_project.tasks.count() == 1
+    assert new_project.issues.count() == 2
+    assert new_project.tasks.get().user_story == new_project.user_stories.get()
+    assert new_project.user_stories.get().tags == ["a", "b"]
+    assert new_project.issues.get(subject="Without ref").ref > user_story.ref
+    assert ("issues", 2, 2) in progress
@@ -38,47 +38,51 @@ def test_proccessor_invalid_emoji():
 
 
 def test_proccessor_valid_us_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
         instance.content_type.model = "userstory"
         instance.content_object.subject = "test"
+        mock.return_value = {1: instance}
         result = render(dummy_project, "**#1**")
         expected_result = '<p><strong><a class="reference user-story" href="http://localhost:9001/project/test/us/1" title="#1 test">#1</a></strong></p>'
         assert result == expected_result
 
 
 def test_proccessor_valid_issue_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
         instance.content_type.model = "issue"
         instance.content_object.subject = "test"
+        mock.return_value = {2: instance}
         result = render(dummy_project, "**#2**")
         expected_result = '<p><strong><a class="reference issue" href="http://localhost:9001/project/test/issue/2" title="#2 test">#2</a></strong></p>'
         assert result == expected_result
 
 
 def test_proccessor_valid_task_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
         instance.content_type.model = "task"
         instance.content_object.subject = "test"
+        mock.return_value = {3: instance}
         result = render(dummy_project, "**#3**")
         expected_result = '<p><strong><a class="reference task" href="http://localhost:9001/project/test/task/3" title="#3 test">#3</a></strong></p>'
         assert result == expected_result
 
 
 def test_proccessor_invalid_type_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
         instance.content_type.model = "other"
         instance.content_object.subject = "test"
+        mock.return_value = {4: instance}
         result = render(dummy_project, "**#4**")
         assert result == "<p><strong>#4</strong></p>"
 
 
 def test_proccessor_invalid_reference():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        mock.return_value = None
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        mock.return_value = {}
         result = render(dummy_project, "**#5**")
         assert result == "<p><strong>#5</strong></p>"
 
@@ -202,9 +206,10 @@ def test_get_diff_of_htmls_modifications():
 
 
 def test_render_and_extract_references():
-    with patch("taiga.mdrender.extensions.references.get_instance_by_ref") as mock:
-        instance = mock.return_value
+    with patch("taiga.mdrender.extensions.references.get_instances_by_refs") as mock:
+        instance = MagicMock()
         instance.content_type.model = "issue"
         instance.content_object.subject = "test"
+        mock.return_value = {1: instance}
         (_, extracted) = render_and_extract(dummy_project, "**#1**")
         assert extracted['references'] == [instance.content_object]
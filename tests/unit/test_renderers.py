@@ -0,0 +1,88 @@
+# Copyright (C) 2014 Andrey Antukh <niwi@niwi.be>
+# Copyright (C) 2014 Jesús Espino <jespinog@gmail.com>
+# Copyright (C) 2014 David Barragán <bameda@dbarragan.com>
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime
+import decimal
+import json
+
+from collections import OrderedDict
+from unittest import mock
+
+import pytest
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.datastructures import SortedDict
+from django.utils.translation import ugettext_lazy
+
+from taiga.base.api.renderers import JSONRenderer
+from taiga.base.api.utils import encoders
+
+
+def _payload():
+    return [SortedDict([
+        ("id", 1),
+        ("subject", ugettext_lazy("Subject")),
+        ("created_date", datetime.datetime(2015, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)),
+        ("finish_date", datetime.date(2015, 1, 2)),
+        ("total_points", decimal.Decimal("10.5")),
+        ("permissions", {"view_us"}),
+        ("tags", ("a", "b")),
+        ("points", {1: 2}),
+        ("description", "</script> ñ"),
+        ("assigned_to", None),
+    ])]
+
+
+@pytest.mark.parametrize("backend", [name for name, (module, dumps) in encoders.JSON_BACKENDS.items()
+                                     if module is not None])
+def test_json_backends_encode_like_the_json_encoder(backend):
+    expected = json.loads(json.dumps(_payload(), cls=encoders.JSONEncoder))
+    dumps = encoders.get_json_dumps(backend)
+
+    assert json.loads(dumps(_payload())) == expected
+    assert json.loads(dumps(_payload(), indent=4, ensure_ascii=False)) == expected
+    assert expected[0]["created_date"] == "2015-01-02T03:04:05.678Z"
+
+
+@pytest.mark.parametrize("backend", [name for name, (module, dumps) in encoders.JSON_BACKENDS.items()
+                                     if module is not None])
+def test_json_backends_keep_the_order_of_the_fields(backend):
+    dumps = encoders.get_json_dumps(backend)
+
+    data = json.loads(dumps(_payload()), object_pairs_hook=OrderedDict)
+    assert list(data[0].keys()) == list(_payload()[0].keys())
+
+
+def test_to_primitive_keeps_the_ordered_dicts():
+    data = encoders.to_primitive(_payload())
+    assert isinstance(data[0], OrderedDict)
+    assert list(data[0].keys()) == list(_payload()[0].keys())
+    assert type(encoders.to_primitive({"a": 1})) is dict
+
+
+def test_json_renderer_uses_the_configured_backend():
+    dumps = mock.Mock(return_value="[]")
+    with mock.patch("taiga.base.api.renderers.api_settings") as api_settings, \
+            mock.patch.object(encoders, "get_json_dumps", return_value=dumps) as get_json_dumps:
+        api_settings.JSON_BACKEND = "auto"
+        assert JSONRenderer().render([]) == b"[]"
+
+    get_json_dumps.assert_called_once_with("auto")
+
+
+def test_unknown_json_backend():
+    with pytest.raises(ImproperlyConfigured):
+        encoders.get_json_dumps("unknown")
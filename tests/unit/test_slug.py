@@ -18,7 +18,12 @@
 from taiga.projects.models import Project
 from taiga.users.models import User
 
-from taiga.base.utils.slug import slugify
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from taiga.base.utils.slug import slugify, slugify_uniquely
+
+from unittest import mock
 
 import pytest
 pytestmark = pytest.mark.django_db
@@ -50,3 +55,24 @@ def test_project_with_existing_name_slug_with_special_chars():
     project = Project.objects.create(name="漢字", description="漢字", owner=user)
 
     assert project.slug == "test-han-zi-1"
+
+
+def test_slugify_uniquely_finds_the_first_free_suffix_with_one_query():
+    for username in ["test", "test-1", "test-3", "test-other"]:
+        User.objects.create(username=username)
+
+    with CaptureQueriesContext(connection) as captured:
+        slug = slugify_uniquely("test", User, slugfield="username")
+
+    assert slug == "test-2"
+    assert len(captured.captured_queries) == 1
+
+
+def test_project_slug_is_allocated_again_when_taken_by_a_concurrent_save():
+    user = User.objects.create(username="test")
+    Project.objects.create(name="test", description="test", owner=user)
+
+    with mock.patch("taiga.projects.models.slugify_uniquely", side_effect=["test-test", "test-test-1"]):
+        project = Project.objects.create(name="test", description="test", owner=user)
+
+    assert project.slug == "test-test-1"
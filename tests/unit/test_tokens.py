@@ -17,6 +17,8 @@
 
 import pytest
 
+from unittest import mock
+
 from .. import factories as f
 
 from taiga.base import exceptions as exc
@@ -51,3 +53,20 @@ def test_invalid_token_scope():
     user = f.UserFactory.create(email="old@email.com")
     token = get_token_for_user(user, "testing_scope")
     get_user_for_token(token, "testing_invalid_scope")
+
+
+def test_cached_token_is_invalidated_when_user_changes(settings):
+    settings.AUTH_TOKEN_CACHE_TIMEOUT = 30
+    user = f.UserFactory.create(email="old@email.com")
+    token = get_token_for_user(user, "testing_scope")
+
+    assert get_user_for_token(token, "testing_scope", cached=True).email == "old@email.com"
+
+    with mock.patch("taiga.auth.tokens.signing") as signing:
+        assert get_user_for_token(token, "testing_scope", cached=True).email == "old@email.com"
+        assert not signing.loads.called
+
+    user.email = "new@email.com"
+    user.save()
+
+    assert get_user_for_token(token, "testing_scope", cached=True).email == "new@email.com"